@@ -1,18 +1,29 @@
 from flask import Flask
 from flask_cors import CORS
 from .config import Config
-from .extensions import db, jwt, migrate
+from .extensions import db, jwt, migrate, model_cache, response_cache, job_queue, notifier, metrics, replica_router
+from .commands import register_commands
+from .jobs import PeriodicTask
+from .utils.upsert import check_upsert_support
 
 
-def create_app():
+def create_app(start_schedulers=True):
     app = Flask(__name__)
     app.config.from_object(Config)
+    check_upsert_support(app)
 
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
-    CORS(app)
+    model_cache.init_app(app)
+    response_cache.init_app(app)
+    job_queue.init_app(app)
+    notifier.init_app(app)
+    metrics.init_app(app)
+    replica_router.init_app(app)
+    CORS(app, expose_headers=['X-Next-Cursor'])
+    register_commands(app)
 
     # Register routes with URL prefixes
     from .routes.auth import auth_bp
@@ -26,6 +37,10 @@ def create_app():
     from .routes.mock_bank import mock_bank_bp
     from .routes.notifications import notifications_bp
     from .routes.voice import voice_bp
+    from .routes.export import export_bp
+    from .routes.dashboard import dashboard_bp
+    from .routes.sync import sync_bp
+    from .routes.metrics import metrics_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(user_bp, url_prefix='/api/user')
@@ -38,5 +53,24 @@ def create_app():
     app.register_blueprint(mock_bank_bp, url_prefix='/api/mock/bank')
     app.register_blueprint(notifications_bp, url_prefix='/api/notifications')
     app.register_blueprint(voice_bp, url_prefix='/api/voice')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+    app.register_blueprint(sync_bp, url_prefix='/api/sync')
+    app.register_blueprint(metrics_bp, url_prefix='/metrics')
+
+    # Optional in-process schedulers; in multi-worker deployments prefer a
+    # single cron running `flask materialize-recurring` and
+    # `flask deliver-notifications`. Background job workers build their app
+    # with start_schedulers=False so they never run a second copy.
+    if start_schedulers and app.config['RECURRING_SCHEDULER_INTERVAL'] > 0:
+        from .services.recurring_expense_service import materialize_due_recurrences
+        app.extensions['recurring_scheduler'] = PeriodicTask(
+            app, app.config['RECURRING_SCHEDULER_INTERVAL'], materialize_due_recurrences
+        ).start()
+    if start_schedulers and app.config['NOTIFICATION_WORKER_INTERVAL'] > 0:
+        from .services.notification_service import flush_outbox
+        app.extensions['notification_worker'] = PeriodicTask(
+            app, app.config['NOTIFICATION_WORKER_INTERVAL'], flush_outbox
+        ).start()
 
     return app
\ No newline at end of file
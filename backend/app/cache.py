@@ -0,0 +1,304 @@
+import functools
+import itertools
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from werkzeug.datastructures import MultiDict
+
+
+class LRUCache:
+    """Thread-safe in-process mapping that evicts the least recently used
+    entry once ``max_size`` entries are held."""
+
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ModelCache:
+    """Per-user cache of trained models.
+
+    Entries are stored with a fingerprint of the data they were trained on and
+    only returned when the caller's current fingerprint matches, so a stale
+    model is never served even if another worker changed the data. An optional
+    on-disk pickle store (``MODEL_CACHE_DIR``) lets models survive restarts and
+    be shared between workers on one host; only point it at a directory the
+    application owns.
+    """
+
+    def __init__(self, app=None):
+        self.memory = LRUCache()
+        self.directory = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.memory = LRUCache(app.config['MODEL_CACHE_SIZE'])
+        self.directory = app.config['MODEL_CACHE_DIR']
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        app.extensions['model_cache'] = self
+
+    def _path(self, user_id):
+        return os.path.join(self.directory, f"{user_id}.pkl")
+
+    def get(self, user_id, fingerprint):
+        entry = self.memory.get(user_id)
+        if entry is None and self.directory:
+            try:
+                with open(self._path(user_id), 'rb') as f:
+                    entry = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                entry = None
+            if entry is not None:
+                self.memory.set(user_id, entry)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        return entry[1]
+
+    def set(self, user_id, fingerprint, model):
+        entry = (fingerprint, model)
+        self.memory.set(user_id, entry)
+        if self.directory:
+            fd, tmp = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f)
+            os.replace(tmp, self._path(user_id))
+
+    def invalidate(self, user_id):
+        self.memory.pop(user_id)
+        if self.directory:
+            try:
+                os.remove(self._path(user_id))
+            except FileNotFoundError:
+                pass
+
+
+class MemoryBackend:
+    """In-process response store: an LRU of ``max_size`` entries that also
+    expire after their TTL. Versions are only visible to this process."""
+
+    def __init__(self, app):
+        size = app.config['RESPONSE_CACHE_SIZE']
+        self.entries = LRUCache(size)
+        self.versions = LRUCache(size)
+        # Versions handed out for users never seen (or evicted) start past
+        # any value this process used before, so old entries never match.
+        self._counter = itertools.count(time.time_ns())
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key, value, ttl):
+        self.entries.set(key, (time.monotonic() + ttl, value))
+
+    def version(self, user_id):
+        version = self.versions.get(user_id)
+        if version is None:
+            version = next(self._counter)
+            self.versions.set(user_id, version)
+        return version
+
+    def bump(self, user_id):
+        self.versions.set(user_id, next(self._counter))
+
+
+class LocalRedis:
+    """Minimal in-process stand-in for the parts of the redis-py client that
+    ``RedisBackend`` uses: bytes values, ``set`` with ``ex``/``nx``, ``incr``.
+    Used by tests and single-host setups to run the shared backend without a
+    server."""
+
+    def __init__(self, url=None):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+
+    def set(self, key, value, ex=None, nx=False):
+        if not isinstance(value, bytes):
+            value = str(value).encode()
+        with self._lock:
+            if nx and self._live(key):
+                return None
+            self._data[key] = (value, time.monotonic() + ex if ex else None)
+            return True
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._live(key)
+            value = int(entry[0]) + 1 if entry else 1
+            self._data[key] = (str(value).encode(), entry[1] if entry else None)
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+
+def _redis_client(url):
+    import redis
+    return redis.Redis.from_url(url)
+
+
+class RedisBackend:
+    """Response store shared by every worker through a Redis-compatible
+    server. Responses are stored as JSON with a TTL; versions have no TTL.
+
+    Payloads go through the app's JSON provider, so values such as
+    datetimes are stored exactly as Flask would send them.
+    """
+
+    def __init__(self, app, client_factory=_redis_client):
+        self.client = client_factory(app.config['RESPONSE_CACHE_URL'])
+        self.json = app.json
+
+    def get(self, key):
+        raw = self.client.get(f"response:{key}")
+        return None if raw is None else self.json.loads(raw)
+
+    def set(self, key, value, ttl):
+        self.client.set(f"response:{key}", self.json.dumps(value), ex=ttl)
+
+    def version(self, user_id):
+        key = f"version:{user_id}"
+        raw = self.client.get(key)
+        if raw is None:
+            self.client.set(key, time.time_ns(), nx=True)
+            raw = self.client.get(key)
+        return int(raw)
+
+    def bump(self, user_id):
+        key = f"version:{user_id}"
+        if not self.client.set(key, time.time_ns(), nx=True):
+            self.client.incr(key)
+
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'redis': RedisBackend,
+    'local': lambda app: RedisBackend(app, client_factory=LocalRedis),
+}
+
+
+class ResponseCache:
+    """Per-user cache of read-endpoint responses.
+
+    Entries are keyed by endpoint, user, the user's current version and the
+    request parameters. Every write path in ``app/services`` calls
+    ``invalidate(user_id)`` after committing, which bumps the version so the
+    user's old entries are never read again and simply age out. Only 200
+    responses are cached.
+
+    ``RESPONSE_CACHE`` picks the store: ``none`` (the default) disables
+    caching, ``memory`` keeps an in-process LRU with TTL, ``redis`` shares
+    entries and versions between workers via ``RESPONSE_CACHE_URL`` and
+    ``local`` runs the same code against an in-process Redis stand-in. With
+    several workers use ``redis``; a ``memory`` cache only sees invalidations
+    from its own process and may serve data up to ``RESPONSE_CACHE_TTL``
+    seconds old.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._backend = None
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self._backend = None
+        self.hits = {}
+        self.misses = {}
+        app.extensions['response_cache'] = self
+
+    @property
+    def backend(self):
+        with self._lock:
+            kind = self.app.config['RESPONSE_CACHE']
+            if self._backend is None and kind != 'none':
+                self._backend = BACKENDS[kind](self.app)
+            return self._backend
+
+    def _count(self, counters, endpoint):
+        with self._lock:
+            counters[endpoint] = counters.get(endpoint, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {endpoint: {"hits": self.hits.get(endpoint, 0), "misses": self.misses.get(endpoint, 0)}
+                    for endpoint in sorted(set(self.hits) | set(self.misses))}
+
+    def cached(self, endpoint):
+        """Decorate a ``(user_id, [params])`` service read returning
+        ``(response, status)``."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(user_id, *args):
+                backend = self.backend
+                if backend is None:
+                    return func(user_id, *args)
+                params = sorted(MultiDict(args[0] if args else None).items(multi=True))
+                key = f"{endpoint}:{user_id}:{backend.version(user_id)}:{json.dumps(params)}"
+                entry = backend.get(key)
+                if entry is not None:
+                    self._count(self.hits, endpoint)
+                    return entry[0], entry[1]
+                self._count(self.misses, endpoint)
+                response, status = func(user_id, *args)
+                if status == 200:
+                    backend.set(key, [response, status], self.app.config['RESPONSE_CACHE_TTL'])
+                return response, status
+            return wrapper
+        return decorator
+
+    def invalidate(self, user_id):
+        backend = self.backend
+        if backend is not None:
+            backend.bump(user_id)
@@ -0,0 +1,55 @@
+import time
+import click
+from flask.cli import with_appcontext
+
+
+@click.command('forecast-all')
+@with_appcontext
+def forecast_all_command():
+    """Precompute expense forecasts for every user."""
+    from app.services.ai_service import forecast_all_users
+    start = time.perf_counter()
+    count = forecast_all_users()
+    click.echo(f"Wrote forecasts for {count} users in {time.perf_counter() - start:.2f}s")
+
+
+@click.command('materialize-recurring')
+@click.option('--batch-size', default=1000, show_default=True, help='Recurrences per transaction.')
+@with_appcontext
+def materialize_recurring_command(batch_size):
+    """Create expenses for every due recurring expense."""
+    from app.services.recurring_expense_service import materialize_due_recurrences
+    start = time.perf_counter()
+    processed, created = materialize_due_recurrences(batch_size=batch_size)
+    click.echo(f"Processed {processed} recurring expenses, created {created} expenses "
+               f"in {time.perf_counter() - start:.2f}s")
+
+
+@click.command('deliver-notifications')
+@click.option('--batch-size', default=None, type=int, help='Messages per transaction.')
+@with_appcontext
+def deliver_notifications_command(batch_size):
+    """Deliver every due message in the notification outbox."""
+    from app.services.notification_service import flush_outbox
+    start = time.perf_counter()
+    stats = flush_outbox(batch_size=batch_size)
+    click.echo(f"Sent {stats['sent']}, retrying {stats['retried']}, failed {stats['failed']}, "
+               f"deferred {stats['deferred']} in {time.perf_counter() - start:.2f}s")
+
+
+@click.command('rebuild-summaries')
+@click.option('--user-id', default=None, help='Only rebuild this user\'s rows.')
+@with_appcontext
+def rebuild_summaries_command(user_id):
+    """Recompute the monthly_summary table from expenses and income."""
+    from app.services.summary_service import rebuild_summaries
+    start = time.perf_counter()
+    written = rebuild_summaries(user_id=user_id)
+    click.echo(f"Wrote {written} summary rows in {time.perf_counter() - start:.2f}s")
+
+
+def register_commands(app):
+    app.cli.add_command(forecast_all_command)
+    app.cli.add_command(materialize_recurring_command)
+    app.cli.add_command(deliver_notifications_command)
+    app.cli.add_command(rebuild_summaries_command)
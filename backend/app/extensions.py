@@ -1,7 +1,18 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
+from app.cache import ModelCache, ResponseCache
+from app.jobs import JobQueue
+from app.notifications import Notifier
+from app.metrics import Metrics
+from app.replica import ReplicaRouter, RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
-migrate = Migrate()
\ No newline at end of file
+migrate = Migrate()
+model_cache = ModelCache()
+response_cache = ResponseCache()
+job_queue = JobQueue()
+notifier = Notifier()
+metrics = Metrics()
+replica_router = ReplicaRouter()
\ No newline at end of file
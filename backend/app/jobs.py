@@ -0,0 +1,178 @@
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select, update
+from app.cache import LRUCache
+
+_worker_app = None
+
+def _init_worker(app=None):
+    # Process workers build their own app (and engine) from the environment,
+    # without the periodic schedulers the web process already runs; thread
+    # workers share the parent's app.
+    global _worker_app
+    if app is None:
+        from app import create_app
+        app = create_app(start_schedulers=False)
+    _worker_app = app
+
+def _run_in_app_context(fn, *args):
+    with _worker_app.app_context():
+        return fn(*args)
+
+
+class JobQueue:
+    """Runs background work on a ``concurrent.futures`` pool and tracks job
+    status by id.
+
+    ``JOB_EXECUTOR`` selects ``process`` (default, keeps CPU-bound work off the
+    web workers' GIL) or ``thread``; ``JOB_WORKERS`` sets the pool size. The
+    pool is created on first use.
+
+    Every job also gets a row in the ``job`` table, written when it is
+    submitted and again when it finishes, so a web worker other than the one
+    that queued it can still report it (as ``queued`` until it is done).
+    Rows are dropped ``JOB_RETENTION_SECONDS`` after submission. The
+    submitting worker keeps its own futures, bounded to the most recent
+    ``JOB_HISTORY_SIZE``, and reports from them while they are held.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = None
+        self._jobs = LRUCache()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self._jobs = LRUCache(app.config['JOB_HISTORY_SIZE'])
+        app.extensions['job_queue'] = self
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                workers = self.app.config['JOB_WORKERS']
+                if self.app.config['JOB_EXECUTOR'] == 'thread':
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=workers, initializer=_init_worker, initargs=(self.app,)
+                    )
+                else:
+                    self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+            return self._executor
+
+    def submit(self, owner, fn, *args, on_success=None):
+        """Queue ``fn(*args)`` inside an app context on a worker; returns the
+        job id. ``on_success`` is called with the result in the parent, and
+        the result must be JSON-serializable to be stored on the job row.
+        Runs inside the caller's app context and commits its session."""
+        from app.extensions import db
+        from app.models.job import Job
+        job_id = str(uuid.uuid4())
+        submitted_at = datetime.utcnow()
+        retention = timedelta(seconds=self.app.config['JOB_RETENTION_SECONDS'])
+        db.session.execute(delete(Job).where(Job.submitted_at < submitted_at - retention))
+        db.session.add(Job(id=job_id, owner=str(owner), status='queued', submitted_at=submitted_at))
+        db.session.commit()
+
+        future = self.executor.submit(_run_in_app_context, fn, *args)
+        self._jobs.set(job_id, {"owner": owner, "future": future, "submitted_at": submitted_at})
+        future.add_done_callback(lambda f: self._finish(job_id, f, on_success))
+        return job_id
+
+    def _finish(self, job_id, future, on_success):
+        # Runs on the executor's callback thread once the job has finished.
+        from app.extensions import db
+        from app.models.job import Job
+        values = {"finished_at": datetime.utcnow()}
+        if future.cancelled():
+            values['status'] = 'cancelled'
+        elif future.exception() is not None:
+            values.update(status='failed', error=str(future.exception())[:500])
+        else:
+            values.update(status='done', result=future.result())
+        try:
+            with self.app.app_context():
+                db.session.execute(update(Job).where(Job.id == job_id).values(**values))
+                db.session.commit()
+        except Exception:
+            self.app.logger.exception("Could not record the outcome of job %s", job_id)
+        if on_success is not None and values['status'] == 'done':
+            on_success(future.result())
+
+    def status(self, job_id, owner):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return self._stored_status(job_id, owner)
+        if job['owner'] != owner:
+            return None
+        future = job['future']
+        status = {"job_id": job_id, "submitted_at": job['submitted_at'].isoformat()}
+        if not future.done():
+            status['status'] = 'running' if future.running() else 'queued'
+        elif future.cancelled():
+            status['status'] = 'cancelled'
+        elif future.exception() is not None:
+            status['status'] = 'failed'
+            status['error'] = str(future.exception())
+        else:
+            status['status'] = 'done'
+            status['result'] = future.result()
+        return status
+
+    def _stored_status(self, job_id, owner):
+        from app.extensions import db
+        from app.models.job import Job
+        # Read from the primary: a job submitted a moment ago on another
+        # worker may not have reached a read replica yet.
+        job = db.session.execute(
+            select(Job).where(Job.id == job_id), bind_arguments={"bind": db.engine}
+        ).scalar_one_or_none()
+        if job is None or job.owner != str(owner):
+            return None
+        status = {"job_id": job.id, "submitted_at": job.submitted_at.isoformat(), "status": job.status}
+        if job.status == 'failed':
+            status['error'] = job.error
+        elif job.status == 'done':
+            status['result'] = job.result
+        return status
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+class PeriodicTask:
+    """Calls ``fn()`` inside an app context every ``interval`` seconds on a
+    daemon thread. Errors are logged and the loop keeps going."""
+
+    def __init__(self, app, interval, fn, name=None):
+        self.app = app
+        self.interval = interval
+        self.fn = fn
+        self.name = name or fn.__name__
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self.app.app_context():
+                    self.fn()
+            except Exception:
+                self.app.logger.exception("Periodic task %s failed", self.name)
@@ -0,0 +1,270 @@
+import logging
+import threading
+import time
+from flask import jsonify, request
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    __slots__ = ('start', 'queries', 'db_time', 'rows', 'slow')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.slow = 0
+
+
+class EndpointStats:
+    __slots__ = ('requests', 'queries', 'db_time', 'rows', 'slow', 'duration', 'buckets')
+
+    def __init__(self):
+        self.requests = {}
+        self.queries = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.duration = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """Per-endpoint request and database instrumentation.
+
+    SQLAlchemy engine events count queries, DB time and rows fetched for the
+    request running on the current thread; Flask request hooks add handler
+    time, set a ``Server-Timing`` header and fold the numbers into
+    per-endpoint totals served in Prometheus text format by ``render()``.
+    Statements slower than ``SLOW_QUERY_MS`` are logged with the endpoint
+    that issued them, inside or outside a request.
+
+    Connection pool occupancy is reported per bind, and a request that times
+    out waiting for a pooled connection gets a 503 with ``Retry-After``
+    rather than a 500.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._endpoints = {}
+        self._pools = {}
+        self._pool_timeouts = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self._endpoints = {}
+        self._pools = {}
+        self._pool_timeouts = 0
+        app.extensions['metrics'] = self
+        app.register_error_handler(PoolTimeoutError, self._pool_timeout)
+        if not app.config['METRICS_ENABLED']:
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        from app.extensions import db
+        with app.app_context():
+            for bind, engine in db.engines.items():
+                self._instrument(engine, app.config)
+                self._watch_pool(bind or 'default', engine)
+
+    def _pool_timeout(self, error):
+        logger.warning("Timed out waiting for a database connection: %s", error)
+        with self._lock:
+            self._pool_timeouts += 1
+        response = jsonify({"message": "The database is busy, please retry shortly"})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    def _watch_pool(self, bind, engine):
+        counters = self._pools[bind] = {'engine': engine, 'connects': 0, 'checkouts': 0, 'invalidations': 0}
+
+        @event.listens_for(engine, 'connect')
+        def connect(dbapi_connection, connection_record):
+            counters['connects'] += 1
+
+        @event.listens_for(engine, 'checkout')
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            counters['checkouts'] += 1
+
+        @event.listens_for(engine, 'invalidate')
+        def invalidate(dbapi_connection, connection_record, exception):
+            counters['invalidations'] += 1
+
+    def pool_stats(self):
+        """Per-bind pool occupancy and lifetime counters."""
+        stats = {}
+        for bind, counters in self._pools.items():
+            pool = counters['engine'].pool
+            entry = {key: value for key, value in counters.items() if key != 'engine'}
+            # Only queue-style pools track occupancy; SQLite's static
+            # in-memory pool has a single shared connection.
+            if hasattr(pool, 'checkedout'):
+                entry.update(size=pool.size(), checked_out=pool.checkedout(),
+                             checked_in=pool.checkedin(), overflow=max(pool.overflow(), 0))
+            stats[bind] = entry
+        return stats
+
+    def _instrument(self, engine, config):
+        local = self._local
+        # SQLite does not report rowcount for SELECTs, so rows are counted as
+        # the driver builds them; other drivers report it after execute.
+        counts_rows = engine.dialect.name == 'sqlite'
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['query_start'].pop()
+            stats = getattr(local, 'stats', None)
+            if stats is not None:
+                stats.queries += 1
+                stats.db_time += elapsed
+                if not counts_rows and cursor.description is not None and cursor.rowcount > 0:
+                    stats.rows += cursor.rowcount
+            slow_ms = config['SLOW_QUERY_MS']
+            if slow_ms and elapsed * 1000 >= slow_ms:
+                if stats is not None:
+                    stats.slow += 1
+                logger.warning("Slow query (%.1f ms) in %s: %s", elapsed * 1000,
+                               getattr(local, 'endpoint', None) or 'background', statement)
+
+        if counts_rows:
+            def count_row(cursor, row):
+                stats = getattr(local, 'stats', None)
+                if stats is not None:
+                    stats.rows += 1
+                return row
+
+            @event.listens_for(engine, 'connect')
+            def connect(dbapi_connection, connection_record):
+                dbapi_connection.row_factory = count_row
+
+    def _before_request(self):
+        self._local.stats = RequestStats()
+        self._local.endpoint = request.endpoint
+
+    def _after_request(self, response):
+        stats = getattr(self._local, 'stats', None)
+        if stats is None:
+            return response
+        self._local.stats = self._local.endpoint = None
+        duration = time.perf_counter() - stats.start
+        response.headers.add('Server-Timing', (
+            f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries, {stats.rows} rows", '
+            f'app;dur={duration * 1000:.2f}'
+        ))
+        self.observe(request.endpoint or 'unmatched', request.method, response.status_code, stats, duration)
+        return response
+
+    def observe(self, endpoint, method, status, stats, duration):
+        with self._lock:
+            totals = self._endpoints.get(endpoint)
+            if totals is None:
+                totals = self._endpoints[endpoint] = EndpointStats()
+            key = (method, status)
+            totals.requests[key] = totals.requests.get(key, 0) + 1
+            totals.queries += stats.queries
+            totals.db_time += stats.db_time
+            totals.rows += stats.rows
+            totals.slow += stats.slow
+            totals.duration += duration
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    totals.buckets[i] += 1
+
+    def snapshot(self):
+        """Per-endpoint totals as plain dicts."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": sum(s.requests.values()),
+                    "queries": s.queries,
+                    "db_seconds": s.db_time,
+                    "rows": s.rows,
+                    "slow_queries": s.slow,
+                    "duration_seconds": s.duration
+                } for endpoint, s in self._endpoints.items()
+            }
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = [
+                '# HELP aurofi_http_requests_total Requests handled, by endpoint, method and status.',
+                '# TYPE aurofi_http_requests_total counter',
+            ]
+            for endpoint, s in endpoints:
+                for (method, status), count in sorted(s.requests.items()):
+                    lines.append(f'aurofi_http_requests_total{{endpoint="{_label(endpoint)}",'
+                                 f'method="{method}",status="{status}"}} {count}')
+            for name, kind, help_text, attr in (
+                ('aurofi_db_queries_total', 'counter', 'SQL statements executed.', 'queries'),
+                ('aurofi_db_query_seconds_total', 'counter', 'Time spent executing SQL.', 'db_time'),
+                ('aurofi_db_rows_total', 'counter', 'Rows fetched from the database.', 'rows'),
+                ('aurofi_db_slow_queries_total', 'counter', 'Statements slower than SLOW_QUERY_MS.', 'slow'),
+            ):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+                for endpoint, s in endpoints:
+                    lines.append(f'{name}{{endpoint="{_label(endpoint)}"}} {getattr(s, attr)}')
+            lines.append('# HELP aurofi_http_request_duration_seconds Handler time per request.')
+            lines.append('# TYPE aurofi_http_request_duration_seconds histogram')
+            for endpoint, s in endpoints:
+                label = _label(endpoint)
+                count = sum(s.requests.values())
+                for bound, bucket in zip(DURATION_BUCKETS, s.buckets):
+                    lines.append(f'aurofi_http_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {bucket}')
+                lines.append(f'aurofi_http_request_duration_seconds_bucket{{endpoint="{label}",le="+Inf"}} {count}')
+                lines.append(f'aurofi_http_request_duration_seconds_sum{{endpoint="{label}"}} {s.duration}')
+                lines.append(f'aurofi_http_request_duration_seconds_count{{endpoint="{label}"}} {count}')
+        cache = self.app.extensions.get('response_cache')
+        cache_stats = cache.stats() if cache is not None else {}
+        for name, help_text, key in (
+            ('aurofi_response_cache_hits_total', 'Reads served from the response cache.', 'hits'),
+            ('aurofi_response_cache_misses_total', 'Reads that had to be computed.', 'misses'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for endpoint, counts in cache_stats.items():
+                lines.append(f'{name}{{endpoint="{_label(endpoint)}"}} {counts[key]}')
+        pools = self.pool_stats()
+        for name, kind, help_text, key in (
+            ('aurofi_db_pool_size', 'gauge', 'Configured pool size.', 'size'),
+            ('aurofi_db_pool_checked_out', 'gauge', 'Connections currently in use.', 'checked_out'),
+            ('aurofi_db_pool_checked_in', 'gauge', 'Idle connections in the pool.', 'checked_in'),
+            ('aurofi_db_pool_overflow', 'gauge', 'Connections open beyond pool_size.', 'overflow'),
+            ('aurofi_db_pool_connects_total', 'counter', 'New DBAPI connections opened.', 'connects'),
+            ('aurofi_db_pool_checkouts_total', 'counter', 'Connections checked out of the pool.', 'checkouts'),
+            ('aurofi_db_pool_invalidations_total', 'counter', 'Connections discarded as broken.', 'invalidations'),
+        ):
+            values = [(bind, stats[key]) for bind, stats in sorted(pools.items()) if key in stats]
+            if not values:
+                continue
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for bind, value in values:
+                lines.append(f'{name}{{bind="{_label(bind)}"}} {value}')
+        lines.append('# HELP aurofi_db_pool_timeouts_total Requests that timed out waiting for a connection.')
+        lines.append('# TYPE aurofi_db_pool_timeouts_total counter')
+        lines.append(f'aurofi_db_pool_timeouts_total {self._pool_timeouts}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
@@ -3,4 +3,10 @@ from .expense import Expense
 from .budget import Budget
 from .goal import Goal
 from .income import Income
-from .recurring_expense import RecurringExpense
\ No newline at end of file
+from .recurring_expense import RecurringExpense
+from .forecast import Forecast
+from .notification import NotificationOutbox
+from .monthly_summary import MonthlySummary
+from .table_version import TableVersion
+from .sync_tombstone import SyncTombstone
+from .job import Job
\ No newline at end of file
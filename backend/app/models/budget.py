@@ -1,9 +1,18 @@
 from app.extensions import db
 import uuid
+from datetime import datetime
 
 class Budget(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
     category = db.Column(db.String(50), nullable=False)
     limit = db.Column(db.Float, nullable=False)
-    income_percentage = db.Column(db.Float, nullable=False)
\ No newline at end of file
+    income_percentage = db.Column(db.Float, nullable=False)
+    period = db.Column(db.String(10), nullable=False, default='monthly', server_default='monthly')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = db.Column(db.BigInteger, onupdate=db.null())
+
+    __table_args__ = (
+        db.Index('ix_budget_user_id_category_period', 'user_id', 'category', 'period', unique=True),
+        db.Index('ix_budget_user_id_change_seq', 'user_id', 'change_seq'),
+    )
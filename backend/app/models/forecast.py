@@ -0,0 +1,8 @@
+from app.extensions import db
+from datetime import datetime
+
+class Forecast(db.Model):
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), primary_key=True)
+    fingerprint = db.Column(db.String(120), nullable=False)
+    data = db.Column(db.JSON, nullable=False)
+    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -8,4 +8,11 @@ class Goal(db.Model):
     goal_name = db.Column(db.String(100), nullable=False)
     target_amount = db.Column(db.Float, nullable=False)
     saved_amount = db.Column(db.Float, default=0.0)
-    target_date = db.Column(db.DateTime)
\ No newline at end of file
+    target_date = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = db.Column(db.BigInteger, onupdate=db.null())
+
+    __table_args__ = (
+        db.Index('ix_goal_user_id_target_date', 'user_id', 'target_date'),
+        db.Index('ix_goal_user_id_change_seq', 'user_id', 'change_seq'),
+    )
@@ -7,4 +7,11 @@ class Income(db.Model):
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
     source = db.Column(db.String(100), nullable=False)
     amount = db.Column(db.Float, nullable=False)
-    date = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    date = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = db.Column(db.BigInteger, onupdate=db.null())
+
+    __table_args__ = (
+        db.Index('ix_income_user_id_date', 'user_id', 'date'),
+        db.Index('ix_income_user_id_change_seq', 'user_id', 'change_seq'),
+    )
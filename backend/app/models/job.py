@@ -0,0 +1,17 @@
+from app.extensions import db
+from datetime import datetime
+
+class Job(db.Model):
+    # Shared record of a JobQueue job, so any web worker can report its
+    # status; ``owner`` is whatever the submitter passed, usually a user id.
+    id = db.Column(db.String(36), primary_key=True)
+    owner = db.Column(db.String(36), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    result = db.Column(db.JSON)
+    error = db.Column(db.String(500))
+    submitted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_job_submitted_at', 'submitted_at'),
+    )
@@ -0,0 +1,11 @@
+from app.extensions import db
+
+class MonthlySummary(db.Model):
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), primary_key=True)
+    year_month = db.Column(db.String(7), primary_key=True)
+    kind = db.Column(db.String(10), primary_key=True)
+    category = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Float, nullable=False, default=0.0)
+    min_amount = db.Column(db.Float)
+    max_amount = db.Column(db.Float)
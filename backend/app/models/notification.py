@@ -0,0 +1,21 @@
+from app.extensions import db
+import uuid
+from datetime import datetime
+
+class NotificationOutbox(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
+    dedupe_key = db.Column(db.String(200), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.String(500))
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_notification_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+        db.Index('ix_notification_outbox_user_id_dedupe_key_created_at', 'user_id', 'dedupe_key', 'created_at'),
+        db.Index('ix_notification_outbox_user_id_sent_at', 'user_id', 'sent_at'),
+    )
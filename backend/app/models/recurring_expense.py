@@ -2,10 +2,25 @@ from app.extensions import db
 import uuid
 from datetime import datetime
 
+def _anchor_default(context):
+    return context.get_current_parameters()['next_date']
+
 class RecurringExpense(db.Model):
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     category = db.Column(db.String(50), nullable=False)
     frequency = db.Column(db.String(50), nullable=False)
-    next_date = db.Column(db.DateTime, nullable=False)
\ No newline at end of file
+    next_date = db.Column(db.DateTime, nullable=False)
+    # The schedule's first date. Occurrences are counted from it rather than
+    # from next_date, so a month-end clamp (Jan 31 -> Feb 29) does not carry
+    # over into later months. Defaults to next_date.
+    anchor_date = db.Column(db.DateTime, nullable=False, default=_anchor_default)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    change_seq = db.Column(db.BigInteger, onupdate=db.null())
+
+    __table_args__ = (
+        db.Index('ix_recurring_expense_user_id_next_date', 'user_id', 'next_date'),
+        db.Index('ix_recurring_expense_next_date', 'next_date'),
+        db.Index('ix_recurring_expense_user_id_change_seq', 'user_id', 'change_seq'),
+    )
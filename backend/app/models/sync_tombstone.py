@@ -0,0 +1,14 @@
+from app.extensions import db
+from datetime import datetime
+
+class SyncTombstone(db.Model):
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
+    entity = db.Column(db.String(50), nullable=False)
+    entity_id = db.Column(db.String(36), nullable=False)
+    change_seq = db.Column(db.BigInteger)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_sync_tombstone_user_id_change_seq', 'user_id', 'change_seq'),
+    )
@@ -0,0 +1,6 @@
+from app.extensions import db
+
+class TableVersion(db.Model):
+    user_id = db.Column(db.String(36), db.ForeignKey('user.id'), primary_key=True)
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
@@ -6,4 +6,6 @@ class User(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(100), nullable=False)
-    income = db.Column(db.Float, default=0.0)
\ No newline at end of file
+    income = db.Column(db.Float, default=0.0)
+    # Last change sequence handed out for this user's synced rows.
+    change_seq = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
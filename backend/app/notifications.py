@@ -0,0 +1,63 @@
+import json
+import threading
+
+
+class LogSender:
+    """Writes notifications to the application log."""
+
+    def __init__(self, app):
+        self.logger = app.logger
+
+    def send(self, notification):
+        self.logger.info("Notification for %s: %s", notification['user_id'], notification['message'])
+
+
+class FileSender:
+    """Appends notifications as JSON lines to ``NOTIFICATION_FILE``; a local
+    stand-in for SMS/email delivery."""
+
+    def __init__(self, app):
+        self.path = app.config['NOTIFICATION_FILE']
+        self._lock = threading.Lock()
+
+    def send(self, notification):
+        line = json.dumps(notification, default=str)
+        with self._lock, open(self.path, 'a') as f:
+            f.write(line + '\n')
+
+
+SENDERS = {
+    'log': LogSender,
+    'file': FileSender,
+}
+
+
+class Notifier:
+    """Holds the configured notification sender.
+
+    Notifications are not sent from request handlers: they are written to the
+    ``notification_outbox`` table and delivered in batches by
+    ``deliver_pending`` (see ``services/notification_service.py``), either on
+    the in-process worker (``NOTIFICATION_WORKER_INTERVAL``) or from
+    ``flask deliver-notifications``. ``NOTIFICATION_SENDER`` picks a sender
+    from ``SENDERS``; more can be registered there.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._sender = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self._sender = None
+        app.extensions['notifier'] = self
+
+    @property
+    def sender(self):
+        with self._lock:
+            if self._sender is None:
+                self._sender = SENDERS[self.app.config['NOTIFICATION_SENDER']](self.app)
+            return self._sender
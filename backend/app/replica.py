@@ -0,0 +1,82 @@
+import time
+from flask import g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from app.cache import LRUCache
+
+REPLICA_BIND = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def reading_from_replica():
+    return has_request_context() and g.get('read_from_replica', False)
+
+
+class RoutingSession(Session):
+    """Sends reads to the ``replica`` bind while the current request has been
+    routed there; flushes and INSERT/UPDATE/DELETE statements always go to
+    the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not getattr(clause, 'is_dml', False)
+                and reading_from_replica()):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _identity():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+class ReplicaRouter:
+    """Routes GET requests of ``REPLICA_BLUEPRINTS`` to the read replica.
+
+    Enabled when a ``replica`` bind is configured (``REPLICA_DATABASE_URL``).
+    After a user's successful write, their reads stay on the primary for
+    ``REPLICA_STICKY_SECONDS`` so they always see their own changes despite
+    replication lag. Write times are kept in-process per user; behind a load
+    balancer, size the window to cover replication lag rather than relying
+    on affinity.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.last_write = LRUCache()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.last_write = LRUCache(app.config['REPLICA_STICKY_USERS'])
+        app.extensions['replica_router'] = self
+        if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+    def is_sticky(self, user_id, now=None):
+        written = self.last_write.get(user_id)
+        if written is None:
+            return False
+        return (now or time.monotonic()) - written < self.app.config['REPLICA_STICKY_SECONDS']
+
+    def _before_request(self):
+        g.read_from_replica = False
+        if request.method not in SAFE_METHODS or request.blueprint not in self.app.config['REPLICA_BLUEPRINTS']:
+            return
+        user_id = _identity()
+        g.read_from_replica = user_id is None or not self.is_sticky(user_id)
+
+    def _after_request(self, response):
+        g.pop('read_from_replica', None)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user_id = _identity()
+            if user_id is not None:
+                self.last_write.set(user_id, time.monotonic())
+        return response
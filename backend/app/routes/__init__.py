@@ -8,4 +8,5 @@ from .recurring_expense import recurring_expense_bp
 from .insights import insights_bp
 from .mock_bank import mock_bank_bp
 from .notifications import notifications_bp
-from .voice import voice_bp
\ No newline at end of file
+from .voice import voice_bp
+from .export import export_bp
\ No newline at end of file
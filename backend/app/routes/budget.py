@@ -1,17 +1,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.budget_service import get_budgets, add_budget, update_budget, delete_budget
+from app.services.budget_service import get_budgets, add_budget, update_budget, delete_budget, optimize_budgets
 from app.utils.constants import CATEGORIES  # Import the CATEGORIES constant
+from app.utils.conditional import conditional_get
+from app.utils.helpers import get_period_range
 
 budget_bp = Blueprint('budget', __name__)
 
 @budget_bp.route('/', methods=['GET', 'POST'])
 @budget_bp.route('/<budget_id>', methods=['PUT', 'DELETE'])
 @jwt_required()
+@conditional_get('budget', 'expense', key=get_period_range)
 def manage_budgets(budget_id=None):
     user_id = get_jwt_identity()
     if request.method == 'GET':
-        response, status_code = get_budgets(user_id)
+        response, status_code = get_budgets(user_id, request.args)
     elif request.method == 'POST':
         data = request.json
         response, status_code = add_budget(user_id, data)
@@ -22,6 +25,13 @@ def manage_budgets(budget_id=None):
         response, status_code = delete_budget(user_id, budget_id)
     return jsonify(response), status_code
 
+@budget_bp.route('/optimize', methods=['POST'])
+@jwt_required()
+def optimize():
+    user_id = get_jwt_identity()
+    response, status_code = optimize_budgets(user_id, request.get_json(silent=True))
+    return jsonify(response), status_code
+
 # Add the new route for fetching budget categories
 @budget_bp.route('/categories', methods=['GET'])
 @jwt_required()
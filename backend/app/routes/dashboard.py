@@ -0,0 +1,12 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.dashboard_service import get_dashboard
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+@dashboard_bp.route('/', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def dashboard():
+    user_id = get_jwt_identity()
+    response, status_code = get_dashboard(user_id)
+    return jsonify(response), status_code
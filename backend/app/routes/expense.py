@@ -1,16 +1,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.expense_service import get_expenses, add_expense, update_expense, delete_expense
+from app.services.expense_service import get_expenses, add_expense, update_expense, delete_expense, add_expenses_bulk, read_expense_csv
+from app.utils.pagination import paged_response
+from app.utils.conditional import conditional_get
 
 expense_bp = Blueprint('expense', __name__)
 
 @expense_bp.route('/', methods=['GET', 'POST'])
 @expense_bp.route('/<expense_id>', methods=['PUT', 'DELETE'])
 @jwt_required()
+@conditional_get('expense')
 def manage_expenses(expense_id=None):
     user_id = get_jwt_identity()
     if request.method == 'GET':
-        response, status_code = get_expenses(user_id)
+        response, status_code = get_expenses(user_id, request.args)
+        return paged_response(response, status_code)
     elif request.method == 'POST':
         data = request.json
         response, status_code = add_expense(user_id, data)
@@ -19,4 +23,15 @@ def manage_expenses(expense_id=None):
         response, status_code = update_expense(user_id, expense_id, data)
     elif request.method == 'DELETE':
         response, status_code = delete_expense(user_id, expense_id)
+    return jsonify(response), status_code
+
+@expense_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_add_expenses():
+    user_id = get_jwt_identity()
+    if 'file' in request.files:
+        rows = read_expense_csv(request.files['file'])
+    else:
+        rows = request.get_json(silent=True)
+    response, status_code = add_expenses_bulk(user_id, rows)
     return jsonify(response), status_code
\ No newline at end of file
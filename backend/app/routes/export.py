@@ -0,0 +1,31 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.export_service import export_expenses, export_incomes, EXPORT_FORMATS
+
+export_bp = Blueprint('export', __name__)
+
+def _streaming_response(stream, name):
+    fmt = request.args.get('format', 'csv')
+    return Response(
+        stream_with_context(stream),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={name}.{fmt}"}
+    )
+
+@export_bp.route('/expenses', methods=['GET'])
+@jwt_required()
+def export_expense_data():
+    user_id = get_jwt_identity()
+    response, status_code = export_expenses(user_id, request.args)
+    if status_code != 200:
+        return jsonify(response), status_code
+    return _streaming_response(response, 'expenses')
+
+@export_bp.route('/income', methods=['GET'])
+@jwt_required()
+def export_income_data():
+    user_id = get_jwt_identity()
+    response, status_code = export_incomes(user_id, request.args)
+    if status_code != 200:
+        return jsonify(response), status_code
+    return _streaming_response(response, 'income')
@@ -1,16 +1,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.goal_service import get_goals, add_goal, update_goal, delete_goal
+from app.utils.pagination import paged_response
+from app.utils.conditional import conditional_get
 
 goal_bp = Blueprint('goal', __name__)
 
 @goal_bp.route('/', methods=['GET', 'POST'])
 @goal_bp.route('/<goal_id>', methods=['PUT', 'DELETE'])
 @jwt_required()
+@conditional_get('goal')
 def manage_goals(goal_id=None):
     user_id = get_jwt_identity()
     if request.method == 'GET':
-        response, status_code = get_goals(user_id)
+        response, status_code = get_goals(user_id, request.args)
+        return paged_response(response, status_code)
     elif request.method == 'POST':
         data = request.json
         response, status_code = add_goal(user_id, data)
@@ -1,16 +1,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.income_service import get_incomes, add_income, update_income, delete_income
+from app.utils.pagination import paged_response
+from app.utils.conditional import conditional_get
 
 income_bp = Blueprint('income', __name__)
 
 @income_bp.route('/', methods=['GET', 'POST'])
 @income_bp.route('/<income_id>', methods=['PUT', 'DELETE'])
 @jwt_required()
+@conditional_get('income')
 def manage_income(income_id=None):
     user_id = get_jwt_identity()
     if request.method == 'GET':
-        response, status_code = get_incomes(user_id)
+        response, status_code = get_incomes(user_id, request.args)
+        return paged_response(response, status_code)
     elif request.method == 'POST':
         data = request.json
         response, status_code = add_income(user_id, data)
@@ -1,6 +1,6 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.ai_service import predict_future_expenses
+from app.services.ai_service import predict_future_expenses, enqueue_forecast_refresh, get_forecast_job
 
 insights_bp = Blueprint('insights', __name__)
 
@@ -8,5 +8,19 @@ insights_bp = Blueprint('insights', __name__)
 @jwt_required()
 def get_predictions():
     user_id = get_jwt_identity()
-    predictions = predict_future_expenses(user_id)
-    return jsonify({"predictions": predictions}), 200
\ No newline at end of file
+    forecast = predict_future_expenses(user_id)
+    return jsonify(forecast), 200
+
+@insights_bp.route('/refresh', methods=['POST'])
+@jwt_required()
+def refresh_predictions():
+    user_id = get_jwt_identity()
+    response, status_code = enqueue_forecast_refresh(user_id)
+    return jsonify(response), status_code
+
+@insights_bp.route('/jobs/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    user_id = get_jwt_identity()
+    response, status_code = get_forecast_job(user_id, job_id)
+    return jsonify(response), status_code
\ No newline at end of file
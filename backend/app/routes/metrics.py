@@ -0,0 +1,10 @@
+from flask import Blueprint, Response, abort, current_app
+from app.extensions import metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+@metrics_bp.route('/', methods=['GET'], strict_slashes=False)
+def get_metrics():
+    if not current_app.config['METRICS_ENABLED']:
+        abort(404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -1,9 +1,15 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from faker import Faker
+from functools import lru_cache
 
 mock_bank_bp = Blueprint('mock_bank', __name__)
-fake = Faker()
+
+@lru_cache(maxsize=1)
+def get_faker():
+    # Faker is slow to import and instantiate; only pay for it when mock
+    # transactions are actually requested.
+    from faker import Faker
+    return Faker()
 
 @mock_bank_bp.route('/link', methods=['POST'])
 @jwt_required()
@@ -37,6 +43,7 @@ def mock_get_bank_accounts():
 @mock_bank_bp.route('/transactions', methods=['GET'])
 @jwt_required()
 def mock_get_transactions():
+    fake = get_faker()
     transactions = [{
         "transaction_id": fake.uuid4(),
         "amount": round(fake.random_number(digits=3) / 100, 2),
@@ -1,8 +1,6 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.budget import Budget
-from app.models.expense import Expense
-from app.extensions import db
+from app.services.notification_service import check_budget
 
 notifications_bp = Blueprint('notifications', __name__)
 
@@ -11,15 +9,5 @@ notifications_bp = Blueprint('notifications', __name__)
 def send_notification():
     data = request.json
     user_id = get_jwt_identity()
-
-    budget = Budget.query.filter_by(user_id=user_id, category=data['category']).first()
-    expenses = Expense.query.filter_by(user_id=user_id, category=data['category']).all()
-    total_spent = sum(e.amount for e in expenses)
-
-    if total_spent > budget.limit:
-        return jsonify({
-            "message_id": "mock_message_id_12345",
-            "message": f"Mock SMS sent: You've exceeded your budget for {data['category']}."
-        }), 200
-
-    return jsonify({"message": "No notification sent."}), 200
\ No newline at end of file
+    response, status_code = check_budget(user_id, data['category'])
+    return jsonify(response), status_code
@@ -1,12 +1,14 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.services.recurring_expense_service import get_recurring_expenses, add_recurring_expense, update_recurring_expense, delete_recurring_expense
+from app.services.recurring_expense_service import get_recurring_expenses, add_recurring_expense, update_recurring_expense, delete_recurring_expense, get_recurring_calendar
+from app.utils.conditional import conditional_get
 
 recurring_expense_bp = Blueprint('recurring_expense', __name__)
 
 @recurring_expense_bp.route('/', methods=['GET', 'POST'])
 @recurring_expense_bp.route('/<expense_id>', methods=['PUT', 'DELETE'])
 @jwt_required()
+@conditional_get('recurring_expense')
 def manage_recurring_expenses(expense_id=None):
     user_id = get_jwt_identity()
     if request.method == 'GET':
@@ -19,4 +21,11 @@ def manage_recurring_expenses(expense_id=None):
         response, status_code = update_recurring_expense(user_id, expense_id, data)
     elif request.method == 'DELETE':
         response, status_code = delete_recurring_expense(user_id, expense_id)
+    return jsonify(response), status_code
+
+@recurring_expense_bp.route('/calendar', methods=['GET'])
+@jwt_required()
+def get_calendar():
+    user_id = get_jwt_identity()
+    response, status_code = get_recurring_calendar(user_id, request.args)
     return jsonify(response), status_code
\ No newline at end of file
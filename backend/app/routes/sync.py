@@ -0,0 +1,12 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services.sync_service import get_changes
+
+sync_bp = Blueprint('sync', __name__)
+
+@sync_bp.route('/', methods=['GET'], strict_slashes=False)
+@jwt_required()
+def sync():
+    user_id = get_jwt_identity()
+    response, status_code = get_changes(user_id, request.args)
+    return jsonify(response), status_code
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.expense import Expense
+from sqlalchemy import func
+from app.models.monthly_summary import MonthlySummary
 from app.extensions import db
 
 voice_bp = Blueprint('voice', __name__)
@@ -13,8 +14,12 @@ def process_voice_command():
     command = data['command']
 
     if "spent on groceries" in command:
-        expenses = Expense.query.filter_by(user_id=user_id, category='groceries').all()
-        total = sum(e.amount for e in expenses)
+        total = (
+            db.session.query(func.coalesce(func.sum(MonthlySummary.total), 0.0))
+            .filter(MonthlySummary.user_id == user_id, MonthlySummary.kind == 'expense',
+                    MonthlySummary.category == 'groceries')
+            .scalar()
+        )
         return jsonify({"response": f"You spent ${total} on groceries."}), 200
 
     return jsonify({"response": "I didn't understand that command."}), 200
\ No newline at end of file
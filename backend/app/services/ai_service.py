@@ -1,22 +1,185 @@
-import numpy as np
-from sklearn.ensemble import RandomForestRegressor
+from datetime import datetime
+from sqlalchemy import func, insert
 from app.models.expense import Expense
+from app.models.forecast import Forecast
+from app.models.table_version import TableVersion
+from app.extensions import db, model_cache, job_queue
+
+# NumPy and the forecasting engine are imported inside the functions that
+# fit forecasts, so importing this module (and booting the app) stays cheap.
+
+def _current_month():
+    now = datetime.utcnow()
+    return now.year * 12 + now.month - 1
+
+def _month_start(index):
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def _fingerprint(version, month):
+    # Every expense write bumps the user's 'expense' table version, so a
+    # cached or precomputed forecast is only reused while it still matches.
+    # The current month is included because the forecast window moves with it.
+    return f"{version}:{month}"
+
+def _expense_fingerprint(user_id):
+    version = db.session.query(TableVersion.version).filter_by(user_id=user_id, table_name='expense').scalar()
+    return _fingerprint(version or 0, _current_month())
+
+def _dated(values, first_month):
+    from app.services.forecast_service import month_label
+    return [
+        {"month": month_label(first_month + i), "amount": round(float(v), 2)}
+        for i, v in enumerate(values)
+    ]
+
+def _forecast_payload(total, categories, first_month):
+    """Shape one user's forecast rows for the API: ``total`` is the overall
+    forecast, ``categories`` maps category name to its forecast row."""
+    return {
+        "predictions": [round(float(v), 2) for v in total],
+        "forecast": _dated(total, first_month),
+        "by_category": {name: _dated(row, first_month) for name, row in categories.items()}
+    }
+
+def _build_forecast(user_id):
+    import numpy as np
+    from app.services.forecast_service import (
+        FORECAST_HORIZON, HISTORY_MONTHS, aggregate_monthly, forecast_matrix, month_index
+    )
+    # Only the history window is loaded: the last HISTORY_MONTHS complete
+    # months plus the current one. Future-dated expenses are left out.
+    current = _current_month()
+    rows = (
+        db.session.query(Expense.date, Expense.category, Expense.amount)
+        .filter(Expense.user_id == user_id,
+                Expense.date >= _month_start(current - HISTORY_MONTHS),
+                Expense.date < _month_start(current + 1))
+        .all()
+    )
+    if not rows:
+        return {"predictions": [], "forecast": [], "by_category": {}}
+    dates, categories, amounts = zip(*rows)
+    months = month_index(dates)
+    names, codes = np.unique(np.array(categories, dtype=object).astype(str), return_inverse=True)
+
+    # History covers complete months only, capped at HISTORY_MONTHS; if all
+    # spending is in the current month, fall back to that single month.
+    end = current
+    if months.min() >= end:
+        end += 1
+    start = max(months.min(), end - HISTORY_MONTHS)
+    n_months = end - start
+
+    by_category = aggregate_monthly(months, np.array(amounts, dtype=float), codes, len(names), start, n_months)
+    series = np.vstack([by_category.sum(axis=0), by_category])
+    forecast = forecast_matrix(series, FORECAST_HORIZON)
+    return _forecast_payload(forecast[0], dict(zip(names, forecast[1:])), end)
+
+def _stored_forecast(user_id, fingerprint):
+    stored = db.session.get(Forecast, user_id)
+    if stored is None or stored.fingerprint != fingerprint:
+        return None
+    return stored.data
 
 def predict_future_expenses(user_id):
-    expenses = Expense.query.filter_by(user_id=user_id).all()
-    if not expenses:
-        return []
+    """Forecast monthly spending (overall and per category) for the next
+    FORECAST_HORIZON months.
+
+    Served from the in-process cache, then from the nightly precomputed
+    ``forecast`` table, and only rebuilt when both are stale for the user's
+    current expenses.
+    """
+    fingerprint = _expense_fingerprint(user_id)
+    forecast = model_cache.get(user_id, fingerprint)
+    if forecast is None:
+        forecast = _stored_forecast(user_id, fingerprint)
+        if forecast is None:
+            forecast = _build_forecast(user_id)
+        model_cache.set(user_id, fingerprint, forecast)
+    return forecast
+
+def forecast_all_users():
+    """Precompute forecasts for every user in one vectorized pass.
+
+    A single grouped query returns per (user, category, month) sums; these
+    are scattered into one ``(series, months)`` matrix holding every user's
+    total and per-category series and forecast with a single
+    ``forecast_matrix`` call. Results replace the contents of the
+    ``forecast`` table. Users without a complete month of history are left to
+    the on-demand path. Returns the number of users written.
+    """
+    import numpy as np
+    from app.services.forecast_service import (
+        FORECAST_HORIZON, HISTORY_MONTHS, aggregate_monthly, forecast_matrix
+    )
+
+    year = func.extract('year', Expense.date)
+    month = func.extract('month', Expense.date)
+    rows = (
+        db.session.query(Expense.user_id, Expense.category, year, month, func.sum(Expense.amount))
+        .filter(Expense.date.isnot(None))
+        .group_by(Expense.user_id, Expense.category, year, month)
+        .all()
+    )
+    versions = dict(
+        db.session.query(TableVersion.user_id, TableVersion.version)
+        .filter(TableVersion.table_name == 'expense')
+        .all()
+    )
+
+    end = _current_month()
+    start = end - HISTORY_MONTHS
+    dated = [(user_id, category, int(y) * 12 + int(m) - 1, total or 0.0)
+             for user_id, category, y, m, total in rows]
+
+    values = []
+    if dated:
+        user_ids, categories, months, amounts = (np.array(col) for col in zip(*dated))
+        months = months.astype(np.int64)
+        amounts = amounts.astype(float)
+        users, user_codes = np.unique(user_ids.astype(str), return_inverse=True)
+        pairs, pair_codes = np.unique(
+            np.char.add(np.char.add(user_ids.astype(str), '\x1f'), categories.astype(str)),
+            return_inverse=True
+        )
+        n_months = end - start
+        totals = aggregate_monthly(months, amounts, user_codes, len(users), start, n_months)
+        by_pair = aggregate_monthly(months, amounts, pair_codes, len(pairs), start, n_months)
+        forecast = forecast_matrix(np.vstack([totals, by_pair]), FORECAST_HORIZON)
+
+        per_user = {}
+        for i, pair in enumerate(pairs):
+            user_id, category = pair.split('\x1f', 1)
+            per_user.setdefault(user_id, {})[category] = forecast[len(users) + i]
+
+        generated_at = datetime.utcnow()
+        values = [{
+            "user_id": str(user_id),
+            "fingerprint": _fingerprint(versions.get(user_id, 0), end),
+            "data": _forecast_payload(forecast[i], per_user[user_id], end),
+            "generated_at": generated_at
+        } for i, user_id in enumerate(users) if totals[i].any()]
 
-    # Prepare data for the model
-    X = np.array([i for i in range(len(expenses))]).reshape(-1, 1)
-    y = np.array([expense.amount for expense in expenses])
+    db.session.query(Forecast).delete()
+    if values:
+        db.session.execute(insert(Forecast), values)
+    db.session.commit()
+    return len(values)
 
-    # Train a Random Forest model
-    model = RandomForestRegressor()
-    model.fit(X, y)
+def refresh_forecast(user_id):
+    """Rebuild a user's forecast; runs on a JobQueue worker."""
+    return {"fingerprint": _expense_fingerprint(user_id), "forecast": _build_forecast(user_id)}
 
-    # Predict next 3 months
-    future_X = np.array([len(expenses), len(expenses) + 1, len(expenses) + 2]).reshape(-1, 1)
-    predictions = model.predict(future_X)
+def enqueue_forecast_refresh(user_id):
+    def store(result):
+        model_cache.set(user_id, result['fingerprint'], result['forecast'])
+    job_id = job_queue.submit(user_id, refresh_forecast, user_id, on_success=store)
+    return {"job_id": job_id, "message": "Forecast refresh queued"}, 202
 
-    return predictions.tolist()
\ No newline at end of file
+def get_forecast_job(user_id, job_id):
+    status = job_queue.status(job_id, user_id)
+    if status is None:
+        return {"message": "Job not found"}, 404
+    if 'result' in status:
+        status['result'] = status['result']['forecast']
+    return status, 200
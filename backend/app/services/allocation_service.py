@@ -0,0 +1,36 @@
+import numpy as np
+from app.services.forecast_service import forecast_matrix
+
+DEFAULT_MONTHS = 6
+MAX_MONTHS = 60
+DEFAULT_PERCENTILE = 75
+
+def spending_matrix(categories, months, amounts, n_categories, n_months):
+    """Scatter ``(category, month, amount)`` triples (integer codes, one per
+    monthly_summary cell) into a ``(n_categories, n_months)`` matrix."""
+    totals = np.zeros((n_categories, n_months))
+    totals[np.asarray(categories, dtype=np.int64), np.asarray(months, dtype=np.int64)] = amounts
+    return totals
+
+def propose_limits(totals, fixed, income=None, percentile=DEFAULT_PERCENTILE):
+    """Monthly limits for every row of a ``(categories, months)`` spending
+    matrix, all categories at once.
+
+    A category's need is the larger of its ``percentile``-th monthly spend and
+    next month's value on its fitted trend, and never less than its ``fixed``
+    recurring cost. When ``income`` is given and the needs exceed it, only the
+    part above the fixed costs is scaled down, pro rata, until the total fits.
+    Returns ``{"average", "level", "trend", "limit"}`` arrays.
+    """
+    totals = np.asarray(totals, dtype=float)
+    fixed = np.asarray(fixed, dtype=float)
+    level = np.percentile(totals, percentile, axis=1)
+    trend = forecast_matrix(totals, horizon=1)[:, 0]
+    limit = np.maximum(np.maximum(level, trend), fixed)
+
+    if income and limit.sum() > income:
+        flexible = limit - fixed
+        room = max(income - fixed.sum(), 0.0)
+        scale = room / flexible.sum() if flexible.sum() > 0 else 0.0
+        limit = fixed + flexible * scale
+    return {"average": totals.mean(axis=1), "level": level, "trend": trend, "limit": limit}
@@ -1,35 +1,98 @@
 import uuid
+from datetime import datetime
 from app.models.budget import Budget
 from app.models.expense import Expense
-from app.extensions import db
-
-def get_budgets(user_id):
-    budgets = Budget.query.filter_by(user_id=user_id).all()
-    budget_data = []
-    for budget in budgets:
-        expenses = Expense.query.filter_by(user_id=user_id, category=budget.category).all()
-        total_spent = sum(e.amount for e in expenses)
-        remaining = budget.limit - total_spent
-        budget_data.append({
-            "id": budget.id,
-            "category": budget.category,
-            "limit": budget.limit,
-            "spent": total_spent,
-            "remaining": remaining
-        })
-    return budget_data, 200
+from app.models.monthly_summary import MonthlySummary
+from app.models.recurring_expense import RecurringExpense
+from app.models.user import User
+from app.extensions import db, response_cache
+from app.services.summary_service import months_between, year_month
+from app.services.sync_service import record_deletion
+from app.services.version_service import bump_versions
+from app.utils.helpers import get_period_range
+from app.utils.recurrence import OCCURRENCES_PER_YEAR, add_months
+from app.utils.upsert import dialect_insert
+from sqlalchemy import func, null, select
+from sqlalchemy.exc import IntegrityError
 
-def add_budget(user_id, data):
-    new_budget = Budget(
-        id=str(uuid.uuid4()),
-        user_id=user_id,
-        category=data['category'],
-        limit=data['limit'],
-        income_percentage=data['income_percentage']
+def get_budget_status(user_id, start, end):
+    """Spent/remaining for every budget of a user within [start, end).
+
+    Spending is summed per category in a single grouped aggregate that is
+    left-joined onto the user's budgets, so the cost is one query no matter
+    how many budgets or expenses the user has. Windows made of whole months
+    are summed from ``monthly_summary`` instead of the raw expense rows.
+    """
+    months = months_between(start, end)
+    if months:
+        spent = (
+            select(MonthlySummary.category.label('category'), func.sum(MonthlySummary.total).label('spent'))
+            .where(MonthlySummary.user_id == user_id, MonthlySummary.kind == 'expense',
+                   MonthlySummary.year_month.in_(months))
+            .group_by(MonthlySummary.category)
+            .subquery()
+        )
+    else:
+        spent = (
+            select(Expense.category.label('category'), func.sum(Expense.amount).label('spent'))
+            .where(Expense.user_id == user_id, Expense.date >= start, Expense.date < end)
+            .group_by(Expense.category)
+            .subquery()
+        )
+    rows = (
+        db.session.query(Budget, func.coalesce(spent.c.spent, 0.0))
+        .outerjoin(spent, spent.c.category == Budget.category)
+        .filter(Budget.user_id == user_id)
+        .all()
+    )
+    return [{
+        "id": budget.id,
+        "category": budget.category,
+        "limit": budget.limit,
+        "spent": total_spent,
+        "remaining": budget.limit - total_spent
+    } for budget, total_spent in rows]
+
+@response_cache.cached('budgets')
+def get_budgets(user_id, params=None):
+    try:
+        start, end = get_period_range(params or {})
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    return get_budget_status(user_id, start, end), 200
+
+def _upsert_statement():
+    table = Budget.__table__
+    stmt = dialect_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.category, table.c.period],
+        # ON CONFLICT DO UPDATE skips column onupdate defaults, so the sync
+        # columns are reset here.
+        set_={"limit": stmt.excluded['limit'], "income_percentage": stmt.excluded.income_percentage,
+              "updated_at": stmt.excluded.updated_at, "change_seq": null()}
     )
-    db.session.add(new_budget)
+
+def upsert_budgets(rows):
+    """Insert or overwrite budgets in one statement, keyed on the unique
+    (user_id, category, period). Runs in the caller's transaction."""
+    if rows:
+        db.session.execute(_upsert_statement(), rows)
+
+def add_budget(user_id, data):
+    row = {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "category": data['category'],
+        "limit": data['limit'],
+        "income_percentage": data['income_percentage'],
+        "period": 'monthly'
+    }
+    # Posting a category that already has a budget updates it in place.
+    budget_id = db.session.execute(_upsert_statement().returning(Budget.id), row).scalar_one()
+    bump_versions(user_id, 'budget')
     db.session.commit()
-    return {"budget_id": new_budget.id, "message": "Budget created successfully"}, 201
+    response_cache.invalidate(user_id)
+    return {"budget_id": budget_id, "message": "Budget created successfully"}, 201
 
 def update_budget(user_id, budget_id, data):
     budget = Budget.query.filter_by(id=budget_id, user_id=user_id).first()
@@ -43,7 +106,13 @@ def update_budget(user_id, budget_id, data):
     if data.get('income_percentage'):
         budget.income_percentage = data['income_percentage']
 
-    db.session.commit()
+    try:
+        bump_versions(user_id, 'budget')
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return {"message": "A budget for this category already exists"}, 409
+    response_cache.invalidate(user_id)
     return {"message": "Budget updated successfully"}, 200
 
 def delete_budget(user_id, budget_id):
@@ -52,5 +121,98 @@ def delete_budget(user_id, budget_id):
         return {"message": "Budget not found"}, 404
 
     db.session.delete(budget)
+    record_deletion(user_id, 'budget', budget_id)
+    bump_versions(user_id, 'budget')
     db.session.commit()
-    return {"message": "Budget deleted successfully"}, 200
\ No newline at end of file
+    response_cache.invalidate(user_id)
+    return {"message": "Budget deleted successfully"}, 200
+
+def optimize_budgets(user_id, data, now=None):
+    """Propose monthly budgets from the user's last ``months`` complete months.
+
+    The history comes from ``monthly_summary`` (at most one row per category
+    and month) and recurring expenses are converted to a monthly fixed cost
+    per category; the limits themselves are computed for all categories at
+    once by ``allocation_service.propose_limits``. With ``"apply": true`` the
+    proposal is also written as the user's budgets.
+    """
+    import numpy as np
+    from app.services.allocation_service import (
+        DEFAULT_MONTHS, DEFAULT_PERCENTILE, MAX_MONTHS, propose_limits, spending_matrix
+    )
+
+    data = data or {}
+    try:
+        months = int(data.get('months', DEFAULT_MONTHS))
+        percentile = float(data.get('percentile', DEFAULT_PERCENTILE))
+    except (TypeError, ValueError):
+        return {"message": "'months' and 'percentile' must be numbers"}, 400
+    if not 1 <= months <= MAX_MONTHS:
+        return {"message": f"'months' must be between 1 and {MAX_MONTHS}"}, 400
+    if not 0 <= percentile <= 100:
+        return {"message": "'percentile' must be between 0 and 100"}, 400
+
+    user = db.session.get(User, user_id)
+    if not user:
+        return {"message": "User not found"}, 404
+
+    now = now or datetime.utcnow()
+    this_month = datetime(now.year, now.month, 1)
+    labels = [year_month(add_months(this_month, i)) for i in range(-months, 0)]
+    history = (
+        db.session.query(MonthlySummary.category, MonthlySummary.year_month, MonthlySummary.total)
+        .filter(MonthlySummary.user_id == user_id, MonthlySummary.kind == 'expense',
+                MonthlySummary.year_month.in_(labels))
+        .all()
+    )
+    recurring = (
+        db.session.query(RecurringExpense.category, RecurringExpense.amount, RecurringExpense.frequency)
+        .filter(RecurringExpense.user_id == user_id)
+        .all()
+    )
+    recurring = [(category, amount * OCCURRENCES_PER_YEAR[frequency.strip().lower()] / 12)
+                 for category, amount, frequency in recurring
+                 if (frequency or '').strip().lower() in OCCURRENCES_PER_YEAR]
+
+    names = sorted({row[0] for row in history} | {row[0] for row in recurring})
+    codes = {name: i for i, name in enumerate(names)}
+    columns = {label: i for i, label in enumerate(labels)}
+    totals = spending_matrix(
+        [codes[c] for c, _, _ in history], [columns[m] for _, m, _ in history],
+        [total for _, _, total in history], len(names), months
+    )
+    fixed = np.bincount([codes[c] for c, _ in recurring], weights=[a for _, a in recurring],
+                        minlength=len(names)) if recurring else np.zeros(len(names))
+    income = user.income or 0.0
+    proposal = propose_limits(totals, fixed, income, percentile)
+
+    allocations = [{
+        "category": name,
+        "limit": round(float(proposal['limit'][i]), 2),
+        "fixed": round(float(fixed[i]), 2),
+        "average": round(float(proposal['average'][i]), 2),
+        "percentile_spend": round(float(proposal['level'][i]), 2),
+        "trend": round(float(proposal['trend'][i]), 2),
+        "income_percentage": round(float(proposal['limit'][i]) / income * 100, 2) if income else 0.0
+    } for i, name in enumerate(names)]
+    total = round(float(proposal['limit'].sum()), 2)
+
+    applied = bool(data.get('apply'))
+    if applied and allocations:
+        upsert_budgets([{
+            "id": str(uuid.uuid4()), "user_id": user_id, "category": a['category'], "limit": a['limit'],
+            "income_percentage": a['income_percentage'], "period": 'monthly'
+        } for a in allocations])
+        bump_versions(user_id, 'budget')
+        db.session.commit()
+        response_cache.invalidate(user_id)
+
+    return {
+        "months": labels,
+        "percentile": percentile,
+        "income": income,
+        "allocations": allocations,
+        "total": total,
+        "unallocated": round(income - total, 2) if income else None,
+        "applied": applied
+    }, 200
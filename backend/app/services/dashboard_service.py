@@ -0,0 +1,79 @@
+from datetime import datetime
+from sqlalchemy import func
+from app.models.user import User
+from app.models.goal import Goal
+from app.models.monthly_summary import MonthlySummary
+from app.extensions import db
+from app.services.ai_service import predict_future_expenses
+from app.services.budget_service import get_budget_status
+from app.services.summary_service import year_month
+from app.utils.helpers import get_period_range
+
+def _month_totals(user_id, label):
+    rows = (
+        db.session.query(
+            MonthlySummary.kind, MonthlySummary.category,
+            func.sum(MonthlySummary.count), func.sum(MonthlySummary.total)
+        )
+        .filter(MonthlySummary.user_id == user_id, MonthlySummary.year_month == label)
+        .group_by(MonthlySummary.kind, MonthlySummary.category)
+        .all()
+    )
+    totals = {"expenses": 0.0, "income": 0.0, "expense_count": 0, "by_category": {}}
+    for kind, category, count, total in rows:
+        if kind == 'expense':
+            totals["expenses"] += total
+            totals["expense_count"] += count
+            totals["by_category"][category] = total
+        else:
+            totals["income"] += total
+    totals["net"] = totals["income"] - totals["expenses"]
+    return totals
+
+def _goal_progress(user_id):
+    goals = (
+        db.session.query(Goal.id, Goal.goal_name, Goal.target_amount, Goal.saved_amount, Goal.target_date)
+        .filter(Goal.user_id == user_id)
+        .order_by(Goal.target_date)
+        .all()
+    )
+    items = [{
+        "id": g.id,
+        "goal_name": g.goal_name,
+        "target_amount": g.target_amount,
+        "saved_amount": g.saved_amount or 0.0,
+        "target_date": g.target_date.strftime('%Y-%m-%d') if g.target_date else None,
+        "progress": round(100 * (g.saved_amount or 0.0) / g.target_amount, 1) if g.target_amount else None
+    } for g in goals]
+    return {
+        "items": items,
+        "target_total": sum(g["target_amount"] for g in items),
+        "saved_total": sum(g["saved_amount"] for g in items)
+    }
+
+def get_dashboard(user_id):
+    """Everything the frontend shows on load, in one response.
+
+    Each section is a single query (profile by primary key, current-month
+    totals and budget status from ``monthly_summary``, goals) plus the
+    forecast lookup, so the query count does not grow with the number of
+    expenses, incomes, budgets or goals.
+    """
+    user = db.session.get(User, user_id)
+    if not user:
+        return {"message": "User not found"}, 404
+    now = datetime.utcnow()
+    start, end = get_period_range({'period': 'month'}, now=now)
+    return {
+        "profile": {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "income": user.income
+        },
+        "month": year_month(now),
+        "totals": _month_totals(user_id, year_month(now)),
+        "budgets": get_budget_status(user_id, start, end),
+        "goals": _goal_progress(user_id),
+        "forecast": predict_future_expenses(user_id)
+    }, 200
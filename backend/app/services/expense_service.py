@@ -1,33 +1,132 @@
+import csv
+import io
 import uuid
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import insert
 from app.models.expense import Expense
-from app.extensions import db
+from app.extensions import db, model_cache, response_cache
+from app.services.notification_service import record_spend_change, record_spend_changes
+from app.services.summary_service import add_to_summary, remove_from_summary
+from app.services.sync_service import record_deletion
+from app.services.version_service import bump_versions
+from app.utils.helpers import get_date_filters
+from app.utils.pagination import keyset_paginate
+from app.utils.validators import validate_expense
 
-def get_expenses(user_id):
-    expenses = Expense.query.filter_by(user_id=user_id).all()
-    return [{"id": e.id, "amount": e.amount, "category": e.category, "date": e.date} for e in expenses], 200
+def filter_expenses(query, params):
+    start, end = get_date_filters(params)
+    if start:
+        query = query.filter(Expense.date >= start)
+    if end:
+        query = query.filter(Expense.date < end)
+    if params.get('category'):
+        query = query.filter(Expense.category == params['category'])
+    if params.get('min_amount'):
+        query = query.filter(Expense.amount >= float(params['min_amount']))
+    if params.get('max_amount'):
+        query = query.filter(Expense.amount <= float(params['max_amount']))
+    return query
+
+@response_cache.cached('expenses')
+def get_expenses(user_id, params=None):
+    params = params or {}
+    try:
+        query = filter_expenses(Expense.query.filter_by(user_id=user_id), params)
+        expenses, next_cursor = keyset_paginate(query, [Expense.date, Expense.id], params)
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    return {
+        "items": [{"id": e.id, "amount": e.amount, "category": e.category, "date": e.date} for e in expenses],
+        "next_cursor": next_cursor
+    }, 200
 
 def add_expense(user_id, data):
     new_expense = Expense(
         id=str(uuid.uuid4()),
         user_id=user_id,
         amount=data['amount'],
-        category=data['category']
+        category=data['category'],
+        date=datetime.utcnow()
     )
     db.session.add(new_expense)
+    add_to_summary('expense', [{
+        "user_id": user_id, "category": new_expense.category,
+        "amount": new_expense.amount, "date": new_expense.date
+    }])
+    record_spend_change(user_id, new_expense.category, new_expense.date, new_expense.amount)
+    bump_versions(user_id, 'expense')
     db.session.commit()
+    model_cache.invalidate(user_id)
+    response_cache.invalidate(user_id)
     return {"expense_id": new_expense.id, "message": "Expense added successfully"}, 201
 
+def read_expense_csv(file):
+    """Read an uploaded CSV with ``amount``, ``category`` and optional ``date``
+    columns into a list of row dicts, or None if it cannot be parsed."""
+    text = io.TextIOWrapper(file.stream, encoding='utf-8-sig')
+    try:
+        return list(csv.DictReader(text))
+    except (UnicodeDecodeError, csv.Error):
+        return None
+
+def add_expenses_bulk(user_id, rows):
+    if not isinstance(rows, list):
+        return {"message": "Expected a JSON array of expenses or a CSV file"}, 400
+
+    valid, errors = [], []
+    now = datetime.utcnow()
+    for index, row in enumerate(rows):
+        values, error = validate_expense(row)
+        if error:
+            errors.append({"row": index, "error": error})
+            continue
+        values['id'] = str(uuid.uuid4())
+        values['user_id'] = user_id
+        values.setdefault('date', now)
+        valid.append(values)
+
+    if not valid:
+        return {"inserted": 0, "errors": errors, "message": "No valid expenses to insert"}, 400
+
+    # One executemany per chunk, all inside a single transaction.
+    chunk_size = current_app.config['BULK_INSERT_CHUNK_SIZE']
+    for start in range(0, len(valid), chunk_size):
+        db.session.execute(insert(Expense), valid[start:start + chunk_size])
+    add_to_summary('expense', valid)
+    record_spend_changes(valid)
+    bump_versions(user_id, 'expense')
+    db.session.commit()
+    model_cache.invalidate(user_id)
+    response_cache.invalidate(user_id)
+    return {
+        "inserted": len(valid),
+        "errors": errors,
+        "message": "Expenses imported successfully"
+    }, 201
+
 def update_expense(user_id, expense_id, data):
     expense = Expense.query.filter_by(id=expense_id, user_id=user_id).first()
     if not expense:
         return {"message": "Expense not found"}, 404
 
+    old_category, old_amount, date = expense.category, expense.amount, expense.date
     if data.get('amount'):
         expense.amount = data['amount']
     if data.get('category'):
         expense.category = data['category']
+    new_category, new_amount = expense.category, float(expense.amount)
 
+    remove_from_summary('expense', [{"user_id": user_id, "category": old_category, "amount": old_amount, "date": date}])
+    add_to_summary('expense', [{"user_id": user_id, "category": new_category, "amount": new_amount, "date": date}])
+    record_spend_changes([
+        {"user_id": user_id, "category": old_category, "date": date, "amount": -old_amount},
+        {"user_id": user_id, "category": new_category, "date": date, "amount": new_amount}
+    ])
+    bump_versions(user_id, 'expense')
     db.session.commit()
+    model_cache.invalidate(user_id)
+    response_cache.invalidate(user_id)
     return {"message": "Expense updated successfully"}, 200
 
 def delete_expense(user_id, expense_id):
@@ -35,6 +134,12 @@ def delete_expense(user_id, expense_id):
     if not expense:
         return {"message": "Expense not found"}, 404
 
+    category, amount, date = expense.category, expense.amount, expense.date
     db.session.delete(expense)
+    record_deletion(user_id, 'expense', expense_id)
+    remove_from_summary('expense', [{"user_id": user_id, "category": category, "amount": amount, "date": date}])
+    bump_versions(user_id, 'expense')
     db.session.commit()
-    return {"message": "Expense deleted successfully"}, 200
\ No newline at end of file
+    model_cache.invalidate(user_id)
+    response_cache.invalidate(user_id)
+    return {"message": "Expense deleted successfully"}, 200
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from datetime import datetime
+from app.models.expense import Expense
+from app.models.income import Income
+from app.services.expense_service import filter_expenses
+from app.utils.helpers import get_date_filters
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+EXPORT_BATCH_SIZE = 1000
+
+EXPENSE_FIELDS = ['id', 'amount', 'category', 'date']
+INCOME_FIELDS = ['id', 'source', 'amount', 'date']
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def _stream(query, fields, fmt):
+    # yield_per keeps only one batch of ORM objects alive at a time and, on
+    # Postgres, fetches through a server-side cursor; each batch is flushed to
+    # the client as one chunk so memory stays flat for any export size.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        writer.writerow(fields)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    count = 0
+    for row in query.yield_per(EXPORT_BATCH_SIZE):
+        values = [_serialize(getattr(row, f)) for f in fields]
+        if fmt == 'csv':
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(fields, values))) + '\n')
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def export_expenses(user_id, params):
+    fmt = params.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return {"message": f"Unsupported format '{fmt}'"}, 400
+    try:
+        query = filter_expenses(Expense.query.filter_by(user_id=user_id), params)
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    return _stream(query.order_by(Expense.date, Expense.id), EXPENSE_FIELDS, fmt), 200
+
+def export_incomes(user_id, params):
+    fmt = params.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return {"message": f"Unsupported format '{fmt}'"}, 400
+    query = Income.query.filter_by(user_id=user_id)
+    try:
+        start, end = get_date_filters(params)
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    if start:
+        query = query.filter(Income.date >= start)
+    if end:
+        query = query.filter(Income.date < end)
+    return _stream(query.order_by(Income.date, Income.id), INCOME_FIELDS, fmt), 200
@@ -0,0 +1,69 @@
+import numpy as np
+
+FORECAST_HORIZON = 3
+SEASON_LENGTH = 12
+HISTORY_MONTHS = 36
+
+def month_index(dates):
+    """Map datetimes to integer month numbers (``year * 12 + month - 1``)."""
+    return np.fromiter((d.year * 12 + d.month - 1 for d in dates), dtype=np.int64, count=len(dates))
+
+def month_label(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+def aggregate_monthly(months, amounts, groups, n_groups, start, n_months):
+    """Sum ``amounts`` into a ``(n_groups, n_months)`` matrix in one bincount.
+
+    ``months`` are month indexes, ``groups`` integer row ids; entries outside
+    ``[start, start + n_months)`` are dropped.
+    """
+    offset = months - start
+    keep = (offset >= 0) & (offset < n_months)
+    flat = groups[keep] * n_months + offset[keep]
+    totals = np.bincount(flat, weights=amounts[keep], minlength=n_groups * n_months)
+    return totals.reshape(n_groups, n_months)
+
+def forecast_matrix(totals, horizon=FORECAST_HORIZON):
+    """Forecast every row of a ``(series, months)`` matrix at once.
+
+    Each row gets a least-squares linear trend fitted from its first non-zero
+    month onwards; rows with at least two full seasons of history also get a
+    month-of-year adjustment from the mean detrended residual (seasonal
+    naive on top of the trend). Rows with fewer than three observed months
+    fall back to their mean. Everything is closed-form and vectorized, so the
+    cost is a handful of array passes regardless of the number of rows.
+    """
+    totals = np.asarray(totals, dtype=float)
+    n_series, n_months = totals.shape
+    t = np.arange(n_months, dtype=float)
+
+    started = totals > 0
+    first = np.where(started.any(axis=1), started.argmax(axis=1), n_months)
+    w = (t[None, :] >= first[:, None]).astype(float)
+
+    sw = w.sum(axis=1)
+    st = (w * t).sum(axis=1)
+    sy = (w * totals).sum(axis=1)
+    stt = (w * t * t).sum(axis=1)
+    sty = (w * t * totals).sum(axis=1)
+    denom = sw * stt - st * st
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_t = np.where(sw > 0, st / sw, 0.0)
+        mean_y = np.where(sw > 0, sy / sw, 0.0)
+        slope = np.where((sw >= 3) & (denom > 0), (sw * sty - st * sy) / denom, 0.0)
+    intercept = mean_y - slope * mean_t
+
+    future_t = np.arange(n_months, n_months + horizon, dtype=float)
+    forecast = intercept[:, None] + slope[:, None] * future_t[None, :]
+
+    seasonal_rows = sw >= 2 * SEASON_LENGTH
+    if seasonal_rows.any():
+        residual = (totals - (intercept[:, None] + slope[:, None] * t[None, :])) * w
+        season = np.eye(SEASON_LENGTH)[np.arange(n_months) % SEASON_LENGTH]
+        counts = w @ season
+        with np.errstate(divide='ignore', invalid='ignore'):
+            effect = np.where(counts > 0, (residual @ season) / counts, 0.0)
+        future_season = np.arange(n_months, n_months + horizon) % SEASON_LENGTH
+        forecast += np.where(seasonal_rows[:, None], effect[:, future_season], 0.0)
+
+    return np.clip(forecast, 0.0, None)
@@ -1,17 +1,29 @@
 import uuid
 from app.models.goal import Goal
-from app.extensions import db
+from app.extensions import db, response_cache
+from app.services.sync_service import record_deletion
+from app.services.version_service import bump_versions
+from app.utils.pagination import keyset_paginate
 from datetime import datetime
 
-def get_goals(user_id):
-    goals = Goal.query.filter_by(user_id=user_id).all()
-    return [{
-        "id": g.id,
-        "goal_name": g.goal_name,
-        "target_amount": g.target_amount,
-        "saved_amount": g.saved_amount,
-        "target_date": g.target_date.strftime('%Y-%m-%d') if g.target_date else None
-    } for g in goals], 200
+@response_cache.cached('goals')
+def get_goals(user_id, params=None):
+    try:
+        goals, next_cursor = keyset_paginate(
+            Goal.query.filter_by(user_id=user_id), [Goal.target_date, Goal.id], params or {}
+        )
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    return {
+        "items": [{
+            "id": g.id,
+            "goal_name": g.goal_name,
+            "target_amount": g.target_amount,
+            "saved_amount": g.saved_amount,
+            "target_date": g.target_date.strftime('%Y-%m-%d') if g.target_date else None
+        } for g in goals],
+        "next_cursor": next_cursor
+    }, 200
 
 def add_goal(user_id, data):
     target_date = datetime.strptime(data['target_date'], '%Y-%m-%d') if data.get('target_date') else None
@@ -24,7 +36,9 @@ def add_goal(user_id, data):
         target_date=target_date
     )
     db.session.add(new_goal)
+    bump_versions(user_id, 'goal')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"goal_id": new_goal.id, "message": "Goal created successfully"}, 201
 
 def update_goal(user_id, goal_id, data):
@@ -41,7 +55,9 @@ def update_goal(user_id, goal_id, data):
     if data.get('target_date'):
         goal.target_date = datetime.strptime(data['target_date'], '%Y-%m-%d')
 
+    bump_versions(user_id, 'goal')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"message": "Goal updated successfully"}, 200
 
 def delete_goal(user_id, goal_id):
@@ -50,5 +66,8 @@ def delete_goal(user_id, goal_id):
         return {"message": "Goal not found"}, 404
 
     db.session.delete(goal)
+    record_deletion(user_id, 'goal', goal_id)
+    bump_versions(user_id, 'goal')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"message": "Goal deleted successfully"}, 200
\ No newline at end of file
@@ -1,25 +1,52 @@
 import uuid
+from datetime import datetime
 from app.models.income import Income
-from app.extensions import db
+from app.extensions import db, response_cache
+from app.services.summary_service import add_to_summary, remove_from_summary
+from app.services.sync_service import record_deletion
+from app.services.version_service import bump_versions
+from app.utils.helpers import get_date_filters
+from app.utils.pagination import keyset_paginate
 
-def get_incomes(user_id):
-    incomes = Income.query.filter_by(user_id=user_id).all()
-    return [{
-        "id": i.id,
-        "source": i.source,
-        "amount": i.amount,
-        "date": i.date.isoformat() if i.date else None
-    } for i in incomes], 200
+@response_cache.cached('incomes')
+def get_incomes(user_id, params=None):
+    params = params or {}
+    query = Income.query.filter_by(user_id=user_id)
+    try:
+        start, end = get_date_filters(params)
+        if start:
+            query = query.filter(Income.date >= start)
+        if end:
+            query = query.filter(Income.date < end)
+        incomes, next_cursor = keyset_paginate(query, [Income.date, Income.id], params)
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    return {
+        "items": [{
+            "id": i.id,
+            "source": i.source,
+            "amount": i.amount,
+            "date": i.date.isoformat() if i.date else None
+        } for i in incomes],
+        "next_cursor": next_cursor
+    }, 200
 
 def add_income(user_id, data):
     new_income = Income(
         id=str(uuid.uuid4()),
         user_id=user_id,
         source=data['source'],
-        amount=data['amount']
+        amount=data['amount'],
+        date=datetime.utcnow()
     )
     db.session.add(new_income)
+    add_to_summary('income', [{
+        "user_id": user_id, "source": new_income.source,
+        "amount": new_income.amount, "date": new_income.date
+    }])
+    bump_versions(user_id, 'income')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"income_id": new_income.id, "message": "Income added successfully"}, 201
 
 def update_income(user_id, income_id, data):
@@ -27,12 +54,17 @@ def update_income(user_id, income_id, data):
     if not income:
         return {"message": "Income not found"}, 404
 
+    old_source, old_amount = income.source, income.amount
     if data.get('source'):
         income.source = data['source']
     if data.get('amount'):
         income.amount = data['amount']
 
+    remove_from_summary('income', [{"user_id": user_id, "source": old_source, "amount": old_amount, "date": income.date}])
+    add_to_summary('income', [{"user_id": user_id, "source": income.source, "amount": income.amount, "date": income.date}])
+    bump_versions(user_id, 'income')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"message": "Income updated successfully"}, 200
 
 def delete_income(user_id, income_id):
@@ -41,5 +73,9 @@ def delete_income(user_id, income_id):
         return {"message": "Income not found"}, 404
 
     db.session.delete(income)
+    record_deletion(user_id, 'income', income_id)
+    remove_from_summary('income', [{"user_id": user_id, "source": income.source, "amount": income.amount, "date": income.date}])
+    bump_versions(user_id, 'income')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"message": "Income deleted successfully"}, 200
\ No newline at end of file
@@ -0,0 +1,209 @@
+import logging
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, tuple_
+from app.models.budget import Budget
+from app.models.monthly_summary import MonthlySummary
+from app.models.notification import NotificationOutbox
+from app.extensions import db, notifier
+
+logger = logging.getLogger(__name__)
+
+THRESHOLDS = (50, 80, 100)
+
+def period_key(date):
+    return f"{date.year:04d}-{date.month:02d}"
+
+def get_spent(user_id, category, date=None):
+    """Month-to-date spend for a category, from its ``monthly_summary`` row."""
+    date = date or datetime.utcnow()
+    total = (
+        db.session.query(MonthlySummary.total)
+        .filter_by(user_id=user_id, year_month=period_key(date), kind='expense', category=category)
+        .scalar()
+    )
+    return total or 0.0
+
+def record_spend_change(user_id, category, date, delta):
+    """Evaluate budget thresholds for one change of ``delta``; see
+    ``record_spend_changes``."""
+    record_spend_changes([{"user_id": user_id, "category": category, "date": date, "amount": delta}])
+
+def record_spend_changes(rows):
+    """Queue an alert for every budget threshold crossed upwards by expense
+    changes (dicts with ``user_id``, ``category``, ``date`` and ``amount``,
+    negative for removed spend).
+
+    Must run inside the write's transaction, after its ``monthly_summary``
+    upsert: the row's new total is the "after" figure and the grouped delta
+    is subtracted to get "before". The upsert locks the summary row until
+    commit, so concurrent writers in any process see each other's totals in
+    order. Alerts are added to the outbox in the same transaction. Costs one
+    summary lookup and one budget lookup per call, however many rows.
+    """
+    grouped = {}
+    for row in rows:
+        date = row['date'] or datetime.utcnow()
+        key = (row['user_id'], row['category'], period_key(date))
+        grouped[key] = grouped.get(key, 0.0) + row['amount']
+    # Only added spend can cross a threshold upwards.
+    grouped = {key: delta for key, delta in grouped.items() if delta > 0}
+    if not grouped:
+        return
+
+    totals = dict(
+        ((user_id, category, period), total) for user_id, category, period, total in
+        db.session.query(MonthlySummary.user_id, MonthlySummary.category, MonthlySummary.year_month,
+                         MonthlySummary.total)
+        .filter(MonthlySummary.kind == 'expense',
+                tuple_(MonthlySummary.user_id, MonthlySummary.category, MonthlySummary.year_month)
+                .in_(list(grouped)))
+    )
+    budgets = {}
+    for budget in Budget.query.filter(tuple_(Budget.user_id, Budget.category).in_(
+            {(user_id, category) for user_id, category, _ in grouped})):
+        budgets.setdefault((budget.user_id, budget.category), budget)
+
+    for (user_id, category, period), delta in grouped.items():
+        budget = budgets.get((user_id, category))
+        if not budget or not budget.limit or budget.limit <= 0:
+            continue
+        after = totals.get((user_id, category, period), 0.0)
+        before = after - delta
+        for threshold in THRESHOLDS:
+            level = budget.limit * threshold / 100
+            if before < level <= after:
+                enqueue_notification({
+                    "user_id": user_id,
+                    "category": category,
+                    "period": period,
+                    "threshold": threshold,
+                    "spent": round(after, 2),
+                    "limit": budget.limit,
+                    "message": (
+                        f"You've exceeded your {category} budget for {period}." if threshold >= 100 else
+                        f"You've used {threshold}% of your {category} budget for {period}."
+                    ),
+                    "created_at": datetime.utcnow().isoformat()
+                }, commit=False)
+
+def check_budget(user_id, category):
+    budget = Budget.query.filter_by(user_id=user_id, category=category).first()
+    if not budget:
+        return {"message": f"No budget found for {category}"}, 404
+    spent = get_spent(user_id, category)
+    if spent > budget.limit:
+        return {
+            "message_id": "mock_message_id_12345",
+            "message": f"Mock SMS sent: You've exceeded your budget for {category}."
+        }, 200
+    return {"message": "No notification sent."}, 200
+
+def enqueue_notification(notification, now=None, commit=True):
+    """Write a notification to the outbox unless an identical alert (same
+    user, category, period and threshold) was queued within
+    ``NOTIFICATION_DEDUPE_WINDOW`` seconds. Returns the outbox row or None.
+
+    With ``commit=False`` the row is only added to the session, so it is
+    committed together with the caller's write."""
+    now = now or datetime.utcnow()
+    user_id = notification['user_id']
+    dedupe_key = f"{notification['category']}:{notification['period']}:{notification['threshold']}"
+    window_start = now - timedelta(seconds=current_app.config['NOTIFICATION_DEDUPE_WINDOW'])
+    duplicate = (
+        db.session.query(NotificationOutbox.id)
+        .filter(NotificationOutbox.user_id == user_id,
+                NotificationOutbox.dedupe_key == dedupe_key,
+                NotificationOutbox.created_at >= window_start)
+        .first()
+    )
+    if duplicate:
+        return None
+    message = NotificationOutbox(
+        user_id=user_id,
+        dedupe_key=dedupe_key,
+        payload=notification,
+        next_attempt_at=now,
+        created_at=now
+    )
+    db.session.add(message)
+    if commit:
+        db.session.commit()
+    return message
+
+def _rate_usage(user_ids, window_start):
+    rows = (
+        db.session.query(NotificationOutbox.user_id, func.count(), func.min(NotificationOutbox.sent_at))
+        .filter(NotificationOutbox.user_id.in_(user_ids),
+                NotificationOutbox.sent_at > window_start)
+        .group_by(NotificationOutbox.user_id)
+        .all()
+    )
+    return {user_id: (count, oldest) for user_id, count, oldest in rows}
+
+def deliver_pending(now=None, batch_size=None):
+    """Deliver one batch of due outbox messages through the configured sender.
+
+    Messages for users who already received ``NOTIFICATION_RATE_LIMIT``
+    messages in the last ``NOTIFICATION_RATE_WINDOW`` seconds are deferred
+    until their oldest one leaves the window. A failed send is retried after
+    ``NOTIFICATION_RETRY_BASE * 2 ** (attempts - 1)`` seconds and marked
+    ``failed`` after ``NOTIFICATION_MAX_ATTEMPTS``. Rows are locked with SKIP
+    LOCKED so several workers can drain the same outbox. Returns counts of
+    what happened to the batch.
+    """
+    config = current_app.config
+    now = now or datetime.utcnow()
+    batch_size = batch_size or config['NOTIFICATION_BATCH_SIZE']
+    batch = (
+        NotificationOutbox.query
+        .filter(NotificationOutbox.status == 'pending', NotificationOutbox.next_attempt_at <= now)
+        .order_by(NotificationOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    stats = {"sent": 0, "retried": 0, "failed": 0, "deferred": 0}
+    if not batch:
+        return stats
+
+    window = timedelta(seconds=config['NOTIFICATION_RATE_WINDOW'])
+    limit = config['NOTIFICATION_RATE_LIMIT']
+    usage = _rate_usage({m.user_id for m in batch}, now - window)
+    sender = notifier.sender
+    for message in batch:
+        count, oldest = usage.get(message.user_id, (0, None))
+        if count >= limit:
+            message.next_attempt_at = (oldest or now) + window
+            stats['deferred'] += 1
+            continue
+        message.attempts += 1
+        try:
+            sender.send(message.payload)
+        except Exception as e:
+            logger.warning("Notification %s failed (attempt %s): %s", message.id, message.attempts, e)
+            message.last_error = str(e)[:500]
+            if message.attempts >= config['NOTIFICATION_MAX_ATTEMPTS']:
+                message.status = 'failed'
+                stats['failed'] += 1
+            else:
+                delay = config['NOTIFICATION_RETRY_BASE'] * 2 ** (message.attempts - 1)
+                message.next_attempt_at = now + timedelta(seconds=delay)
+                stats['retried'] += 1
+            continue
+        message.status = 'sent'
+        message.sent_at = now
+        usage[message.user_id] = (count + 1, oldest or now)
+        stats['sent'] += 1
+    db.session.commit()
+    return stats
+
+def flush_outbox(now=None, batch_size=None):
+    """Run ``deliver_pending`` until nothing is due; returns summed counts."""
+    totals = {"sent": 0, "retried": 0, "failed": 0, "deferred": 0}
+    while True:
+        stats = deliver_pending(now=now, batch_size=batch_size)
+        if not any(stats.values()):
+            return totals
+        for key, value in stats.items():
+            totals[key] += value
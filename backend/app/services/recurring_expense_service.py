@@ -1,8 +1,22 @@
+import heapq
+import logging
 import uuid
+from itertools import groupby
+from app.models.expense import Expense
 from app.models.recurring_expense import RecurringExpense
-from app.extensions import db
-from datetime import datetime
+from app.extensions import db, model_cache, response_cache
+from app.services.notification_service import record_spend_changes
+from app.services.summary_service import add_to_summary
+from app.services.sync_service import record_deletion
+from app.services.version_service import bump_versions, bump_versions_for_users
+from app.utils.helpers import get_date_filters
+from app.utils.recurrence import first_index_on_or_after, iter_occurrences, nth_occurrence, normalize_frequency
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, insert, update
 
+logger = logging.getLogger(__name__)
+
+@response_cache.cached('recurring_expenses')
 def get_recurring_expenses(user_id):
     expenses = RecurringExpense.query.filter_by(user_id=user_id).all()
     return [{
@@ -14,16 +28,22 @@ def get_recurring_expenses(user_id):
     } for e in expenses], 200
 
 def add_recurring_expense(user_id, data):
+    try:
+        frequency = normalize_frequency(data['frequency'])
+    except ValueError as e:
+        return {"message": str(e)}, 400
     new_expense = RecurringExpense(
         id=str(uuid.uuid4()),
         user_id=user_id,
         amount=data['amount'],
         category=data['category'],
-        frequency=data['frequency'],
+        frequency=frequency,
         next_date=datetime.strptime(data['next_date'], '%Y-%m-%d')
     )
     db.session.add(new_expense)
+    bump_versions(user_id, 'recurring_expense')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"expense_id": new_expense.id, "message": "Recurring expense added successfully"}, 201
 
 def update_recurring_expense(user_id, expense_id, data):
@@ -36,11 +56,19 @@ def update_recurring_expense(user_id, expense_id, data):
     if data.get('category'):
         expense.category = data['category']
     if data.get('frequency'):
-        expense.frequency = data['frequency']
+        try:
+            expense.frequency = normalize_frequency(data['frequency'])
+        except ValueError as e:
+            return {"message": str(e)}, 400
     if data.get('next_date'):
         expense.next_date = datetime.strptime(data['next_date'], '%Y-%m-%d')
+    if data.get('next_date') or data.get('frequency'):
+        # A new date or frequency starts a new schedule.
+        expense.anchor_date = expense.next_date
 
+    bump_versions(user_id, 'recurring_expense')
     db.session.commit()
+    response_cache.invalidate(user_id)
     return {"message": "Recurring expense updated successfully"}, 200
 
 def delete_recurring_expense(user_id, expense_id):
@@ -49,5 +77,163 @@ def delete_recurring_expense(user_id, expense_id):
         return {"message": "Recurring expense not found"}, 404
 
     db.session.delete(expense)
+    record_deletion(user_id, 'recurring_expense', expense_id)
+    bump_versions(user_id, 'recurring_expense')
     db.session.commit()
-    return {"message": "Recurring expense deleted successfully"}, 200
\ No newline at end of file
+    response_cache.invalidate(user_id)
+    return {"message": "Recurring expense deleted successfully"}, 200
+
+MAX_CALENDAR_DAYS = 3660
+
+def _expand(index, anchor_date, next_date, frequency, start, until):
+    # Plain (datetime, int) tuples compare natively, so the heap merge needs
+    # no key function.
+    for occurrence in iter_occurrences(anchor_date, frequency, until, since=max(start, next_date)):
+        yield occurrence, index
+
+def get_recurring_calendar(user_id, params):
+    """Per-day totals of upcoming recurring expenses in ``[from, to]``.
+
+    Each recurrence is expanded by its own generator and the streams are
+    merged in date order through a heap, so only one pending occurrence per
+    recurrence is held in memory however long the window is. Per-occurrence
+    items are included only when ``detail=true``.
+    """
+    try:
+        start, end = get_date_filters(params)
+    except ValueError as e:
+        return {"message": str(e)}, 400
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = start or today
+    end = end or start + timedelta(days=31)
+    if end <= start:
+        return {"message": "'to' must not be before 'from'"}, 400
+    if (end - start).days > MAX_CALENDAR_DAYS:
+        return {"message": f"Calendar window must be at most {MAX_CALENDAR_DAYS} days"}, 400
+    detail = params.get('detail', '').lower() == 'true'
+    until = end - timedelta(microseconds=1)
+
+    recurrences = (
+        db.session.query(
+            RecurringExpense.id, RecurringExpense.amount, RecurringExpense.category,
+            RecurringExpense.frequency, RecurringExpense.next_date, RecurringExpense.anchor_date
+        )
+        .filter(RecurringExpense.user_id == user_id, RecurringExpense.next_date < end)
+        .all()
+    )
+    streams, amounts = [], [r.amount for r in recurrences]
+    for index, recurrence in enumerate(recurrences):
+        try:
+            frequency = normalize_frequency(recurrence.frequency)
+        except ValueError:
+            continue
+        streams.append(_expand(index, recurrence.anchor_date, recurrence.next_date, frequency, start, until))
+
+    days, total = [], 0.0
+    for day, occurrences in groupby(heapq.merge(*streams), key=lambda item: item[0].date()):
+        entry = {"date": day.isoformat(), "total": 0.0, "count": 0}
+        if detail:
+            entry["items"] = []
+        for _, index in occurrences:
+            entry["total"] += amounts[index]
+            entry["count"] += 1
+            if detail:
+                recurrence = recurrences[index]
+                entry["items"].append({
+                    "id": recurrence.id,
+                    "category": recurrence.category,
+                    "amount": recurrence.amount
+                })
+        total += entry["total"]
+        days.append(entry)
+
+    return {
+        "from": start.date().isoformat(),
+        "to": until.date().isoformat(),
+        "total": total,
+        "days": days
+    }, 200
+
+def materialize_due_recurrences(now=None, batch_size=1000):
+    """Turn every due recurrence into Expense rows and advance its next_date.
+
+    Due recurrences are read in batches along the next_date index. For each
+    one, every missed occurrence up to ``now`` is counted from its anchor_date
+    and generated (catch-up), the expenses are bulk-inserted and next_date moves
+    to the first future occurrence, all in the batch's transaction. A crash
+    therefore rolls back both halves and a re-run picks up where it left off;
+    running twice never duplicates expenses. On Postgres, rows are locked with
+    SKIP LOCKED so concurrent runners split the work instead of colliding.
+    Returns ``(recurrences_processed, expenses_created)``.
+    """
+    now = now or datetime.utcnow()
+    recurring = RecurringExpense.__table__
+    advance = (
+        update(recurring)
+        .where(recurring.c.id == bindparam('recurrence_id'))
+        .values(next_date=bindparam('new_next_date'))
+    )
+    processed = created = 0
+    skipped = set()
+    while True:
+        # Advanced rows leave the due set, so each batch simply takes the
+        # earliest due rows along the next_date index; only rows with an
+        # unusable frequency have to be excluded explicitly.
+        query = db.session.query(
+            RecurringExpense.id, RecurringExpense.user_id, RecurringExpense.amount,
+            RecurringExpense.category, RecurringExpense.frequency, RecurringExpense.next_date,
+            RecurringExpense.anchor_date
+        ).filter(RecurringExpense.next_date <= now)
+        if skipped:
+            query = query.filter(RecurringExpense.id.notin_(skipped))
+        batch = (
+            query.order_by(RecurringExpense.next_date)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not batch:
+            break
+
+        expenses, advances, users = [], [], set()
+        for recurrence in batch:
+            try:
+                frequency = normalize_frequency(recurrence.frequency)
+            except ValueError:
+                logger.warning("Skipping recurring expense %s with frequency %r", recurrence.id, recurrence.frequency)
+                skipped.add(recurrence.id)
+                continue
+            first = first_index_on_or_after(recurrence.anchor_date, frequency, recurrence.next_date)
+            count = 0
+            for occurrence in iter_occurrences(recurrence.anchor_date, frequency, now, since=recurrence.next_date):
+                expenses.append({
+                    "id": str(uuid.uuid4()),
+                    "user_id": recurrence.user_id,
+                    "amount": recurrence.amount,
+                    "category": recurrence.category,
+                    "date": occurrence
+                })
+                count += 1
+            advances.append({
+                "recurrence_id": recurrence.id,
+                "new_next_date": nth_occurrence(recurrence.anchor_date, frequency, first + count)
+            })
+            users.add(recurrence.user_id)
+
+        # Core statements over plain dicts: executemany without ORM
+        # bookkeeping for rows we never need as objects.
+        for start in range(0, len(expenses), batch_size):
+            db.session.execute(insert(Expense.__table__), expenses[start:start + batch_size])
+        add_to_summary('expense', expenses)
+        record_spend_changes(expenses)
+        if advances:
+            db.session.execute(advance, advances)
+        bump_versions_for_users(users, 'expense', 'recurring_expense')
+        db.session.commit()
+        for user_id in users:
+            model_cache.invalidate(user_id)
+            response_cache.invalidate(user_id)
+
+        processed += len(advances)
+        created += len(expenses)
+    return processed, created
\ No newline at end of file
@@ -0,0 +1,173 @@
+from datetime import datetime
+from sqlalchemy import case, delete, func, select, tuple_, update
+from app.models.expense import Expense
+from app.models.income import Income
+from app.models.monthly_summary import MonthlySummary
+from app.extensions import db, response_cache
+from app.services.version_service import bump_versions_for_users
+from app.utils.recurrence import add_months
+from app.utils.upsert import dialect_insert
+
+# kind -> (model, column stored as the summary category, row key holding it)
+SOURCES = {
+    'expense': (Expense, Expense.category, 'category'),
+    'income': (Income, Income.source, 'source'),
+}
+
+def year_month(date):
+    return f"{date.year:04d}-{date.month:02d}"
+
+def month_bounds(label):
+    start = datetime(int(label[:4]), int(label[5:7]), 1)
+    return start, add_months(start, 1)
+
+def months_between(start, end):
+    """Labels of the whole months covering ``[start, end)``, or None if the
+    window does not start and end on month boundaries."""
+    if start.day != 1 or end.day != 1 or start.time() != end.time() or start.time() != datetime.min.time():
+        return None
+    labels, month = [], start
+    while month < end:
+        labels.append(year_month(month))
+        month = add_months(month, 1)
+    return labels
+
+def _upsert(values):
+    table = MonthlySummary.__table__
+    stmt = dialect_insert(table)
+    new = stmt.excluded
+    changes = {
+        'count': table.c['count'] + new['count'],
+        'total': table.c.total + new.total,
+        'min_amount': case((new.min_amount < table.c.min_amount, new.min_amount), else_=table.c.min_amount),
+        'max_amount': case((new.max_amount > table.c.max_amount, new.max_amount), else_=table.c.max_amount),
+    }
+    stmt = stmt.on_conflict_do_update(index_elements=list(table.primary_key.columns), set_=changes)
+    db.session.execute(stmt, values)
+
+def _cells(kind, rows):
+    key = SOURCES[kind][2]
+    cells = {}
+    for row in rows:
+        amount = float(row['amount'])
+        cell_key = (row['user_id'], year_month(row['date']), row[key])
+        cell = cells.get(cell_key)
+        if cell is None:
+            cells[cell_key] = [1, amount, amount, amount]
+        else:
+            cell[0] += 1
+            cell[1] += amount
+            cell[2] = min(cell[2], amount)
+            cell[3] = max(cell[3], amount)
+    return cells
+
+def add_to_summary(kind, rows):
+    """Fold newly inserted rows into the summary inside the caller's transaction.
+
+    ``rows`` are dicts with ``user_id``, ``amount``, ``date`` and the kind's
+    category key (``category`` for expenses, ``source`` for income). Rows are
+    grouped per summary cell first, so a bulk insert costs one upsert per
+    (user, month, category) rather than one per row.
+    """
+    cells = _cells(kind, rows)
+    if cells:
+        _upsert([{
+            "user_id": user_id, "year_month": label, "kind": kind, "category": category,
+            "count": count, "total": total, "min_amount": low, "max_amount": high
+        } for (user_id, label, category), (count, total, low, high) in cells.items()])
+
+def remove_from_summary(kind, rows):
+    """Take deleted rows, or the old values of updated ones, out of the summary.
+
+    ``rows`` are shaped as for ``add_to_summary``; an update removes the old
+    values and then adds the new ones. Count and total are applied as
+    negative delta upserts, so they compose with concurrent writes to the
+    same cell instead of overwriting them. Min and max cannot be reversed and
+    are re-derived from the raw rows of each touched cell; cells left empty
+    are deleted. Pending ORM changes are flushed first so they are seen.
+    """
+    model, column, _ = SOURCES[kind]
+    cells = _cells(kind, rows)
+    if not cells:
+        return
+    db.session.flush()
+    _upsert([{
+        "user_id": user_id, "year_month": label, "kind": kind, "category": category,
+        "count": -count, "total": -total, "min_amount": None, "max_amount": None
+    } for (user_id, label, category), (count, total, _, _) in cells.items()])
+    table = MonthlySummary.__table__
+    for user_id, label, category in cells:
+        start, end = month_bounds(label)
+        cell = (model.user_id == user_id, column == category, model.date >= start, model.date < end)
+        db.session.execute(
+            update(table)
+            .where(table.c.user_id == user_id, table.c.year_month == label,
+                   table.c.kind == kind, table.c.category == category)
+            .values(min_amount=select(func.min(model.amount)).where(*cell).scalar_subquery(),
+                    max_amount=select(func.max(model.amount)).where(*cell).scalar_subquery())
+        )
+    db.session.execute(delete(MonthlySummary).where(
+        tuple_(MonthlySummary.user_id, MonthlySummary.year_month, MonthlySummary.category).in_(list(cells)),
+        MonthlySummary.kind == kind, MonthlySummary.count <= 0
+    ))
+
+def rebuild_summaries(user_id=None, chunk_size=1000):
+    """Recompute the whole summary table (or one user's part of it) from the
+    raw expense and income rows. Returns the number of summary rows written.
+
+    Every user whose rows were dropped or rewritten gets their expense
+    version bumped and their cached responses invalidated, as after any
+    other write.
+    """
+    stale = delete(MonthlySummary)
+    owners = select(MonthlySummary.user_id).distinct()
+    if user_id:
+        stale = stale.where(MonthlySummary.user_id == user_id)
+        owners = owners.where(MonthlySummary.user_id == user_id)
+    users = set(db.session.execute(owners).scalars())
+    db.session.execute(stale)
+    written = 0
+    for kind, (model, column, _) in SOURCES.items():
+        year = func.extract('year', model.date)
+        month = func.extract('month', model.date)
+        query = (
+            db.session.query(
+                model.user_id, column, year, month,
+                func.count(), func.sum(model.amount), func.min(model.amount), func.max(model.amount)
+            )
+            .filter(model.date.isnot(None))
+            .group_by(model.user_id, column, year, month)
+        )
+        if user_id:
+            query = query.filter(model.user_id == user_id)
+        batch = []
+        for owner, category, y, m, count, total, low, high in query.yield_per(chunk_size):
+            batch.append({
+                "user_id": owner, "year_month": f"{int(y):04d}-{int(m):02d}", "kind": kind,
+                "category": category, "count": count, "total": total,
+                "min_amount": low, "max_amount": high
+            })
+            users.add(owner)
+            if len(batch) >= chunk_size:
+                db.session.execute(MonthlySummary.__table__.insert(), batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            db.session.execute(MonthlySummary.__table__.insert(), batch)
+            written += len(batch)
+    bump_versions_for_users(users, 'expense')
+    db.session.commit()
+    for owner in users:
+        response_cache.invalidate(owner)
+    return written
+
+def get_month_totals(user_id, kind, labels):
+    """``{category: total}`` for a user over the given month labels."""
+    rows = (
+        db.session.query(MonthlySummary.category, func.sum(MonthlySummary.total))
+        .filter(MonthlySummary.user_id == user_id, MonthlySummary.kind == kind,
+                MonthlySummary.year_month.in_(labels))
+        .group_by(MonthlySummary.category)
+        .all()
+    )
+    return dict(rows)
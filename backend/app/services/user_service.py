@@ -1,6 +1,7 @@
 from app.models.user import User
-from app.models.budget import Budget
-from app.extensions import db
+from app.extensions import db, response_cache
+from app.services.budget_service import upsert_budgets
+from app.services.version_service import bump_versions
 from app.utils.helpers import allocate_budgets
 def get_user_profile(user_id):
     user = User.query.get(user_id)
@@ -19,11 +20,12 @@ def update_user_income(user_id, data):
         return {"message": "User not found"}, 404
 
     user.income = data['income']
-    db.session.commit()
 
-    # Reallocate budgets based on new income
-    budgets = allocate_budgets(user_id, user.income)
-    db.session.add_all(budgets)
+    # Reallocate budgets based on new income, overwriting the previous
+    # allocation in place rather than adding another set of rows.
+    upsert_budgets(allocate_budgets(user_id, user.income))
+    bump_versions(user_id, 'budget')
     db.session.commit()
+    response_cache.invalidate(user_id)
 
     return {"message": "Income updated successfully"}, 200
\ No newline at end of file
@@ -0,0 +1,72 @@
+from sqlalchemy import select, update
+from app.models.budget import Budget
+from app.models.expense import Expense
+from app.models.goal import Goal
+from app.models.income import Income
+from app.models.recurring_expense import RecurringExpense
+from app.models.sync_tombstone import SyncTombstone
+from app.models.table_version import TableVersion
+from app.models.user import User
+from app.extensions import db
+from app.utils.upsert import dialect_insert
+
+# Tables whose rows carry a ``change_seq`` for the sync feed.
+SYNCED_TABLES = {model.__tablename__: model.__table__
+                 for model in (Expense, Income, Budget, Goal, RecurringExpense, SyncTombstone)}
+
+def _bump(rows):
+    table = TableVersion.__table__
+    stmt = dialect_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(table.primary_key.columns),
+        set_={"version": table.c.version + 1}
+    )
+    db.session.execute(stmt, rows)
+
+def _stamp(user_ids, tables):
+    """Hand each user their next change sequence and give it to the rows of
+    ``tables`` (and any tombstones) written in this transaction.
+
+    Inserts and updates leave ``change_seq`` NULL, so those rows are found
+    through the (user_id, change_seq) index. Incrementing the user's counter
+    locks their row until commit, so one user's sequences are committed in
+    order and a sync client never skips a change.
+    """
+    db.session.flush()
+    users = User.__table__
+    db.session.execute(update(users).where(users.c.id.in_(user_ids)).values(change_seq=users.c.change_seq + 1))
+    for name in (*tables, SyncTombstone.__tablename__):
+        table = SYNCED_TABLES.get(name)
+        if table is None:
+            continue
+        seq = select(users.c.change_seq).where(users.c.id == table.c.user_id).scalar_subquery()
+        db.session.execute(
+            update(table)
+            .where(table.c.user_id.in_(user_ids), table.c.change_seq.is_(None))
+            .values(change_seq=seq)
+        )
+
+def bump_versions(user_id, *tables):
+    """Advance the user's version of each table inside the caller's
+    transaction, so the new version commits (or rolls back) with the write,
+    and stamp the written rows for the sync feed."""
+    _bump([{"user_id": user_id, "table_name": name, "version": 1} for name in tables])
+    _stamp([user_id], tables)
+
+def bump_versions_for_users(user_ids, *tables):
+    user_ids = list(user_ids)
+    rows = [{"user_id": user_id, "table_name": name, "version": 1} for user_id in user_ids for name in tables]
+    if rows:
+        _bump(rows)
+        _stamp(user_ids, tables)
+
+def get_versions(user_id, tables):
+    """``{table_name: version}`` for the given tables; tables the user never
+    wrote to are reported as version 0."""
+    rows = (
+        db.session.query(TableVersion.table_name, TableVersion.version)
+        .filter(TableVersion.user_id == user_id, TableVersion.table_name.in_(tables))
+        .all()
+    )
+    versions = dict(rows)
+    return {name: versions.get(name, 0) for name in tables}
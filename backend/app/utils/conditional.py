@@ -0,0 +1,48 @@
+import functools
+import hashlib
+import json
+from flask import current_app, make_response, request
+from flask_jwt_extended import get_jwt_identity
+from app.services.version_service import get_versions
+
+CACHE_CONTROL = 'private, no-cache'
+
+def conditional_get(*tables, key=None):
+    """Answer GETs of a per-user list view with a strong ETag.
+
+    The ETag is derived from the user's versions of ``tables`` (one indexed
+    lookup in ``table_version``), the request path and query string, and
+    ``key(request.args)`` for views that also depend on something else, such
+    as the current month. A matching ``If-None-Match`` gets a 304 before the
+    view runs, so no rows are loaded. Responses are marked
+    ``Cache-Control: private, no-cache``: clients may store them but must
+    revalidate. Other methods pass straight through.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            try:
+                extra = key(request.args) if key else None
+            except ValueError:
+                # Invalid parameters; let the view report the error.
+                return view(*args, **kwargs)
+
+            user_id = get_jwt_identity()
+            versions = get_versions(user_id, tables)
+            payload = json.dumps([request.path, user_id, versions,
+                                  sorted(request.args.items(multi=True)), extra], default=str)
+            etag = hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = CACHE_CONTROL
+            return response
+        return wrapper
+    return decorator
@@ -1,16 +1,58 @@
-from app.models.budget import Budget
 import uuid
+from datetime import datetime, timedelta
+from app.utils.constants import CATEGORIES
 
 def allocate_budgets(user_id, income):
+    """Budget rows (as dicts for ``budget_service.upsert_budgets``) splitting
+    ``income`` across the default categories."""
     budgets = []
     for category in CATEGORIES:
         limit = (income * category['percentage']) / 100
-        new_budget = Budget(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            category=category['name'],
-            limit=limit,
-            income_percentage=category['percentage']
-        )
-        budgets.append(new_budget)
-    return budgets
\ No newline at end of file
+        budgets.append({
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "category": category['name'],
+            "limit": limit,
+            "income_percentage": category['percentage'],
+            "period": 'monthly'
+        })
+    return budgets
+
+def get_period_range(params, now=None):
+    """Return the [start, end) datetime window for a ``period`` query parameter.
+
+    ``period`` is ``month`` (default), ``week`` or ``custom``; a custom range
+    takes inclusive ``from``/``to`` dates in ``YYYY-MM-DD`` format.
+    """
+    now = now or datetime.utcnow()
+    period = params.get('period', 'month')
+    if period == 'month':
+        start = datetime(now.year, now.month, 1)
+        if now.month == 12:
+            end = datetime(now.year + 1, 1, 1)
+        else:
+            end = datetime(now.year, now.month + 1, 1)
+    elif period == 'week':
+        start = datetime(now.year, now.month, now.day) - timedelta(days=now.weekday())
+        end = start + timedelta(days=7)
+    elif period == 'custom':
+        if not params.get('from') or not params.get('to'):
+            raise ValueError("Custom period requires 'from' and 'to' dates")
+        start = datetime.strptime(params['from'], '%Y-%m-%d')
+        end = datetime.strptime(params['to'], '%Y-%m-%d') + timedelta(days=1)
+        if end <= start:
+            raise ValueError("'to' must not be before 'from'")
+    else:
+        raise ValueError(f"Unknown period '{period}'")
+    return start, end
+
+
+def get_date_filters(params):
+    """Return optional ``(start, end)`` bounds from ``from``/``to`` query
+    parameters; ``to`` is inclusive, so ``end`` is the following midnight."""
+    start = end = None
+    if params.get('from'):
+        start = datetime.strptime(params['from'], '%Y-%m-%d')
+    if params.get('to'):
+        end = datetime.strptime(params['to'], '%Y-%m-%d') + timedelta(days=1)
+    return start, end
@@ -0,0 +1,78 @@
+import base64
+import json
+from datetime import datetime
+from flask import jsonify
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+def parse_limit(params):
+    limit = params.get('limit', DEFAULT_LIMIT)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("'limit' must be an integer")
+    if limit < 1:
+        raise ValueError("'limit' must be positive")
+    return min(limit, MAX_LIMIT)
+
+def encode_cursor(values):
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError
+        return [
+            datetime.fromisoformat(v) if v is not None and column.type.python_type is datetime else v
+            for v, column in zip(payload, columns)
+        ]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+def _after(columns, values):
+    # (c1, c2, ...) < (v1, v2, ...) spelled out so it works on every backend
+    # and still matches a composite index on the same columns. Pages sort
+    # NULLs last, so NULL follows every value and nothing follows NULL.
+    clauses = []
+    for i, column in enumerate(columns):
+        if values[i] is None:
+            continue
+        equal = [_equal(columns[j], values[j]) for j in range(i)]
+        clauses.append(and_(*equal, or_(column < values[i], column.is_(None))))
+    return or_(*clauses)
+
+def keyset_paginate(query, columns, params):
+    """Return one page of ``query`` ordered by ``columns`` descending, NULLs last.
+
+    ``columns`` must end with a unique column (the primary key) so the order is
+    total. The cursor encodes the sort key of the last row returned; the next
+    page seeks past it instead of using OFFSET, so every page costs the same.
+    Returns ``(rows, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    limit = parse_limit(params)
+    if params.get('cursor'):
+        query = query.filter(_after(columns, decode_cursor(params['cursor'], columns)))
+    rows = query.order_by(*[c.desc().nulls_last() for c in columns]).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, c.key) for c in columns])
+
+def paged_response(response, status_code):
+    """Turn a service's ``{"items", "next_cursor"}`` page into a JSON list
+    response, carrying the cursor in the ``X-Next-Cursor`` header (exposed to
+    cross-origin callers in ``create_app``)."""
+    if status_code != 200:
+        return jsonify(response), status_code
+    headers = {}
+    if response['next_cursor']:
+        headers['X-Next-Cursor'] = response['next_cursor']
+    return jsonify(response['items']), status_code, headers
@@ -0,0 +1,59 @@
+import calendar
+from datetime import timedelta
+
+FREQUENCIES = ('daily', 'weekly', 'monthly', 'yearly')
+OCCURRENCES_PER_YEAR = {'daily': 365, 'weekly': 52, 'monthly': 12, 'yearly': 1}
+
+def normalize_frequency(frequency):
+    frequency = (frequency or '').strip().lower()
+    if frequency not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{frequency}'; expected one of {', '.join(FREQUENCIES)}")
+    return frequency
+
+def add_months(date, months):
+    """Shift ``date`` by ``months``, clamping to the last day of the target
+    month (Jan 31 + 1 month -> Feb 28/29)."""
+    month = date.month - 1 + months
+    year = date.year + month // 12
+    month = month % 12 + 1
+    day = min(date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+def nth_occurrence(start, frequency, n):
+    """The ``n``-th occurrence after ``start`` (``n == 0`` is ``start``).
+
+    Computed from ``start`` rather than by repeated stepping, so month-end
+    clamping never drifts (Jan 31 -> Feb 29 -> Mar 31).
+    """
+    if frequency == 'daily':
+        return start + timedelta(days=n)
+    if frequency == 'weekly':
+        return start + timedelta(weeks=n)
+    if frequency == 'monthly':
+        return add_months(start, n)
+    return add_months(start, 12 * n)
+
+def first_index_on_or_after(start, frequency, since):
+    """Smallest ``n`` with ``nth_occurrence(start, frequency, n) >= since``,
+    computed arithmetically instead of by stepping through the gap."""
+    if since <= start:
+        return 0
+    if frequency in ('daily', 'weekly'):
+        step = timedelta(days=1) if frequency == 'daily' else timedelta(weeks=1)
+        return -(-(since - start) // step)
+    months = (since.year - start.year) * 12 + since.month - start.month
+    n = max(months // 12 if frequency == 'yearly' else months, 0)
+    while nth_occurrence(start, frequency, n) < since:
+        n += 1
+    return n
+
+def iter_occurrences(start, frequency, until, since=None):
+    """Lazily yield occurrences from ``start`` up to and including ``until``,
+    skipping straight to the first one on or after ``since`` if given."""
+    n = first_index_on_or_after(start, frequency, since) if since else 0
+    while True:
+        occurrence = nth_occurrence(start, frequency, n)
+        if occurrence > until:
+            return
+        yield occurrence
+        n += 1
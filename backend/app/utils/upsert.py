@@ -0,0 +1,29 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from app.extensions import db
+
+_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+def _unsupported(name):
+    return RuntimeError(
+        f"Unsupported database backend {name!r}: writes use ON CONFLICT upserts, "
+        f"which need one of {', '.join(sorted(_INSERTS))}. Check DATABASE_URL."
+    )
+
+def check_upsert_support(app):
+    """Fail at startup, rather than on the first write, when the configured
+    database cannot run ``dialect_insert`` upserts."""
+    name = make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name()
+    if name not in _INSERTS:
+        raise _unsupported(name)
+
+def dialect_insert(table):
+    """An INSERT for ``table`` that supports ``on_conflict_do_update`` on the
+    bound database (PostgreSQL and SQLite share the same ON CONFLICT syntax)."""
+    name = db.session.get_bind().dialect.name
+    if name not in _INSERTS:
+        raise _unsupported(name)
+    return _INSERTS[name](table)
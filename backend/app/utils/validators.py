@@ -0,0 +1,39 @@
+import math
+from datetime import datetime
+
+def parse_datetime(value):
+    """Accept ``YYYY-MM-DD`` or a full ISO-8601 timestamp."""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).strip())
+
+def validate_expense(row):
+    """Validate one incoming expense row (JSON object or CSV record).
+
+    Returns ``(values, None)`` with the cleaned column values, or
+    ``(None, message)`` describing the first problem found.
+    """
+    if not isinstance(row, dict):
+        return None, "Row must be an object"
+
+    try:
+        amount = float(row.get('amount'))
+    except (TypeError, ValueError):
+        return None, "'amount' must be a number"
+    if not math.isfinite(amount):
+        return None, "'amount' must be a finite number"
+
+    category = row.get('category')
+    if not isinstance(category, str) or not category.strip():
+        return None, "'category' is required"
+    category = category.strip()
+    if len(category) > 50:
+        return None, "'category' must be at most 50 characters"
+
+    values = {"amount": amount, "category": category}
+    if row.get('date'):
+        try:
+            values['date'] = parse_datetime(row['date'])
+        except ValueError:
+            return None, "'date' must be an ISO-8601 date"
+    return values, None
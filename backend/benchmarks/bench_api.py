@@ -0,0 +1,228 @@
+"""Latency percentiles and throughput for every API blueprint.
+
+    python -m benchmarks.bench_api --users 200 --expenses-per-user 500 --requests 200
+    python -m benchmarks.bench_api --only expense,budget --output results/after.json
+
+Seeds the database with ``benchmarks.datagen`` (a throwaway SQLite file
+unless BENCH_DATABASE_URL points at e.g. Postgres and ``--yes-drop`` is
+given; see ``benchmarks.database``), then drives each scenario
+through the Flask test client, spreading requests over the seeded users.
+Results are written as JSON (by default to ``benchmarks/results/<commit>.json``)
+so two runs can be compared with ``python -m benchmarks.compare``.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.database import add_database_arguments, use_bench_database
+from benchmarks.datagen import PASSWORD, add_size_arguments, seed_database, size_kwargs
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+class Scenario:
+    """One timed request shape. ``path`` and ``body`` are called with the
+    per-request context; ``setup`` runs untimed first and its return value is
+    available to them as ``ctx['item']``."""
+
+    def __init__(self, blueprint, name, method, path, body=None, setup=None, auth=True):
+        self.blueprint = blueprint
+        self.name = name
+        self.method = method
+        self.path = path
+        self.body = body
+        self.setup = setup
+        self.auth = auth
+
+
+def _create(client, path, body, key):
+    def setup(ctx):
+        return client.post(path, json=body(ctx), headers=ctx['headers']).json[key]
+    return setup
+
+
+def scenarios(client):
+    today = datetime.utcnow().date()
+    expense = lambda ctx: {"amount": round(5 + ctx['n'] % 200, 2), "category": "Food"}
+    return [
+        Scenario('auth', 'register', 'POST', lambda ctx: '/api/auth/register',
+                 lambda ctx: {"name": "New", "email": f"new{ctx['n']}-{time.time_ns()}@bench.local",
+                              "password": PASSWORD}, auth=False),
+        Scenario('auth', 'login', 'POST', lambda ctx: '/api/auth/login',
+                 lambda ctx: {"email": ctx['email'], "password": PASSWORD}, auth=False),
+        Scenario('user', 'profile', 'GET', lambda ctx: '/api/user/'),
+        Scenario('user', 'update_income', 'PUT', lambda ctx: '/api/user/income',
+                 lambda ctx: {"income": 5000.0 + ctx['n']}),
+        Scenario('expense', 'list', 'GET', lambda ctx: '/api/expenses/'),
+        Scenario('expense', 'list_filtered', 'GET',
+                 lambda ctx: f"/api/expenses/?category=Food&from={today - timedelta(days=90)}&limit=50"),
+        Scenario('expense', 'create', 'POST', lambda ctx: '/api/expenses/', expense),
+        Scenario('expense', 'bulk_50', 'POST', lambda ctx: '/api/expenses/bulk',
+                 lambda ctx: [{"amount": 1.0 + i, "category": "Other", "date": str(today)} for i in range(50)]),
+        Scenario('expense', 'update', 'PUT', lambda ctx: f"/api/expenses/{ctx['item']}",
+                 lambda ctx: {"amount": 42.0}, setup=_create(client, '/api/expenses/', expense, 'expense_id')),
+        Scenario('expense', 'delete', 'DELETE', lambda ctx: f"/api/expenses/{ctx['item']}",
+                 setup=_create(client, '/api/expenses/', expense, 'expense_id')),
+        Scenario('budget', 'list', 'GET', lambda ctx: '/api/budgets/'),
+        Scenario('budget', 'categories', 'GET', lambda ctx: '/api/budgets/categories'),
+        Scenario('budget', 'create', 'POST', lambda ctx: '/api/budgets/',
+                 lambda ctx: {"category": "Shopping", "limit": 300.0, "income_percentage": 10}),
+        Scenario('budget', 'optimize', 'POST', lambda ctx: '/api/budgets/optimize',
+                 lambda ctx: {"months": 24}),
+        Scenario('goal', 'list', 'GET', lambda ctx: '/api/goals/'),
+        Scenario('goal', 'create', 'POST', lambda ctx: '/api/goals/',
+                 lambda ctx: {"goal_name": "Trip", "target_amount": 2000.0, "target_date": "2030-01-01"}),
+        Scenario('income', 'list', 'GET', lambda ctx: '/api/income/'),
+        Scenario('income', 'create', 'POST', lambda ctx: '/api/income/',
+                 lambda ctx: {"source": "Salary", "amount": 3000.0}),
+        Scenario('recurring_expense', 'list', 'GET', lambda ctx: '/api/recurring-expenses/'),
+        Scenario('recurring_expense', 'calendar', 'GET', lambda ctx: '/api/recurring-expenses/calendar'),
+        Scenario('recurring_expense', 'create', 'POST', lambda ctx: '/api/recurring-expenses/',
+                 lambda ctx: {"amount": 15.0, "category": "Utilities", "frequency": "monthly",
+                              "next_date": str(today + timedelta(days=3))}),
+        Scenario('insights', 'predictions', 'GET', lambda ctx: '/api/insights/predictions'),
+        Scenario('dashboard', 'overview', 'GET', lambda ctx: '/api/dashboard'),
+        Scenario('export', 'expenses_csv', 'GET', lambda ctx: '/api/export/expenses?format=csv'),
+        Scenario('mock_bank', 'accounts', 'GET', lambda ctx: '/api/mock/bank/accounts'),
+        Scenario('mock_bank', 'transactions', 'GET', lambda ctx: '/api/mock/bank/transactions'),
+        Scenario('notifications', 'send', 'POST', lambda ctx: '/api/notifications/send',
+                 lambda ctx: {"category": "Food"}),
+        Scenario('voice', 'command', 'POST', lambda ctx: '/api/voice/command',
+                 lambda ctx: {"command": "how much have I spent on groceries"}),
+        Scenario('metrics', 'prometheus', 'GET', lambda ctx: '/metrics', auth=False),
+    ]
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def run_scenario(client, scenario, users, requests, warmup):
+    latencies, statuses = [], {}
+    for n in range(warmup + requests):
+        user = users[n % len(users)]
+        ctx = {"n": n, "user_id": user['id'], "email": user['email'], "headers": user['headers']}
+        if scenario.setup:
+            ctx['item'] = scenario.setup(ctx)
+        kwargs = {"headers": user['headers'] if scenario.auth else {}}
+        if scenario.body:
+            kwargs['json'] = scenario.body(ctx)
+        start = time.perf_counter()
+        response = client.open(scenario.path(ctx), method=scenario.method, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        if n < warmup:
+            continue
+        latencies.append(elapsed)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    total = sum(latencies)
+    latencies.sort()
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        "blueprint": scenario.blueprint,
+        "method": scenario.method,
+        "requests": requests,
+        "errors": sum(count for status, count in statuses.items() if int(status) >= 400),
+        "statuses": statuses,
+        "mean_ms": ms(total / requests),
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1]),
+        "throughput_rps": round(requests / total, 1)
+    }
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_size_arguments(parser)
+    parser.add_argument('--requests', type=int, default=200, help='timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=5, help='untimed requests per scenario')
+    parser.add_argument('--sample-users', type=int, default=50, help='users the requests rotate over')
+    parser.add_argument('--only', default=None, help='comma-separated blueprints to run')
+    parser.add_argument('--output', default=None, help='JSON results path')
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    use_bench_database(args, JOB_EXECUTOR='thread', SLOW_QUERY_MS='0')
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    commit = git_commit()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        start = time.perf_counter()
+        user_ids, counts = seed_database(**size_kwargs(args))
+        seed_seconds = time.perf_counter() - start
+        print(f"seeded {sum(counts.values())} rows in {seed_seconds:.1f}s", file=sys.stderr)
+
+        users = [{
+            "id": user_id,
+            "email": f"user{i}@bench.local",
+            "headers": {"Authorization": f"Bearer {create_access_token(identity=user_id)}"}
+        } for i, user_id in enumerate(user_ids[:args.sample_users])]
+        client = app.test_client()
+        only = set(args.only.split(',')) if args.only else None
+
+        results = {}
+        for scenario in scenarios(client):
+            if only and scenario.blueprint not in only:
+                continue
+            name = f"{scenario.blueprint}.{scenario.name}"
+            results[name] = run_scenario(client, scenario, users, args.requests, args.warmup)
+            r = results[name]
+            print(f"{name:34s} p50 {r['p50_ms']:8.2f} ms  p95 {r['p95_ms']:8.2f} ms  "
+                  f"p99 {r['p99_ms']:8.2f} ms  {r['throughput_rps']:8.1f} req/s"
+                  + (f"  ({r['errors']} errors)" if r['errors'] else ''), file=sys.stderr)
+        dialect = db.engine.dialect.name
+        db.drop_all()
+
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.utcnow().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": dialect,
+            "sizes": size_kwargs(args),
+            "rows": counts,
+            "seed_seconds": round(seed_seconds, 2),
+            "requests": args.requests,
+            "warmup": args.warmup
+        },
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Check that ``GET /api/budgets`` stays flat as users keep changing income.
+
+    python -m benchmarks.bench_budgets --users 50 --rounds 10 --updates-per-round 5
+
+Each round every sampled user updates their income ``--updates-per-round``
+times (each update reallocates their budgets), then ``GET /api/budgets`` is
+timed for all of them. Prints the budget row count and latency per round;
+both should stay constant now that reallocation upserts in place. Runs
+against a throwaway SQLite file unless BENCH_DATABASE_URL is set.
+"""
+import argparse
+import time
+
+from benchmarks.bench_api import percentile
+from benchmarks.database import add_database_arguments, use_bench_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--expenses-per-user', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--updates-per-round', type=int, default=5)
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    use_bench_database(args, SLOW_QUERY_MS='0')
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+    from app.extensions import db
+    from app.models.budget import Budget
+    from benchmarks.datagen import seed_database
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_ids, _ = seed_database(users=args.users, expenses_per_user=args.expenses_per_user)
+        headers = [{"Authorization": f"Bearer {create_access_token(identity=user_id)}"} for user_id in user_ids]
+        client = app.test_client()
+
+        print(f"{'round':>5s} {'budget rows':>12s} {'p50 ms':>8s} {'p95 ms':>8s}")
+        for n in range(args.rounds + 1):
+            if n:
+                for i, h in enumerate(headers):
+                    for k in range(args.updates_per_round):
+                        client.put('/api/user/income', json={"income": 3000.0 + 100 * (n + k + i)}, headers=h)
+            latencies = []
+            for h in headers:
+                start = time.perf_counter()
+                response = client.get('/api/budgets/', headers=h)
+                response.get_data()
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            rows = db.session.query(Budget).count()
+            print(f"{n:5d} {rows:12d} {percentile(latencies, 50) * 1000:8.2f} "
+                  f"{percentile(latencies, 95) * 1000:8.2f}")
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Compare rows/sec of POST /api/expenses/bulk against one POST per row.
+
+    python -m benchmarks.bench_bulk_expenses --rows 5000
+
+Runs against a throwaway SQLite file unless BENCH_DATABASE_URL is set.
+"""
+import argparse
+import time
+
+from benchmarks.database import add_database_arguments, use_bench_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--single-rows', type=int, default=500,
+                        help='rows to time through the single-row endpoint')
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    use_bench_database(args)
+
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+        client.post('/api/auth/register', json={
+            "name": "Bench", "email": "bench@example.com", "password": "password"
+        })
+        token = client.post('/api/auth/login', json={
+            "email": "bench@example.com", "password": "password"
+        }).json['access_token']
+        headers = {"Authorization": f"Bearer {token}"}
+        rows = [{"amount": float(i % 500), "category": "Food", "date": "2024-01-01"}
+                for i in range(args.rows)]
+
+        start = time.perf_counter()
+        for row in rows[:args.single_rows]:
+            client.post('/api/expenses/', json=row, headers=headers)
+        single = args.single_rows / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        response = client.post('/api/expenses/bulk', json=rows, headers=headers)
+        bulk = response.json['inserted'] / (time.perf_counter() - start)
+        db.drop_all()
+
+    print(f"single-row: {single:10.0f} rows/sec ({args.single_rows} rows)")
+    print(f"bulk:       {bulk:10.0f} rows/sec ({args.rows} rows)")
+    print(f"speedup:    {bulk / single:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Measure expense-write latency with alerts queued, and outbox throughput.
+
+    python -m benchmarks.bench_notifications --users 200 --send-ms 2
+
+Each user gets a Food budget and three expenses that cross the 50/80/100%
+thresholds, so every write queues an alert. Request latency is reported for
+those writes, then the outbox is drained through a stand-in sender that
+sleeps ``--send-ms`` per message to mimic an SMS/email gateway. Runs against
+a throwaway SQLite file unless BENCH_DATABASE_URL is set.
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.database import add_database_arguments, use_bench_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--send-ms', type=float, default=2.0,
+                        help='simulated delivery time per message')
+    parser.add_argument('--batch-size', type=int, default=100)
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    use_bench_database(args, NOTIFICATION_RATE_LIMIT='100')
+
+    from app import create_app
+    from app.extensions import db
+    from app.notifications import SENDERS
+    from app.services.notification_service import flush_outbox
+
+    class GatewaySender:
+        def __init__(self, app):
+            self.delay = args.send_ms / 1000
+
+        def send(self, notification):
+            time.sleep(self.delay)
+
+    SENDERS['bench'] = GatewaySender
+    app = create_app()
+    app.config['NOTIFICATION_SENDER'] = 'bench'
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+        latencies = []
+        for i in range(args.users):
+            email = f"bench{i}@example.com"
+            client.post('/api/auth/register', json={"name": "Bench", "email": email, "password": "password"})
+            token = client.post('/api/auth/login', json={"email": email, "password": "password"}).json['access_token']
+            headers = {"Authorization": f"Bearer {token}"}
+            client.post('/api/budgets/', json={"category": "Food", "limit": 100.0, "income_percentage": 10},
+                        headers=headers)
+            for amount in (50.0, 30.0, 20.0):
+                start = time.perf_counter()
+                client.post('/api/expenses/', json={"amount": amount, "category": "Food"}, headers=headers)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        stats = flush_outbox(batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        db.drop_all()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"expense writes: {len(latencies)} requests, median {statistics.median(latencies) * 1000:.2f} ms, "
+          f"p95 {p95 * 1000:.2f} ms")
+    print(f"outbox drain:   {stats['sent']} messages in {elapsed:.2f}s "
+          f"({stats['sent'] / elapsed:,.0f} messages/sec, {args.send_ms} ms per send)")
+
+
+if __name__ == '__main__':
+    main()
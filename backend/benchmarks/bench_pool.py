@@ -0,0 +1,98 @@
+"""Load test for connection pool saturation.
+
+    python -m benchmarks.bench_pool --threads 16 --pool-size 2 --max-overflow 0 --pool-timeout 1
+
+Runs ``--threads`` concurrent clients against ``GET /api/dashboard`` with a
+deliberately small pool and an artificial per-statement delay
+(``--query-delay-ms``) standing in for a slow database. Reports throughput,
+latency percentiles, how many requests were shed with 503 once the pool was
+exhausted, and the pool gauges from the metrics surface. Uses a throwaway
+SQLite file unless BENCH_DATABASE_URL is set.
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_api import percentile
+from benchmarks.database import add_database_arguments, use_bench_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400, help='total requests across all threads')
+    parser.add_argument('--pool-size', type=int, default=2)
+    parser.add_argument('--max-overflow', type=int, default=0)
+    parser.add_argument('--pool-timeout', type=int, default=1)
+    parser.add_argument('--query-delay-ms', type=float, default=20.0)
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    use_bench_database(args, SLOW_QUERY_MS='0')
+    os.environ['DB_POOL_SIZE'] = str(args.pool_size)
+    os.environ['DB_MAX_OVERFLOW'] = str(args.max_overflow)
+    os.environ['DB_POOL_TIMEOUT'] = str(args.pool_timeout)
+
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import event
+    from app import create_app
+    from app.extensions import db, metrics
+    from benchmarks.datagen import seed_database
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        user_ids, _ = seed_database(users=50, expenses_per_user=200)
+        tokens = [create_access_token(identity=user_id) for user_id in user_ids]
+
+        delay = args.query_delay_ms / 1000
+
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def slow_database(*_):
+            time.sleep(delay)
+
+    peak = {"checked_out": 0}
+    stop = threading.Event()
+
+    def sample_pool():
+        while not stop.wait(0.005):
+            stats = metrics.pool_stats().get('default', {})
+            peak["checked_out"] = max(peak["checked_out"], stats.get('checked_out', 0))
+
+    def request(n):
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.get('/api/dashboard', headers={"Authorization": f"Bearer {tokens[n % len(tokens)]}"})
+        return response.status_code, time.perf_counter() - start
+
+    sampler = threading.Thread(target=sample_pool, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(request, range(args.requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+
+    ok = sorted(latency for status, latency in results if status == 200)
+    shed = [latency for status, latency in results if status == 503]
+    other = len(results) - len(ok) - len(shed)
+    pool = metrics.pool_stats()['default']
+    print(f"pool_size={args.pool_size} max_overflow={args.max_overflow} pool_timeout={args.pool_timeout}s "
+          f"threads={args.threads} query_delay={args.query_delay_ms}ms")
+    print(f"{len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:,.1f} req/s); "
+          f"{len(ok)} ok, {len(shed)} shed with 503, {other} other")
+    if ok:
+        print(f"ok latency: p50 {percentile(ok, 50) * 1000:.1f} ms, p95 {percentile(ok, 95) * 1000:.1f} ms, "
+              f"p99 {percentile(ok, 99) * 1000:.1f} ms")
+    if shed:
+        print(f"503 latency: mean {sum(shed) / len(shed) * 1000:.1f} ms (bounded by pool_timeout)")
+    print(f"pool: peak checked out {peak['checked_out']}, connects {pool['connects']}, "
+          f"checkouts {pool['checkouts']}, invalidations {pool['invalidations']}")
+    with app.app_context():
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
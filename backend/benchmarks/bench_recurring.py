@@ -0,0 +1,69 @@
+"""Time the recurring-expense materializer over many due recurrences.
+
+    python -m benchmarks.bench_recurring --recurrences 1000000
+
+Seeds a throwaway SQLite file (or BENCH_DATABASE_URL) with due monthly/weekly
+recurrences spread over the last 30 days, runs one materialization pass and
+checks that a second pass is a no-op.
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.database import add_database_arguments, use_bench_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recurrences', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    add_database_arguments(parser)
+    args = parser.parse_args()
+
+    use_bench_database(args)
+
+    from sqlalchemy import insert
+    from app import create_app
+    from app.extensions import db
+    from app.models.user import User
+    from app.models.recurring_expense import RecurringExpense
+    from app.services.recurring_expense_service import materialize_due_recurrences
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        now = datetime.utcnow()
+        user_ids = [str(uuid.uuid4()) for _ in range(args.users)]
+        db.session.execute(insert(User), [
+            {"id": u, "name": "Bench", "email": f"{u}@example.com", "password": "x"} for u in user_ids
+        ])
+        start = time.perf_counter()
+        chunk = 50_000
+        for offset in range(0, args.recurrences, chunk):
+            db.session.execute(insert(RecurringExpense), [{
+                "id": str(uuid.uuid4()),
+                "user_id": user_ids[i % args.users],
+                "amount": float(i % 200),
+                "category": "Utilities",
+                "frequency": "weekly" if i % 4 == 0 else "monthly",
+                "next_date": now - timedelta(days=i % 30, minutes=i % 1440)
+            } for i in range(offset, min(offset + chunk, args.recurrences))])
+        db.session.commit()
+        print(f"seeded {args.recurrences} recurrences in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        processed, created = materialize_due_recurrences(now=now, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"materialized {processed} recurrences -> {created} expenses in {elapsed:.1f}s "
+              f"({processed / elapsed:,.0f} recurrences/sec)")
+
+        start = time.perf_counter()
+        again = materialize_due_recurrences(now=now, batch_size=args.batch_size)
+        print(f"second pass: {again} in {time.perf_counter() - start:.2f}s")
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compare two ``bench_api`` result files and flag latency regressions.
+
+    python -m benchmarks.compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+
+Prints p50/p95 and throughput for every scenario present in both runs.
+A scenario regresses when its p50 or p95 grows by more than ``--threshold``
+(relative) and ``--min-ms`` (absolute, to ignore noise on sub-millisecond
+endpoints). Exits with status 1 if anything regressed.
+"""
+import argparse
+import json
+import sys
+
+
+def compare(old, new, threshold=0.10, min_ms=0.5):
+    """Return ``(rows, regressions)`` for scenarios present in both reports."""
+    rows, regressions = [], []
+    for name in sorted(set(old['results']) & set(new['results'])):
+        before, after = old['results'][name], new['results'][name]
+        row = {"scenario": name}
+        for key in ('p50_ms', 'p95_ms'):
+            change = (after[key] - before[key]) / before[key] if before[key] else 0.0
+            row[key] = (before[key], after[key], change)
+            if change > threshold and after[key] - before[key] > min_ms:
+                regressions.append((name, key, before[key], after[key]))
+        row['throughput_rps'] = (before['throughput_rps'], after['throughput_rps'])
+        rows.append(row)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    parser.add_argument('--min-ms', type=float, default=0.5)
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    rows, regressions = compare(old, new, args.threshold, args.min_ms)
+
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    for row in rows:
+        p50, p95, rps = row['p50_ms'], row['p95_ms'], row['throughput_rps']
+        print(f"{row['scenario']:34s} p50 {p50[0]:8.2f} -> {p50[1]:8.2f} ({p50[2]:+6.1%})  "
+              f"p95 {p95[0]:8.2f} -> {p95[1]:8.2f} ({p95[2]:+6.1%})  "
+              f"{rps[0]:8.1f} -> {rps[1]:8.1f} req/s")
+    for name, key, before, after in regressions:
+        print(f"REGRESSION {name} {key}: {before:.2f} -> {after:.2f} ms", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
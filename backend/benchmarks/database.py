@@ -0,0 +1,35 @@
+"""Database setup shared by the benchmark scripts.
+
+Benchmarks create and drop every table, so they never use DATABASE_URL (or
+REPLICA_DATABASE_URL): they run against a throwaway SQLite file, or against
+BENCH_DATABASE_URL when it is set. A script that drops tables refuses to run
+against BENCH_DATABASE_URL unless ``--yes-drop`` is passed.
+"""
+import os
+import tempfile
+
+
+def add_database_arguments(parser):
+    parser.add_argument('--yes-drop', action='store_true',
+                        help='allow dropping every table in BENCH_DATABASE_URL')
+
+
+def use_bench_database(args=None, drops=True, **defaults):
+    """Point the app at the benchmark database; call before importing ``app``.
+
+    ``defaults`` are further environment variables set unless already
+    present. Returns the database URL.
+    """
+    url = os.environ.get('BENCH_DATABASE_URL')
+    if url and drops and not getattr(args, 'yes_drop', False):
+        raise SystemExit(f"Refusing to drop every table in BENCH_DATABASE_URL ({url}); "
+                         "pass --yes-drop to benchmark against it.")
+    if not url:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    os.environ['DATABASE_URL'] = url
+    # Empty rather than unset so a .env file cannot fill it back in.
+    os.environ['REPLICA_DATABASE_URL'] = ''
+    os.environ.setdefault('JWT_SECRET_KEY', 'benchmark-secret-key-of-sufficient-length')
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+    return url
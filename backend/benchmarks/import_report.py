@@ -0,0 +1,57 @@
+"""Report per-module import cost of booting the app.
+
+    python -m benchmarks.import_report --top 25
+
+Runs ``create_app()`` in a fresh interpreter under ``python -X importtime``
+and prints the most expensive modules by cumulative and self time.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BOOT_SNIPPET = "from app import create_app; create_app()"
+
+
+def measure_imports(snippet=BOOT_SNIPPET):
+    """Return ``{module: (self_us, cumulative_us, depth)}`` for every module
+    imported by ``snippet`` in a fresh interpreter; ``depth`` 0 marks an
+    import that was not nested inside another one."""
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite:///:memory:')
+    env.setdefault('JWT_SECRET_KEY', 'import-report-secret-key-of-sufficient-length')
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', snippet],
+        cwd=backend, env=env, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def total_ms(modules):
+    """Wall time spent importing, in milliseconds (sum of top-level imports)."""
+    return sum(cumulative for _, cumulative, depth in modules.values() if depth == 0) / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=25)
+    args = parser.parse_args()
+
+    modules = measure_imports()
+    print(f"{len(modules)} modules, ~{total_ms(modules):.0f} ms total\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    ranked = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us, _) in ranked[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""Add notification outbox table
+
+Revision ID: 5e2a7c91d4b3
+Revises: bcbc55fb2f19
+Create Date: 2026-10-18 14:02:51.604127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2a7c91d4b3'
+down_revision = 'bcbc55fb2f19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_outbox',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('dedupe_key', sa.String(length=200), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.String(length=500), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('notification_outbox', schema=None) as batch_op:
+        batch_op.create_index('ix_notification_outbox_status_next_attempt_at', ['status', 'next_attempt_at'], unique=False)
+        batch_op.create_index('ix_notification_outbox_user_id_dedupe_key_created_at', ['user_id', 'dedupe_key', 'created_at'], unique=False)
+        batch_op.create_index('ix_notification_outbox_user_id_sent_at', ['user_id', 'sent_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notification_outbox', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_outbox_user_id_sent_at')
+        batch_op.drop_index('ix_notification_outbox_user_id_dedupe_key_created_at')
+        batch_op.drop_index('ix_notification_outbox_status_next_attempt_at')
+
+    op.drop_table('notification_outbox')
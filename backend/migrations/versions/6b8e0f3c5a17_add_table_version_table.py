@@ -0,0 +1,30 @@
+"""Add table version table
+
+Revision ID: 6b8e0f3c5a17
+Revises: d7c4e19a2f60
+Create Date: 2026-10-18 18:42:09.551730
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b8e0f3c5a17'
+down_revision = 'd7c4e19a2f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_version',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'table_name')
+    )
+
+
+def downgrade():
+    op.drop_table('table_version')
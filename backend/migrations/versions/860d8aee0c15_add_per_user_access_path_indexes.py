@@ -0,0 +1,54 @@
+"""Add per-user access path indexes
+
+Revision ID: 860d8aee0c15
+Revises: 4191e0814d8b
+Create Date: 2026-10-18 09:12:41.503217
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '860d8aee0c15'
+down_revision = '4191e0814d8b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.create_index('ix_expense_user_id_date', ['user_id', 'date'], unique=False)
+        batch_op.create_index('ix_expense_user_id_category_date', ['user_id', 'category', 'date'], unique=False)
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.create_index('ix_income_user_id_date', ['user_id', 'date'], unique=False)
+
+    with op.batch_alter_table('budget', schema=None) as batch_op:
+        batch_op.create_index('ix_budget_user_id_category', ['user_id', 'category'], unique=False)
+
+    with op.batch_alter_table('goal', schema=None) as batch_op:
+        batch_op.create_index('ix_goal_user_id_target_date', ['user_id', 'target_date'], unique=False)
+
+    with op.batch_alter_table('recurring_expense', schema=None) as batch_op:
+        batch_op.create_index('ix_recurring_expense_user_id_next_date', ['user_id', 'next_date'], unique=False)
+        batch_op.create_index('ix_recurring_expense_next_date', ['next_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('recurring_expense', schema=None) as batch_op:
+        batch_op.drop_index('ix_recurring_expense_next_date')
+        batch_op.drop_index('ix_recurring_expense_user_id_next_date')
+
+    with op.batch_alter_table('goal', schema=None) as batch_op:
+        batch_op.drop_index('ix_goal_user_id_target_date')
+
+    with op.batch_alter_table('budget', schema=None) as batch_op:
+        batch_op.drop_index('ix_budget_user_id_category')
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.drop_index('ix_income_user_id_date')
+
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.drop_index('ix_expense_user_id_category_date')
+        batch_op.drop_index('ix_expense_user_id_date')
@@ -0,0 +1,63 @@
+"""Add monthly summary table
+
+Revision ID: a3f1d6b8e270
+Revises: 5e2a7c91d4b3
+Create Date: 2026-10-18 15:21:37.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1d6b8e270'
+down_revision = '5e2a7c91d4b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('monthly_summary',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('year_month', sa.String(length=7), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('min_amount', sa.Float(), nullable=True),
+    sa.Column('max_amount', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'year_month', 'kind', 'category')
+    )
+
+    # Readers treat the summary as the source of truth, so it starts out
+    # holding every existing expense and income row.
+    summary = sa.table('monthly_summary', *(sa.column(name) for name in (
+        'user_id', 'year_month', 'kind', 'category', 'count', 'total', 'min_amount', 'max_amount'
+    )))
+    for kind, table_name, category in (('expense', 'expense', 'category'), ('income', 'income', 'source')):
+        source = sa.table(table_name, sa.column('user_id'), sa.column(category), sa.column('amount'),
+                          sa.column('date'))
+        label = _year_month(source.c.date)
+        op.execute(summary.insert().from_select(
+            [c.name for c in summary.columns],
+            sa.select(
+                source.c.user_id, label, sa.literal(kind), source.c[category],
+                sa.func.count(), sa.func.sum(source.c.amount),
+                sa.func.min(source.c.amount), sa.func.max(source.c.amount)
+            )
+            .where(source.c.date.isnot(None))
+            .group_by(source.c.user_id, label, source.c[category])
+        ))
+
+
+def _year_month(column):
+    # Formats are inlined rather than bound, so PostgreSQL sees the same
+    # expression in the SELECT list and the GROUP BY.
+    if op.get_bind().dialect.name == 'sqlite':
+        return sa.func.strftime(sa.literal_column("'%Y-%m'"), column)
+    return sa.func.to_char(column, sa.literal_column("'YYYY-MM'"))
+
+
+def downgrade():
+    op.drop_table('monthly_summary')
@@ -0,0 +1,31 @@
+"""Add forecast table
+
+Revision ID: bcbc55fb2f19
+Revises: 860d8aee0c15
+Create Date: 2026-10-18 11:40:07.218834
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'bcbc55fb2f19'
+down_revision = '860d8aee0c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('forecast',
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('fingerprint', sa.String(length=120), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('forecast')
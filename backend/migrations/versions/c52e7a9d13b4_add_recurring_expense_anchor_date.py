@@ -0,0 +1,33 @@
+"""Add recurring expense anchor date
+
+Revision ID: c52e7a9d13b4
+Revises: f1a9c2d47e85
+Create Date: 2026-10-18 23:02:47.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52e7a9d13b4'
+down_revision = 'f1a9c2d47e85'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('recurring_expense', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('anchor_date', sa.DateTime(), nullable=True))
+
+    # The original start date of existing rows is not known, so their
+    # schedules are anchored on the next pending occurrence.
+    op.execute("UPDATE recurring_expense SET anchor_date = next_date")
+
+    with op.batch_alter_table('recurring_expense', schema=None) as batch_op:
+        batch_op.alter_column('anchor_date', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('recurring_expense', schema=None) as batch_op:
+        batch_op.drop_column('anchor_date')
@@ -0,0 +1,44 @@
+"""Make budgets unique per user, category and period
+
+Revision ID: d7c4e19a2f60
+Revises: a3f1d6b8e270
+Create Date: 2026-10-18 17:04:12.318840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7c4e19a2f60'
+down_revision = 'a3f1d6b8e270'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Every income update used to append a full set of budgets, so keep a
+    # single row per (user_id, category) and delete the rest. Budgets have
+    # no timestamp to tell the latest apart (and ids are random UUIDs), so
+    # the row with the highest limit is kept, ties broken by id; the next
+    # income update rewrites its limit from the current income.
+    budget = sa.table('budget', sa.column('id'), sa.column('user_id'), sa.column('category'),
+                      sa.column('limit'))
+    rank = sa.func.row_number().over(
+        partition_by=[budget.c.user_id, budget.c.category],
+        order_by=[budget.c.limit.desc(), budget.c.id.desc()]
+    ).label('row_rank')
+    ranked = sa.select(budget.c.id, rank).subquery('ranked')
+    op.execute(budget.delete().where(budget.c.id.in_(sa.select(ranked.c.id).where(ranked.c.row_rank > 1))))
+
+    with op.batch_alter_table('budget', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('period', sa.String(length=10), nullable=False, server_default='monthly'))
+        batch_op.drop_index('ix_budget_user_id_category')
+        batch_op.create_index('ix_budget_user_id_category_period', ['user_id', 'category', 'period'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('budget', schema=None) as batch_op:
+        batch_op.drop_index('ix_budget_user_id_category_period')
+        batch_op.create_index('ix_budget_user_id_category', ['user_id', 'category'], unique=False)
+        batch_op.drop_column('period')
@@ -0,0 +1,61 @@
+"""Add sync change tracking
+
+Revision ID: f1a9c2d47e85
+Revises: 6b8e0f3c5a17
+Create Date: 2026-10-18 20:15:33.702614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a9c2d47e85'
+down_revision = '6b8e0f3c5a17'
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ('expense', 'income', 'budget', 'goal', 'recurring_expense')
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=False, server_default='0'))
+
+    for table in SYNCED_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+            batch_op.add_column(sa.Column('change_seq', sa.BigInteger(), nullable=True))
+            batch_op.create_index(f'ix_{table}_user_id_change_seq', ['user_id', 'change_seq'], unique=False)
+        # Existing rows predate every sync token; NULL is reserved for rows
+        # written in a transaction that has not been stamped yet.
+        op.execute(f"UPDATE {table} SET change_seq = 0")
+
+    op.create_table('sync_tombstone',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=False),
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('entity_id', sa.String(length=36), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('sync_tombstone', schema=None) as batch_op:
+        batch_op.create_index('ix_sync_tombstone_user_id_change_seq', ['user_id', 'change_seq'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('sync_tombstone', schema=None) as batch_op:
+        batch_op.drop_index('ix_sync_tombstone_user_id_change_seq')
+
+    op.drop_table('sync_tombstone')
+
+    for table in reversed(SYNCED_TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table}_user_id_change_seq')
+            batch_op.drop_column('change_seq')
+            batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('change_seq')
@@ -0,0 +1,67 @@
+import argparse
+import os
+import pytest
+from app import create_app
+from app.extensions import db
+from app.models.monthly_summary import MonthlySummary
+from benchmarks.compare import compare
+from benchmarks.database import use_bench_database
+from benchmarks.datagen import generate, seed_database
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+def test_generate_sizes_and_keys():
+    data = generate(users=10, expenses_per_user=20, budgets_per_user=3, incomes_per_user=2,
+                    goals_per_user=1, recurring_per_user=2)
+    assert {name: len(rows) for name, rows in data.items()} == {
+        'user': 10, 'expense': 200, 'budget': 30, 'income': 20, 'goal': 10, 'recurring_expense': 20
+    }
+    assert len({e['id'] for e in data['expense']}) == 200
+    # Budget categories are distinct per user.
+    assert len({(b['user_id'], b['category']) for b in data['budget']}) == 30
+    assert generate(users=3, seed=7)['expense'] == generate(users=3, seed=7)['expense']
+
+def test_seed_database_builds_summaries(app):
+    user_ids, counts = seed_database(users=5, expenses_per_user=40)
+    assert len(user_ids) == 5
+    assert counts['expense'] == 200
+    expense_count = sum(s.count for s in MonthlySummary.query.filter_by(kind='expense'))
+    assert expense_count == 200
+
+def _report(commit, p50, p95):
+    return {"meta": {"commit": commit}, "results": {
+        "expense.list": {"p50_ms": p50, "p95_ms": p95, "throughput_rps": 100.0}
+    }}
+
+def test_compare_flags_regressions():
+    rows, regressions = compare(_report('a', 10.0, 20.0), _report('b', 10.5, 30.0))
+    assert [r['scenario'] for r in rows] == ["expense.list"]
+    assert regressions == [("expense.list", "p95_ms", 20.0, 30.0)]
+    # Large relative changes on tiny latencies are treated as noise.
+    assert compare(_report('a', 0.2, 0.3), _report('b', 0.4, 0.6))[1] == []
+
+def test_bench_database_never_uses_database_url(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'postgresql://dev@localhost/finance_db')
+    monkeypatch.setenv('REPLICA_DATABASE_URL', 'postgresql://dev@replica/finance_db')
+    monkeypatch.delenv('BENCH_DATABASE_URL', raising=False)
+    url = use_bench_database()
+    assert url.startswith('sqlite:///') and url.endswith('bench.db')
+    assert os.environ['DATABASE_URL'] == url
+    assert os.environ['REPLICA_DATABASE_URL'] == ''
+
+def test_bench_database_requires_yes_drop(monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'sqlite:///:memory:')
+    monkeypatch.setenv('BENCH_DATABASE_URL', 'postgresql://bench@localhost/bench')
+    with pytest.raises(SystemExit):
+        use_bench_database(argparse.Namespace(yes_drop=False))
+    assert os.environ['DATABASE_URL'] == 'sqlite:///:memory:'
+    assert use_bench_database(argparse.Namespace(yes_drop=True)) == 'postgresql://bench@localhost/bench'
+    assert use_bench_database(drops=False) == 'postgresql://bench@localhost/bench'
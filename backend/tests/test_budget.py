@@ -1,8 +1,14 @@
 import pytest
+from datetime import datetime
 from app import create_app
 from app.extensions import db
 from app.models.user import User
 from app.models.budget import Budget
+from app.models.expense import Expense
+from app.models.recurring_expense import RecurringExpense
+from app.services.budget_service import optimize_budgets
+from app.services.summary_service import rebuild_summaries
+from app.utils.recurrence import add_months
 
 @pytest.fixture
 def app():
@@ -47,4 +53,116 @@ def test_get_budgets(client, auth_token):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = client.get('/api/budgets', headers=headers)
     assert response.status_code == 200
-    assert isinstance(response.json, list)
\ No newline at end of file
+    assert isinstance(response.json, list)
+
+def test_get_budgets_spent_is_bounded_to_period(app, client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/budgets/', json={
+        "category": "Food",
+        "limit": 500.0,
+        "income_percentage": 10.0
+    }, headers=headers)
+    response = client.post('/api/expenses/bulk', json=[
+        {"amount": 100.0, "category": "Food", "date": "2024-03-05"},
+        {"amount": 50.0, "category": "Food", "date": "2024-03-31T23:59:00"},
+        {"amount": 999.0, "category": "Food", "date": "2024-02-28"},
+        {"amount": 999.0, "category": "Transport", "date": "2024-03-10"},
+    ], headers=headers)
+    assert response.status_code == 201
+
+    response = client.get('/api/budgets/?period=custom&from=2024-03-01&to=2024-03-31', headers=headers)
+    assert response.status_code == 200
+    food = next(b for b in response.json if b['category'] == "Food")
+    assert food['spent'] == 150.0
+    assert food['remaining'] == 350.0
+
+def test_get_budgets_rejects_unknown_period(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/budgets/?period=decade', headers=headers)
+    assert response.status_code == 400
+
+def test_income_updates_reallocate_budgets_in_place(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for income in (4000.0, 6000.0, 8000.0):
+        assert client.put('/api/user/income', json={"income": income}, headers=headers).status_code == 200
+    user = User.query.filter_by(email="test@example.com").first()
+    budgets = Budget.query.filter_by(user_id=user.id).all()
+    assert len(budgets) == 8
+    food = next(b for b in budgets if b.category == "Food")
+    assert food.limit == 8000.0 * 15 / 100
+
+def test_adding_existing_category_updates_budget(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    first = client.post('/api/budgets/', json={"category": "Food", "limit": 500.0, "income_percentage": 10.0},
+                        headers=headers)
+    second = client.post('/api/budgets/', json={"category": "Food", "limit": 700.0, "income_percentage": 12.0},
+                         headers=headers)
+    assert first.json['budget_id'] == second.json['budget_id']
+    budgets = Budget.query.filter_by(category="Food").all()
+    assert [(b.limit, b.income_percentage) for b in budgets] == [(700.0, 12.0)]
+
+def test_update_budget_rejects_duplicate_category(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/budgets/', json={"category": "Food", "limit": 500.0, "income_percentage": 10.0},
+                headers=headers)
+    other = client.post('/api/budgets/', json={"category": "Transport", "limit": 200.0, "income_percentage": 5.0},
+                        headers=headers).json['budget_id']
+    response = client.put(f'/api/budgets/{other}', json={"category": "Food"}, headers=headers)
+    assert response.status_code == 409
+
+def _seed_history(user_id, now):
+    this_month = datetime(now.year, now.month, 1)
+    # Food grows 100 -> 600 over six months; Transport is flat at 50.
+    for i, food in enumerate((100.0, 200.0, 300.0, 400.0, 500.0, 600.0)):
+        month = add_months(this_month, i - 6)
+        db.session.add(Expense(user_id=user_id, amount=food, category="Food", date=month.replace(day=10)))
+        db.session.add(Expense(user_id=user_id, amount=50.0, category="Transport", date=month.replace(day=12)))
+    # Spending in the current, incomplete month is not part of the history.
+    db.session.add(Expense(user_id=user_id, amount=5000.0, category="Food", date=this_month))
+    db.session.add(RecurringExpense(user_id=user_id, amount=25.0, category="Utilities", frequency="weekly",
+                                    next_date=this_month))
+    db.session.commit()
+    rebuild_summaries(user_id)
+
+def test_optimize_budgets_uses_history_and_recurring_costs(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user = User.query.filter_by(email="test@example.com").first()
+    _seed_history(user.id, datetime.utcnow())
+
+    response = client.post('/api/budgets/optimize', json={"months": 6}, headers=headers)
+    assert response.status_code == 200
+    allocations = {a['category']: a for a in response.json['allocations']}
+    assert set(allocations) == {"Food", "Transport", "Utilities"}
+    # The rising trend projects 700 for Food, above its 75th percentile.
+    assert allocations["Food"]['trend'] == 700.0
+    assert allocations["Food"]['limit'] == 700.0
+    assert allocations["Transport"]['limit'] == 50.0
+    assert allocations["Utilities"]['fixed'] == round(25.0 * 52 / 12, 2)
+    assert allocations["Utilities"]['limit'] == allocations["Utilities"]['fixed']
+    assert response.json['unallocated'] == round(5000.0 - response.json['total'], 2)
+    assert response.json['applied'] is False
+    assert Budget.query.filter_by(user_id=user.id).count() == 0
+
+def test_optimize_budgets_scales_down_to_income_keeping_fixed_costs(app, auth_token):
+    user = User.query.filter_by(email="test@example.com").first()
+    now = datetime.utcnow()
+    _seed_history(user.id, now)
+    user.income = 400.0
+    db.session.commit()
+
+    response, status = optimize_budgets(user.id, {"months": 6, "apply": True}, now=now)
+    assert status == 200
+    allocations = {a['category']: a for a in response['allocations']}
+    assert response['total'] == pytest.approx(400.0, abs=0.02)
+    assert allocations["Utilities"]['limit'] == round(25.0 * 52 / 12, 2)
+    assert allocations["Food"]['limit'] / allocations["Transport"]['limit'] == pytest.approx(14.0, rel=1e-3)
+    budgets = {b.category: b.limit for b in Budget.query.filter_by(user_id=user.id)}
+    assert budgets == {name: a['limit'] for name, a in allocations.items()}
+
+def test_optimize_budgets_validates_input(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    assert client.post('/api/budgets/optimize', json={"months": 0}, headers=headers).status_code == 400
+    assert client.post('/api/budgets/optimize', json={"percentile": 120}, headers=headers).status_code == 400
+    response = client.post('/api/budgets/optimize', headers=headers)
+    assert response.status_code == 200
+    assert response.json['allocations'] == []
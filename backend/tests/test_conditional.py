@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+
+LIST_ENDPOINTS = ['/api/expenses/', '/api/budgets/', '/api/goals/', '/api/income/', '/api/recurring-expenses/']
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+@pytest.fixture
+def statements(app):
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+@pytest.mark.parametrize("path", LIST_ENDPOINTS)
+def test_matching_etag_returns_304_without_loading_rows(client, auth_token, statements, path):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get(path, headers=headers)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    etag = response.headers['ETag']
+
+    statements.clear()
+    response = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.data == b''
+    # Only the version lookup runs; no data table is queried.
+    assert len(statements) == 1
+    assert 'FROM table_version' in statements[0]
+
+def test_writes_change_the_etag(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    expenses = client.get('/api/expenses/', headers=headers).headers['ETag']
+    budgets = client.get('/api/budgets/', headers=headers).headers['ETag']
+    goals = client.get('/api/goals/', headers=headers).headers['ETag']
+
+    client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"}, headers=headers)
+    response = client.get('/api/expenses/', headers={**headers, "If-None-Match": expenses})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != expenses
+    # Budget spending depends on expenses too.
+    assert client.get('/api/budgets/', headers={**headers, "If-None-Match": budgets}).status_code == 200
+    assert client.get('/api/goals/', headers={**headers, "If-None-Match": goals}).status_code == 304
+
+def test_etag_depends_on_query_parameters(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    etag = client.get('/api/expenses/', headers=headers).headers['ETag']
+    response = client.get('/api/expenses/?category=Food', headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_errors_carry_no_etag(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/budgets/?period=decade', headers=headers)
+    assert response.status_code == 400
+    assert 'ETag' not in response.headers
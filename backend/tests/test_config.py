@@ -0,0 +1,39 @@
+import pytest
+from app import create_app
+from app.config import Config, engine_options
+
+def test_in_memory_sqlite_only_pre_pings(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '20')
+    assert engine_options('sqlite:///:memory:') == {'pool_pre_ping': True}
+    assert engine_options('sqlite://') == {'pool_pre_ping': True}
+
+def test_pool_options_from_env(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '20')
+    monkeypatch.setenv('DB_MAX_OVERFLOW', '5')
+    monkeypatch.setenv('DB_POOL_TIMEOUT', '3')
+    monkeypatch.setenv('DB_POOL_RECYCLE', '600')
+    monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+    assert engine_options('postgresql://u:p@db/finance') == {
+        'pool_pre_ping': False,
+        'pool_size': 20,
+        'max_overflow': 5,
+        'pool_timeout': 3,
+        'pool_recycle': 600,
+        'connect_args': {'options': '-c statement_timeout=5000'},
+    }
+    # The statement timeout is a PostgreSQL session setting only.
+    assert 'connect_args' not in engine_options('sqlite:////tmp/finance.db')
+
+def test_pool_defaults(monkeypatch):
+    for name in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_TIMEOUT', 'DB_POOL_RECYCLE',
+                 'DB_POOL_PRE_PING', 'DB_STATEMENT_TIMEOUT_MS'):
+        monkeypatch.delenv(name, raising=False)
+    assert engine_options('postgresql://u:p@db/finance') == {
+        'pool_pre_ping': True, 'pool_size': 5, 'max_overflow': 10, 'pool_timeout': 30, 'pool_recycle': 1800
+    }
+
+def test_unsupported_database_fails_at_startup(monkeypatch):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', 'mysql://u:p@db/finance')
+    with pytest.raises(RuntimeError, match="Unsupported database backend 'mysql'"):
+        create_app()
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+@pytest.fixture
+def count_queries(app):
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+def _seed(client, headers, n):
+    categories = ["Food", "Transport", "Rent", "Fun"]
+    client.post('/api/expenses/bulk', json=[
+        {"amount": float(1 + i % 50), "category": categories[i % 4]} for i in range(n)
+    ], headers=headers)
+    for category in categories[:1 + n % 4]:
+        client.post('/api/budgets/', json={"category": category, "limit": 100.0 * n,
+                                           "income_percentage": 10}, headers=headers)
+    for i in range(1 + n // 50):
+        client.post('/api/goals/', json={"goal_name": f"Goal {i}", "target_amount": 1000.0,
+                                         "saved_amount": 250.0}, headers=headers)
+        client.post('/api/income/', json={"source": "Salary", "amount": 1000.0}, headers=headers)
+
+def test_dashboard(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/expenses/', json={"amount": 40.0, "category": "Food"}, headers=headers)
+    client.post('/api/income/', json={"source": "Salary", "amount": 1000.0}, headers=headers)
+    client.post('/api/budgets/', json={"category": "Food", "limit": 100.0, "income_percentage": 10},
+                headers=headers)
+    client.post('/api/goals/', json={"goal_name": "Car", "target_amount": 1000.0, "saved_amount": 250.0},
+                headers=headers)
+
+    response = client.get('/api/dashboard', headers=headers)
+    assert response.status_code == 200
+    data = response.json
+    assert data['profile']['email'] == "test@example.com"
+    assert data['totals']['expenses'] == 40.0
+    assert data['totals']['income'] == 1000.0
+    assert data['totals']['net'] == 960.0
+    assert data['totals']['by_category'] == {"Food": 40.0}
+    assert data['budgets'][0]['spent'] == 40.0
+    assert data['budgets'][0]['remaining'] == 60.0
+    assert data['goals']['items'][0]['progress'] == 25.0
+    assert data['forecast']['predictions']
+
+def test_dashboard_query_count_is_constant(client, auth_token, count_queries):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    counts = []
+    for n in (4, 500):
+        _seed(client, headers, n)
+        count_queries.clear()
+        assert client.get('/api/dashboard/', headers=headers).status_code == 200
+        counts.append(len(count_queries))
+    assert counts[0] == counts[1]
+    assert counts[0] <= 8
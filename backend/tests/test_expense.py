@@ -1,4 +1,6 @@
+import io
 import pytest
+from datetime import datetime
 from app import create_app
 from app.extensions import db
 from app.models.user import User
@@ -46,4 +48,99 @@ def test_get_expenses(client, auth_token):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = client.get('/api/expenses', headers=headers)
     assert response.status_code == 200
-    assert isinstance(response.json, list)
\ No newline at end of file
+    assert isinstance(response.json, list)
+
+def _seed_expenses(user_id):
+    db.session.add_all([
+        Expense(user_id=user_id, amount=10.0 * day, category="Food" if day % 2 else "Transport",
+                date=datetime(2024, 1, day))
+        for day in range(1, 11)
+    ])
+    db.session.commit()
+
+def test_get_expenses_keyset_pagination(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _seed_expenses(User.query.filter_by(email="test@example.com").first().id)
+
+    seen = []
+    url = '/api/expenses/?limit=4'
+    while True:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        seen.extend(response.json)
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        url = f'/api/expenses/?limit=4&cursor={cursor}'
+
+    assert len(seen) == 10
+    assert len({e['id'] for e in seen}) == 10
+    assert [e['amount'] for e in seen] == [100.0, 90.0, 80.0, 70.0, 60.0, 50.0, 40.0, 30.0, 20.0, 10.0]
+
+def test_get_expenses_pages_include_undated_rows(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}", "Origin": "http://localhost:3000"}
+    user_id = User.query.filter_by(email="test@example.com").first().id
+    _seed_expenses(user_id)
+    db.session.add_all([Expense(user_id=user_id, amount=1.0, category="Food") for _ in range(3)])
+    db.session.commit()
+    Expense.query.filter_by(amount=1.0).update({"date": None})
+    db.session.commit()
+
+    seen = []
+    url = '/api/expenses/?limit=3'
+    while True:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert 'X-Next-Cursor' in response.headers['Access-Control-Expose-Headers']
+        seen.extend(response.json)
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        url = f'/api/expenses/?limit=3&cursor={cursor}'
+
+    assert len({e['id'] for e in seen}) == 13
+    assert [e['date'] for e in seen[-3:]] == [None, None, None]
+
+def test_get_expenses_filters(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _seed_expenses(User.query.filter_by(email="test@example.com").first().id)
+
+    response = client.get('/api/expenses/?from=2024-01-03&to=2024-01-08&category=Food&min_amount=40',
+                          headers=headers)
+    assert response.status_code == 200
+    assert [e['amount'] for e in response.json] == [70.0, 50.0]
+    assert 'X-Next-Cursor' not in response.headers
+
+def test_get_expenses_rejects_bad_cursor(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/expenses/?cursor=not-a-cursor', headers=headers)
+    assert response.status_code == 400
+
+def test_bulk_add_expenses_json(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.post('/api/expenses/bulk', json=[
+        {"amount": 10.0, "category": "Food", "date": "2024-01-01"},
+        {"amount": "oops", "category": "Food"},
+        {"amount": 25.5, "category": "Transport"},
+        {"amount": 5.0},
+    ], headers=headers)
+    assert response.status_code == 201
+    assert response.json['inserted'] == 2
+    assert [e['row'] for e in response.json['errors']] == [1, 3]
+    assert Expense.query.count() == 2
+
+def test_bulk_add_expenses_csv(app, client, auth_token):
+    app.config['BULK_INSERT_CHUNK_SIZE'] = 2
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    data = "amount,category,date\n" + "".join(f"{i},Food,2024-01-{i:02d}\n" for i in range(1, 6))
+    response = client.post('/api/expenses/bulk', data={
+        "file": (io.BytesIO(data.encode()), "statement.csv")
+    }, headers=headers, content_type='multipart/form-data')
+    assert response.status_code == 201
+    assert response.json['inserted'] == 5
+    assert sorted(e.amount for e in Expense.query.all()) == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+def test_bulk_add_expenses_rejects_non_list(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.post('/api/expenses/bulk', json={"amount": 10.0}, headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.expense import Expense
+from app.models.income import Income
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+@pytest.fixture
+def user_id(auth_token):
+    user = User.query.filter_by(email="test@example.com").first()
+    db.session.add_all([
+        Expense(user_id=user.id, amount=12.5, category="Food", date=datetime(2024, 1, 5)),
+        Expense(user_id=user.id, amount=40.0, category="Transport", date=datetime(2024, 2, 5)),
+        Income(user_id=user.id, source="Salary", amount=5000.0, date=datetime(2024, 1, 1)),
+    ])
+    db.session.commit()
+    return user.id
+
+def test_export_expenses_csv(client, auth_token, user_id):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/export/expenses', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert response.is_streamed
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [r['category'] for r in rows] == ["Food", "Transport"]
+    assert rows[0]['date'] == "2024-01-05T00:00:00"
+
+def test_export_expenses_ndjson_with_filters(client, auth_token, user_id):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/export/expenses?format=ndjson&from=2024-02-01&category=Transport',
+                          headers=headers)
+    assert response.status_code == 200
+    lines = [json.loads(l) for l in response.get_data(as_text=True).splitlines()]
+    assert lines == [{"id": lines[0]['id'], "amount": 40.0, "category": "Transport",
+                      "date": "2024-02-05T00:00:00"}]
+
+def test_export_income_csv(client, auth_token, user_id):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/export/income', headers=headers)
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0]['source'] == "Salary"
+
+def test_export_rejects_unknown_format(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/export/expenses?format=xlsx', headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,39 @@
+import numpy as np
+from datetime import datetime
+from app.services.forecast_service import (
+    aggregate_monthly, forecast_matrix, month_index, month_label
+)
+
+def test_month_index_round_trips_to_label():
+    months = month_index([datetime(2024, 1, 31), datetime(2024, 12, 1)])
+    assert [month_label(m) for m in months] == ["2024-01", "2024-12"]
+
+def test_aggregate_monthly_sums_per_group_and_month():
+    months = np.array([0, 0, 1, 2, 5])
+    amounts = np.array([1.0, 2.0, 3.0, 4.0, 100.0])
+    groups = np.array([0, 1, 1, 0, 0])
+    totals = aggregate_monthly(months, amounts, groups, n_groups=2, start=0, n_months=3)
+    assert totals.tolist() == [[1.0, 0.0, 4.0], [2.0, 3.0, 0.0]]
+
+def test_forecast_matrix_extrapolates_linear_trend():
+    series = np.array([[10.0, 20.0, 30.0, 40.0]])
+    assert np.allclose(forecast_matrix(series, horizon=2), [[50.0, 60.0]])
+
+def test_forecast_matrix_ignores_months_before_series_starts():
+    series = np.array([[0.0, 0.0, 0.0, 100.0, 100.0, 100.0]])
+    assert np.allclose(forecast_matrix(series, horizon=1), [[100.0]])
+
+def test_forecast_matrix_short_and_empty_series():
+    series = np.array([[0.0, 0.0, 30.0], [0.0, 0.0, 0.0]])
+    assert np.allclose(forecast_matrix(series, horizon=2), [[30.0, 30.0], [0.0, 0.0]])
+
+def test_forecast_matrix_applies_seasonality():
+    season = np.array([100.0] * 11 + [300.0])
+    series = np.tile(season, 3)[None, :]
+    forecast = forecast_matrix(series, horizon=12)[0]
+    assert forecast[11] > 2 * forecast[0]
+    assert np.allclose(forecast[:11], forecast[0], rtol=0.05)
+
+def test_forecast_matrix_is_non_negative():
+    series = np.array([[40.0, 30.0, 20.0, 10.0]])
+    assert (forecast_matrix(series, horizon=3) >= 0).all()
@@ -48,4 +48,23 @@ def test_get_goals(client, auth_token):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = client.get('/api/goals', headers=headers)
     assert response.status_code == 200
-    assert isinstance(response.json, list)
\ No newline at end of file
+    assert isinstance(response.json, list)
+def test_get_goals_pages_by_target_date(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for name, target_date in (("Car", "2026-01-31"), ("Trip", None), ("House", "2030-06-30"),
+                              ("Phone", "2025-03-01"), ("Bike", "2027-09-15")):
+        client.post('/api/goals/', json={"goal_name": name, "target_amount": 1000.0,
+                                         "target_date": target_date}, headers=headers)
+
+    seen = []
+    url = '/api/goals/?limit=2'
+    while True:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        seen.extend(response.json)
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+        url = f'/api/goals/?limit=2&cursor={cursor}'
+
+    assert [g['goal_name'] for g in seen] == ["House", "Bike", "Car", "Phone", "Trip"]
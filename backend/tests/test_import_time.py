@@ -0,0 +1,13 @@
+import os
+from benchmarks.import_report import measure_imports, total_ms
+
+# Generous enough to absorb slow CI machines; the forbidden-module check below
+# is what catches a heavy dependency creeping back into the boot path.
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', 3000))
+LAZY_MODULES = ('numpy', 'sklearn', 'faker')
+
+def test_create_app_import_budget():
+    modules = measure_imports()
+    eager = sorted(name for name in modules if name.split('.')[0] in LAZY_MODULES)
+    assert eager == [], f"heavy modules imported at boot: {eager[:5]}"
+    assert total_ms(modules) < IMPORT_TIME_BUDGET_MS
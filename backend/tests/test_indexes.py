@@ -0,0 +1,72 @@
+import os
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine, select, text
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.expense import Expense
+from app.models.budget import Budget
+from app.models.goal import Goal
+from app.models.income import Income
+from app.models.recurring_expense import RecurringExpense
+from app.models.sync_tombstone import SyncTombstone
+
+# The real query shapes issued by app/services, paired with the index each
+# one is expected to use.
+ACCESS_PATHS = [
+    (select(Expense).filter_by(user_id='u1'), 'ix_expense_user_id'),
+    (select(Expense).where(Expense.user_id == 'u1', Expense.date >= datetime(2024, 1, 1)),
+     'ix_expense_user_id_date'),
+    (select(Expense).where(Expense.user_id == 'u1', Expense.category == 'Food',
+                           Expense.date >= datetime(2024, 1, 1)),
+     'ix_expense_user_id_category_date'),
+    # Plain per-user scans may use any user_id-leading index of the table.
+    (select(Income).filter_by(user_id='u1'), 'ix_income_user_id_'),
+    (select(Budget).filter_by(user_id='u1', category='Food'), 'ix_budget_user_id_category_period'),
+    (select(Goal).filter_by(user_id='u1'), 'ix_goal_user_id_'),
+    (select(RecurringExpense).filter_by(user_id='u1'), 'ix_recurring_expense_user_id_'),
+    (select(RecurringExpense).where(RecurringExpense.next_date <= datetime(2024, 1, 1)),
+     'ix_recurring_expense_next_date'),
+    (select(Expense).where(Expense.user_id == 'u1', Expense.change_seq > 5), 'ix_expense_user_id_change_seq'),
+    (select(Budget).where(Budget.user_id == 'u1', Budget.change_seq.is_(None)), 'ix_budget_user_id_change_seq'),
+    (select(SyncTombstone).where(SyncTombstone.user_id == 'u1', SyncTombstone.change_seq > 5),
+     'ix_sync_tombstone_user_id_change_seq'),
+]
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+def _compile(query, engine):
+    return str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+
+@pytest.mark.parametrize("query,index_prefix", ACCESS_PATHS)
+def test_sqlite_planner_uses_index(app, query, index_prefix):
+    sql = _compile(query, db.engine)
+    plan = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    details = " ".join(row[-1] for row in plan)
+    assert f"USING INDEX {index_prefix}" in details or f"USING COVERING INDEX {index_prefix}" in details, details
+
+@pytest.mark.skipif(not os.getenv('TEST_POSTGRES_URL'), reason="TEST_POSTGRES_URL not set")
+@pytest.mark.parametrize("query,index_prefix", ACCESS_PATHS)
+def test_postgres_planner_uses_index(app, query, index_prefix):
+    engine = create_engine(os.environ['TEST_POSTGRES_URL'])
+    db.metadata.create_all(engine)
+    try:
+        with engine.connect() as conn:
+            # Empty tables make a sequential scan the cheapest plan, so force
+            # the planner to show whether an index path exists at all.
+            conn.execute(text("SET enable_seqscan = off"))
+            plan = conn.execute(text(f"EXPLAIN {_compile(query, engine)}")).fetchall()
+        details = " ".join(row[0] for row in plan)
+        assert index_prefix in details, details
+    finally:
+        db.metadata.drop_all(engine)
+        engine.dispose()
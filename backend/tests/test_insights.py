@@ -1,8 +1,17 @@
+import time
 import pytest
+from datetime import datetime
+from flask import current_app
 from app import create_app
-from app.extensions import db
+from app.config import Config
+from app.extensions import db, job_queue
 from app.models.user import User
 from app.models.expense import Expense
+from app.models.forecast import Forecast
+from app.services import ai_service
+from app.cache import ModelCache
+from app.jobs import JobQueue
+from app.utils.recurrence import add_months
 
 @pytest.fixture
 def app():
@@ -37,4 +46,182 @@ def test_get_predictions(client, auth_token):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = client.get('/api/insights/predictions', headers=headers)
     assert response.status_code == 200
-    assert "predictions" in response.json
\ No newline at end of file
+    assert "predictions" in response.json
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    calls = []
+    build = ai_service._build_forecast
+    def counting_build(user_id):
+        calls.append(user_id)
+        return build(user_id)
+    monkeypatch.setattr(ai_service, '_build_forecast', counting_build)
+    return calls
+
+def test_predictions_reuse_cached_forecast(client, auth_token, build_calls):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for amount in (10.0, 20.0, 30.0):
+        client.post('/api/expenses/', json={"amount": amount, "category": "Food"}, headers=headers)
+
+    first = client.get('/api/insights/predictions', headers=headers)
+    second = client.get('/api/insights/predictions', headers=headers)
+    assert first.json == second.json
+    assert len(first.json['predictions']) == 3
+    assert len(build_calls) == 1
+
+    client.post('/api/expenses/', json={"amount": 40.0, "category": "Food"}, headers=headers)
+    client.get('/api/insights/predictions', headers=headers)
+    assert len(build_calls) == 2
+
+def test_editing_an_expense_rebuilds_the_cached_forecast(client, auth_token, build_calls):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    expense_id = client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"},
+                             headers=headers).json['expense_id']
+    client.get('/api/insights/predictions', headers=headers)
+    assert len(build_calls) == 1
+
+    client.put(f'/api/expenses/{expense_id}', json={"amount": 15.0}, headers=headers)
+    client.get('/api/insights/predictions', headers=headers)
+    assert len(build_calls) == 2
+
+def test_model_cache_disk_store(tmp_path):
+    cache = ModelCache()
+    cache.directory = str(tmp_path)
+    cache.set("user-1", (3, 60.0), {"model": "fitted"})
+
+    cache.memory.clear()
+    assert cache.get("user-1", (3, 60.0)) == {"model": "fitted"}
+    assert cache.get("user-1", (4, 70.0)) is None
+
+    cache.invalidate("user-1")
+    cache.memory.clear()
+    assert cache.get("user-1", (3, 60.0)) is None
+
+def test_predictions_are_dated_monthly_totals(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user = User.query.filter_by(email="test@example.com").first()
+    now = datetime.utcnow()
+    last_month = add_months(datetime(now.year, now.month, 1), -1)
+    db.session.add_all([
+        Expense(user_id=user.id, amount=100.0, category="Food", date=last_month.replace(day=10)),
+        Expense(user_id=user.id, amount=50.0, category="Transport", date=last_month.replace(day=20)),
+    ])
+    db.session.commit()
+
+    response = client.get('/api/insights/predictions', headers=headers)
+    assert response.status_code == 200
+    forecast = response.json['forecast']
+    assert len(forecast) == 3
+    assert [f['amount'] for f in forecast] == response.json['predictions']
+    assert forecast[0]['month'] == f"{now.year:04d}-{now.month:02d}"
+    assert set(response.json['by_category']) == {"Food", "Transport"}
+
+def test_refresh_job_populates_forecast_cache(app, client, auth_token, build_calls):
+    app.config['JOB_EXECUTOR'] = 'thread'
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/expenses/', json={"amount": 25.0, "category": "Food"}, headers=headers)
+
+    response = client.post('/api/insights/refresh', headers=headers)
+    assert response.status_code == 202
+    job_id = response.json['job_id']
+
+    for _ in range(100):
+        status = client.get(f'/api/insights/jobs/{job_id}', headers=headers).json
+        if status['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.05)
+    job_queue.shutdown()
+    assert status['status'] == 'done'
+    assert len(status['result']['predictions']) == 3
+
+    predictions = client.get('/api/insights/predictions', headers=headers)
+    assert predictions.json == status['result']
+    assert len(build_calls) == 1
+
+def test_job_status_is_visible_to_other_workers(app, client, auth_token):
+    app.config['JOB_EXECUTOR'] = 'thread'
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/expenses/', json={"amount": 25.0, "category": "Food"}, headers=headers)
+    job_id = client.post('/api/insights/refresh', headers=headers).json['job_id']
+    job_queue.shutdown()
+    user = User.query.filter_by(email="test@example.com").first()
+
+    # A queue that did not submit the job only has the shared job row.
+    other_worker = JobQueue()
+    status = other_worker.status(job_id, user.id)
+    assert status['status'] == 'done'
+    assert status == job_queue.status(job_id, user.id)
+    assert other_worker.status(job_id, "someone-else") is None
+
+def _worker_extensions():
+    return sorted(current_app.extensions)
+
+def test_process_workers_do_not_start_schedulers(app, monkeypatch):
+    monkeypatch.setattr(Config, 'RECURRING_SCHEDULER_INTERVAL', 3600)
+    monkeypatch.setattr(Config, 'NOTIFICATION_WORKER_INTERVAL', 3600)
+    assert app.config['JOB_EXECUTOR'] == 'process'
+    job_id = job_queue.submit("owner", _worker_extensions)
+
+    for _ in range(200):
+        status = job_queue.status(job_id, "owner")
+        if status['status'] in ('done', 'failed'):
+            break
+        time.sleep(0.05)
+    job_queue.shutdown()
+    assert status['status'] == 'done'
+    assert 'job_queue' in status['result']
+    assert 'recurring_scheduler' not in status['result']
+    assert 'notification_worker' not in status['result']
+
+def test_unknown_job_returns_404(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/insights/jobs/does-not-exist', headers=headers)
+    assert response.status_code == 404
+
+def test_forecast_all_command_precomputes_predictions(app, client, auth_token, build_calls):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user = User.query.filter_by(email="test@example.com").first()
+    other = User(name="Other", email="other@example.com", password="password")
+    db.session.add(other)
+    db.session.flush()
+    now = datetime.utcnow()
+    this_month = datetime(now.year, now.month, 1)
+    db.session.add_all([
+        Expense(user_id=user.id, amount=100.0, category="Food", date=add_months(this_month, -3).replace(day=10)),
+        Expense(user_id=user.id, amount=120.0, category="Food", date=add_months(this_month, -2).replace(day=10)),
+        Expense(user_id=user.id, amount=30.0, category="Transport", date=add_months(this_month, -2).replace(day=11)),
+        Expense(user_id=other.id, amount=80.0, category="Food", date=add_months(this_month, -1)),
+    ])
+    db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=['forecast-all'])
+    assert result.exit_code == 0
+    assert "2 users" in result.output
+    assert Forecast.query.count() == 2
+
+    precomputed = client.get('/api/insights/predictions', headers=headers).json
+    assert build_calls == []
+    assert precomputed == ai_service._build_forecast(user.id)
+    build_calls.clear()
+
+    # New data makes the precomputed row stale, so it is rebuilt on demand.
+    client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"}, headers=headers)
+    client.get('/api/insights/predictions', headers=headers)
+    assert build_calls == [user.id]
+
+def test_future_dated_expenses_are_left_out_of_the_forecast(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user = User.query.filter_by(email="test@example.com").first()
+    next_year = datetime.utcnow().year + 1
+    db.session.add(Expense(user_id=user.id, amount=90.0, category="Travel", date=datetime(next_year, 6, 1)))
+    db.session.commit()
+
+    response = client.get('/api/insights/predictions', headers=headers)
+    assert response.status_code == 200
+    assert response.json['predictions'] == []
+    assert client.get('/api/dashboard', headers=headers).status_code == 200
+
+    client.post('/api/expenses/', json={"amount": 40.0, "category": "Food"}, headers=headers)
+    response = client.get('/api/insights/predictions', headers=headers)
+    assert response.status_code == 200
+    assert set(response.json['by_category']) == {"Food"}
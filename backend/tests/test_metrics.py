@@ -0,0 +1,95 @@
+import logging
+import pytest
+from app import create_app
+from app.extensions import db, metrics
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+def test_server_timing_header(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/expenses/bulk', json=[{"amount": 1.0, "category": "Food"}] * 25, headers=headers)
+    response = client.get('/api/expenses/', headers=headers)
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    # The ETag version lookup plus the page itself.
+    assert '2 queries, 26 rows' in timing
+    assert 'app;dur=' in timing
+
+def test_per_endpoint_totals(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    metrics.reset()
+    for _ in range(3):
+        client.get('/api/expenses/', headers=headers)
+    stats = metrics.snapshot()['expense.manage_expenses']
+    assert stats['requests'] == 3
+    assert stats['queries'] == 6
+    assert stats['duration_seconds'] > 0
+
+def test_metrics_endpoint_prometheus_format(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.get('/api/expenses/', headers=headers)
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert '# TYPE aurofi_db_queries_total counter' in body
+    assert 'aurofi_http_requests_total{endpoint="expense.manage_expenses",method="GET",status="200"} 1' in body
+    assert 'aurofi_http_request_duration_seconds_bucket{endpoint="expense.manage_expenses",le="+Inf"} 1' in body
+
+def test_slow_queries_are_logged(app, client, auth_token, caplog):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    app.config['SLOW_QUERY_MS'] = 0.000001
+    metrics.reset()
+    with caplog.at_level(logging.WARNING, logger='app.metrics'):
+        client.get('/api/expenses/', headers=headers)
+    assert any("Slow query" in r.message and "expense.manage_expenses" in r.message for r in caplog.records)
+    assert metrics.snapshot()['expense.manage_expenses']['slow_queries'] == 2
+
+def test_pool_metrics(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.get('/api/expenses/', headers=headers)
+    stats = metrics.pool_stats()['default']
+    assert stats['connects'] >= 1
+    assert stats['checkouts'] >= 1
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'aurofi_db_pool_checkouts_total{bind="default"}' in body
+    assert 'aurofi_db_pool_timeouts_total 0' in body
+
+def test_pool_timeout_returns_503(client, auth_token, monkeypatch):
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    from app.routes import expense
+    def exhausted(*args, **kwargs):
+        raise PoolTimeoutError("QueuePool limit of size 5 overflow 10 reached")
+    monkeypatch.setattr(expense, 'get_expenses', exhausted)
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/expenses/', headers=headers)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert 'aurofi_db_pool_timeouts_total 1' in client.get('/metrics').get_data(as_text=True)
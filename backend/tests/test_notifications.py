@@ -0,0 +1,201 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db, notifier
+from app.models.notification import NotificationOutbox
+from app.models.user import User
+from app.services.notification_service import deliver_pending, enqueue_notification, flush_outbox
+from app.services.summary_service import add_to_summary
+
+@pytest.fixture
+def outbox(tmp_path):
+    return tmp_path / "notifications.log"
+
+@pytest.fixture
+def app(outbox):
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['NOTIFICATION_SENDER'] = 'file'
+    app.config['NOTIFICATION_FILE'] = str(outbox)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+def _sent(outbox):
+    flush_outbox()
+    if not outbox.exists():
+        return []
+    return [json.loads(line) for line in outbox.read_text().splitlines()]
+
+def _add_budget(client, headers, limit=100.0):
+    client.post('/api/budgets/', json={
+        "category": "Food", "limit": limit, "income_percentage": 10
+    }, headers=headers)
+
+def test_send_notification_without_budget(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.post('/api/notifications/send', json={"category": "Food"}, headers=headers)
+    assert response.status_code == 404
+
+def test_send_notification_over_budget(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _add_budget(client, headers)
+    client.post('/api/expenses/', json={"amount": 150.0, "category": "Food"}, headers=headers)
+    response = client.post('/api/notifications/send', json={"category": "Food"}, headers=headers)
+    assert response.status_code == 200
+    assert "exceeded" in response.json['message']
+
+def test_thresholds_fire_once_on_write(client, auth_token, outbox):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _add_budget(client, headers)
+
+    client.post('/api/expenses/', json={"amount": 40.0, "category": "Food"}, headers=headers)
+    assert _sent(outbox) == []
+
+    client.post('/api/expenses/', json={"amount": 45.0, "category": "Food"}, headers=headers)
+    assert [n['threshold'] for n in _sent(outbox)] == [50, 80]
+
+    # Spend that stays between thresholds does not repeat alerts.
+    client.post('/api/expenses/', json={"amount": 5.0, "category": "Food"}, headers=headers)
+    client.post('/api/expenses/', json={"amount": 5.0, "category": "Transport"}, headers=headers)
+    assert len(_sent(outbox)) == 2
+
+    client.post('/api/expenses/', json={"amount": 20.0, "category": "Food"}, headers=headers)
+    sent = _sent(outbox)
+    assert [n['threshold'] for n in sent] == [50, 80, 100]
+    assert sent[-1]['spent'] == 110.0
+    assert sent[-1]['limit'] == 100.0
+
+def test_update_and_delete_adjust_running_total(client, auth_token, outbox):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _add_budget(client, headers)
+
+    expense_id = client.post('/api/expenses/', json={"amount": 60.0, "category": "Food"},
+                             headers=headers).json['expense_id']
+    assert [n['threshold'] for n in _sent(outbox)] == [50]
+
+    client.delete(f'/api/expenses/{expense_id}', headers=headers)
+    expense_id = client.post('/api/expenses/', json={"amount": 30.0, "category": "Transport"},
+                             headers=headers).json['expense_id']
+    assert len(_sent(outbox)) == 1
+
+    # Moving the expense into Food counts it there; 30 alone crosses nothing.
+    client.put(f'/api/expenses/{expense_id}', json={"category": "Food"}, headers=headers)
+    assert len(_sent(outbox)) == 1
+
+    # 50% is crossed again, but the identical alert is de-duplicated.
+    client.put(f'/api/expenses/{expense_id}', json={"amount": 85.0}, headers=headers)
+    assert [n['threshold'] for n in _sent(outbox)] == [50, 80]
+
+def test_bulk_insert_evaluates_thresholds(client, auth_token, outbox):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _add_budget(client, headers)
+    rows = [{"amount": 30.0, "category": "Food"} for _ in range(4)]
+    client.post('/api/expenses/bulk', json=rows, headers=headers)
+    assert [n['threshold'] for n in _sent(outbox)] == [50, 80, 100]
+
+def test_thresholds_use_totals_written_by_other_workers(client, auth_token, outbox):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _add_budget(client, headers)
+    client.post('/api/expenses/', json={"amount": 40.0, "category": "Food"}, headers=headers)
+
+    # Spend recorded by another process only shows up in monthly_summary.
+    user_id = User.query.filter_by(email="test@example.com").first().id
+    add_to_summary('expense', [{"user_id": user_id, "category": "Food", "amount": 35.0,
+                                "date": datetime.utcnow()}])
+    db.session.commit()
+
+    client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"}, headers=headers)
+    sent = _sent(outbox)
+    assert [n['threshold'] for n in sent] == [80]
+    assert sent[-1]['spent'] == 85.0
+
+def test_writes_only_queue_to_outbox(client, auth_token, outbox):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    _add_budget(client, headers)
+    client.post('/api/expenses/', json={"amount": 90.0, "category": "Food"}, headers=headers)
+
+    assert not outbox.exists()
+    assert NotificationOutbox.query.filter_by(status='pending').count() == 2
+    assert flush_outbox()['sent'] == 2
+    assert NotificationOutbox.query.filter_by(status='sent').count() == 2
+
+def _alert(user_id, threshold, period="2024-01"):
+    return {"user_id": user_id, "category": "Food", "period": period, "threshold": threshold,
+            "spent": 1.0, "limit": 1.0, "message": "test", "created_at": "2024-01-01T00:00:00"}
+
+@pytest.fixture
+def user_id(auth_token):
+    return User.query.filter_by(email="test@example.com").first().id
+
+def test_failed_delivery_retries_with_backoff(app, user_id, monkeypatch):
+    calls = []
+    def failing_send(notification):
+        calls.append(notification)
+        raise RuntimeError("gateway down")
+    monkeypatch.setattr(notifier.sender, 'send', failing_send)
+    app.config['NOTIFICATION_MAX_ATTEMPTS'] = 3
+    app.config['NOTIFICATION_RETRY_BASE'] = 10
+
+    now = datetime(2024, 1, 1)
+    enqueue_notification(_alert(user_id, 50), now=now)
+    assert deliver_pending(now=now)['retried'] == 1
+    message = NotificationOutbox.query.one()
+    assert message.next_attempt_at == now + timedelta(seconds=10)
+    assert deliver_pending(now=now)['retried'] == 0
+
+    assert deliver_pending(now=now + timedelta(seconds=10))['retried'] == 1
+    assert message.next_attempt_at == now + timedelta(seconds=30)
+    assert deliver_pending(now=now + timedelta(seconds=30))['failed'] == 1
+    assert message.status == 'failed'
+    assert message.last_error == "gateway down"
+    assert len(calls) == 3
+
+def test_rate_limit_defers_excess_messages(app, user_id, outbox):
+    app.config['NOTIFICATION_RATE_LIMIT'] = 2
+    app.config['NOTIFICATION_RATE_WINDOW'] = 60
+    now = datetime(2024, 1, 1)
+    for threshold in (50, 80, 100):
+        enqueue_notification(_alert(user_id, threshold), now=now)
+
+    assert flush_outbox(now=now) == {"sent": 2, "retried": 0, "failed": 0, "deferred": 1}
+    assert flush_outbox(now=now + timedelta(seconds=59))['sent'] == 0
+    assert flush_outbox(now=now + timedelta(seconds=60))['sent'] == 1
+    assert [n['threshold'] for n in _sent(outbox)] == [50, 80, 100]
+
+def test_dedupe_window(app, user_id):
+    app.config['NOTIFICATION_DEDUPE_WINDOW'] = 60
+    now = datetime(2024, 1, 1)
+    assert enqueue_notification(_alert(user_id, 50), now=now) is not None
+    assert enqueue_notification(_alert(user_id, 50), now=now + timedelta(seconds=30)) is None
+    assert enqueue_notification(_alert(user_id, 80), now=now + timedelta(seconds=30)) is not None
+    assert enqueue_notification(_alert(user_id, 50), now=now + timedelta(seconds=61)) is not None
+
+def test_deliver_notifications_command(app, user_id, outbox):
+    enqueue_notification(_alert(user_id, 50))
+    result = app.test_cli_runner().invoke(args=['deliver-notifications'])
+    assert result.exit_code == 0
+    assert "Sent 1" in result.output
+    assert len(_sent(outbox)) == 1
@@ -1,8 +1,12 @@
 import pytest
+from datetime import datetime
 from app import create_app
 from app.extensions import db
 from app.models.user import User
 from app.models.recurring_expense import RecurringExpense
+from app.models.expense import Expense
+from app.services.recurring_expense_service import materialize_due_recurrences
+from app.utils.recurrence import first_index_on_or_after, iter_occurrences, nth_occurrence
 
 @pytest.fixture
 def app():
@@ -48,4 +52,117 @@ def test_get_recurring_expenses(client, auth_token):
     headers = {"Authorization": f"Bearer {auth_token}"}
     response = client.get('/api/recurring-expenses', headers=headers)
     assert response.status_code == 200
-    assert isinstance(response.json, list)
\ No newline at end of file
+    assert isinstance(response.json, list)
+
+def test_recurrence_month_end_clamping():
+    start = datetime(2024, 1, 31)
+    assert [nth_occurrence(start, 'monthly', n) for n in range(4)] == [
+        datetime(2024, 1, 31), datetime(2024, 2, 29), datetime(2024, 3, 31), datetime(2024, 4, 30)
+    ]
+    assert list(iter_occurrences(datetime(2024, 1, 1), 'weekly', datetime(2024, 1, 15))) == [
+        datetime(2024, 1, 1), datetime(2024, 1, 8), datetime(2024, 1, 15)
+    ]
+
+def test_add_recurring_expense_rejects_unknown_frequency(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.post('/api/recurring-expenses/', json={
+        "amount": 100.0,
+        "category": "Utilities",
+        "frequency": "fortnightly",
+        "next_date": "2023-12-01"
+    }, headers=headers)
+    assert response.status_code == 400
+
+def test_materialize_due_recurrences_catches_up_idempotently(client, auth_token):
+    user = User.query.filter_by(email="test@example.com").first()
+    db.session.add_all([
+        RecurringExpense(user_id=user.id, amount=50.0, category="Utilities",
+                         frequency="monthly", next_date=datetime(2024, 1, 31)),
+        RecurringExpense(user_id=user.id, amount=5.0, category="Transport",
+                         frequency="Weekly", next_date=datetime(2024, 4, 1)),
+        RecurringExpense(user_id=user.id, amount=9.0, category="Other",
+                         frequency="monthly", next_date=datetime(2024, 6, 1)),
+        RecurringExpense(user_id=user.id, amount=1.0, category="Legacy",
+                         frequency="fortnightly", next_date=datetime(2024, 1, 1)),
+    ])
+    db.session.commit()
+
+    now = datetime(2024, 4, 10)
+    assert materialize_due_recurrences(now=now, batch_size=1) == (2, 5)
+    assert materialize_due_recurrences(now=now, batch_size=1) == (0, 0)
+
+    utilities = sorted(e.date for e in Expense.query.filter_by(category="Utilities"))
+    assert utilities == [datetime(2024, 1, 31), datetime(2024, 2, 29), datetime(2024, 3, 31)]
+    assert Expense.query.filter_by(category="Transport").count() == 2
+    next_dates = {r.category: r.next_date for r in RecurringExpense.query.all()}
+    assert next_dates == {
+        "Utilities": datetime(2024, 4, 30),
+        "Transport": datetime(2024, 4, 15),
+        "Other": datetime(2024, 6, 1),
+        "Legacy": datetime(2024, 1, 1),
+    }
+
+def test_materialize_keeps_month_end_across_runs(client, auth_token):
+    user = User.query.filter_by(email="test@example.com").first()
+    db.session.add(RecurringExpense(user_id=user.id, amount=50.0, category="Utilities",
+                                    frequency="monthly", next_date=datetime(2024, 1, 31)))
+    db.session.commit()
+
+    for now in (datetime(2024, 2, 1), datetime(2024, 3, 1), datetime(2024, 4, 1), datetime(2024, 5, 1)):
+        materialize_due_recurrences(now=now)
+
+    utilities = sorted(e.date for e in Expense.query.filter_by(category="Utilities"))
+    assert utilities == [datetime(2024, 1, 31), datetime(2024, 2, 29), datetime(2024, 3, 31), datetime(2024, 4, 30)]
+    assert RecurringExpense.query.first().next_date == datetime(2024, 5, 31)
+
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/recurring-expenses/calendar?from=2024-05-01&to=2024-08-01', headers=headers)
+    assert [d['date'] for d in response.json['days']] == ["2024-05-31", "2024-06-30", "2024-07-31"]
+
+def test_materialize_recurring_command(app, auth_token):
+    user = User.query.filter_by(email="test@example.com").first()
+    db.session.add(RecurringExpense(user_id=user.id, amount=20.0, category="Utilities",
+                                    frequency="daily", next_date=datetime(2000, 1, 1)))
+    db.session.commit()
+    result = app.test_cli_runner().invoke(args=['materialize-recurring'])
+    assert result.exit_code == 0
+    assert "Processed 1 recurring expenses" in result.output
+    assert RecurringExpense.query.first().next_date > datetime.utcnow()
+
+def test_first_index_skips_to_window():
+    start = datetime(2020, 1, 31)
+    for frequency in ('daily', 'weekly', 'monthly', 'yearly'):
+        since = datetime(2024, 3, 15)
+        n = first_index_on_or_after(start, frequency, since)
+        assert nth_occurrence(start, frequency, n) >= since
+        assert nth_occurrence(start, frequency, n - 1) < since
+
+def test_recurring_calendar_merges_per_day_totals(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user = User.query.filter_by(email="test@example.com").first()
+    db.session.add_all([
+        RecurringExpense(user_id=user.id, amount=100.0, category="Utilities",
+                         frequency="monthly", next_date=datetime(2023, 1, 31)),
+        RecurringExpense(user_id=user.id, amount=10.0, category="Transport",
+                         frequency="weekly", next_date=datetime(2024, 2, 1)),
+        RecurringExpense(user_id=user.id, amount=999.0, category="Other",
+                         frequency="yearly", next_date=datetime(2025, 1, 1)),
+    ])
+    db.session.commit()
+
+    response = client.get('/api/recurring-expenses/calendar?from=2024-02-01&to=2024-03-01&detail=true',
+                          headers=headers)
+    assert response.status_code == 200
+    days = {d['date']: d for d in response.json['days']}
+    assert list(days) == ["2024-02-01", "2024-02-08", "2024-02-15", "2024-02-22", "2024-02-29"]
+    assert days["2024-02-29"]['total'] == 110.0
+    assert days["2024-02-29"]['count'] == 2
+    assert {i['category'] for i in days["2024-02-29"]['items']} == {"Utilities", "Transport"}
+    assert response.json['total'] == 150.0
+
+def test_recurring_calendar_validates_window(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get('/api/recurring-expenses/calendar?from=2024-03-01&to=2024-02-01', headers=headers)
+    assert response.status_code == 400
+    response = client.get('/api/recurring-expenses/calendar?from=2000-01-01&to=2024-01-01', headers=headers)
+    assert response.status_code == 400
@@ -0,0 +1,94 @@
+import pytest
+from datetime import datetime
+from flask import g
+from sqlalchemy import insert, select
+from app import create_app
+from app.config import Config
+from app.extensions import db, replica_router
+from app.models.expense import Expense
+from app.models.user import User
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Two SQLite files stand in for a primary and its replica.
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(Config, 'SQLALCHEMY_BINDS', {'replica': replica_url})
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines['replica'])
+        yield app
+        db.drop_all()
+        db.metadata.drop_all(db.engines['replica'])
+    # init_app registered a (table-less) metadata for the bind on the shared
+    # db object; drop it so later apps without a replica can create_all().
+    db.metadatas.pop('replica', None)
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+def _replicated(user_id, amount):
+    # A row that has reached the replica but is not on the primary, so reads
+    # show which database served them.
+    with db.engines['replica'].begin() as conn:
+        conn.execute(insert(Expense), {"id": "replica-row", "user_id": user_id, "amount": amount,
+                                       "category": "Food", "date": datetime(2024, 1, 1)})
+
+def test_gets_read_from_replica(app, client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user_id = User.query.filter_by(email="test@example.com").first().id
+    _replicated(user_id, 99.0)
+
+    response = client.get('/api/expenses/', headers=headers)
+    assert [e['amount'] for e in response.json] == [99.0]
+    # Blueprints outside REPLICA_BLUEPRINTS stay on the primary.
+    assert client.get('/api/user/', headers=headers).json['email'] == "test@example.com"
+
+def test_writes_go_to_primary_and_are_read_back(app, client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user_id = User.query.filter_by(email="test@example.com").first().id
+    _replicated(user_id, 99.0)
+
+    client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"}, headers=headers)
+    with db.engines[None].connect() as conn:
+        assert conn.execute(select(Expense.amount)).scalars().all() == [10.0]
+
+    # Read-your-writes: right after the write this user reads the primary.
+    response = client.get('/api/expenses/', headers=headers)
+    assert [e['amount'] for e in response.json] == [10.0]
+
+    # Once the sticky window has passed, reads go back to the replica.
+    app.config['REPLICA_STICKY_SECONDS'] = 0
+    response = client.get('/api/expenses/', headers=headers)
+    assert [e['amount'] for e in response.json] == [99.0]
+
+def test_stickiness_is_per_user(app, client, auth_token):
+    user_id = User.query.filter_by(email="test@example.com").first().id
+    replica_router.last_write.set(user_id, 0)
+    assert not replica_router.is_sticky(user_id, now=app.config['REPLICA_STICKY_SECONDS'] + 1)
+    assert replica_router.is_sticky(user_id, now=1)
+    assert not replica_router.is_sticky("someone-else")
+
+def test_dml_on_replica_routed_request_uses_primary(app):
+    with app.test_request_context('/api/expenses/'):
+        g.read_from_replica = True
+        assert db.session.get_bind(clause=select(Expense)) is db.engines['replica']
+        assert db.session.get_bind(clause=insert(Expense)) is db.engines[None]
@@ -0,0 +1,113 @@
+import pytest
+from app import create_app
+from app.cache import LocalRedis, MemoryBackend
+from app.extensions import db, metrics, response_cache
+
+@pytest.fixture(params=['memory', 'local'])
+def app(request):
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['RESPONSE_CACHE'] = request.param
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def _token(client, email):
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": email,
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={"email": email, "password": "password"})
+    return {"Authorization": f"Bearer {response.json['access_token']}"}
+
+def test_reads_are_cached_until_the_user_writes(client):
+    headers = _token(client, "test@example.com")
+    client.post('/api/budgets/', json={"category": "Food", "limit": 500.0, "income_percentage": 10.0},
+                headers=headers)
+
+    first = client.get('/api/budgets/', headers=headers)
+    second = client.get('/api/budgets/', headers=headers)
+    assert first.json == second.json
+    assert response_cache.stats()['budgets'] == {"hits": 1, "misses": 1}
+
+    client.post('/api/expenses/', json={"amount": 120.0, "category": "Food"}, headers=headers)
+    third = client.get('/api/budgets/', headers=headers)
+    assert third.json[0]['spent'] == 120.0
+    assert response_cache.stats()['budgets'] == {"hits": 1, "misses": 2}
+
+def test_cached_expense_list_matches_the_uncached_body(client):
+    headers = _token(client, "test@example.com")
+    client.post('/api/expenses/', json={"amount": 12.5, "category": "Food"}, headers=headers)
+
+    first = client.get('/api/expenses/', headers=headers)
+    second = client.get('/api/expenses/', headers=headers)
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert first.json[0]['date']
+    assert response_cache.stats()['expenses'] == {"hits": 1, "misses": 1}
+
+def test_entries_are_keyed_by_user_and_params(client):
+    alice = _token(client, "alice@example.com")
+    bob = _token(client, "bob@example.com")
+    client.post('/api/goals/', json={"goal_name": "Trip", "target_amount": 100.0}, headers=alice)
+
+    assert len(client.get('/api/goals/', headers=alice).json) == 1
+    assert client.get('/api/goals/', headers=bob).json == []
+    client.get('/api/goals/?limit=1', headers=alice)
+    client.get('/api/goals/?limit=1', headers=alice)
+    assert response_cache.stats()['goals'] == {"hits": 1, "misses": 3}
+
+def test_errors_are_not_cached(client):
+    headers = _token(client, "test@example.com")
+    assert client.get('/api/income/?from=bad', headers=headers).status_code == 400
+    assert client.get('/api/income/?from=bad', headers=headers).status_code == 400
+    assert response_cache.stats()['incomes'] == {"hits": 0, "misses": 2}
+
+def test_hits_and_misses_are_exported(client):
+    headers = _token(client, "test@example.com")
+    client.get('/api/recurring-expenses/', headers=headers)
+    client.get('/api/recurring-expenses/', headers=headers)
+    text = metrics.render()
+    assert 'aurofi_response_cache_hits_total{endpoint="recurring_expenses"} 1' in text
+    assert 'aurofi_response_cache_misses_total{endpoint="recurring_expenses"} 1' in text
+
+def test_disabled_cache_computes_every_time(app, client):
+    app.config['RESPONSE_CACHE'] = 'none'
+    response_cache.init_app(app)
+    headers = _token(client, "test@example.com")
+    client.get('/api/goals/', headers=headers)
+    client.get('/api/goals/', headers=headers)
+    assert response_cache.stats() == {}
+
+def test_memory_backend_evicts_by_size_and_ttl(app):
+    app.config['RESPONSE_CACHE_SIZE'] = 2
+    backend = MemoryBackend(app)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.set("c", 3, ttl=60)
+    assert backend.get("a") is None
+    assert backend.get("c") == 3
+    backend.set("d", 4, ttl=0)
+    assert backend.get("d") is None
+
+    version = backend.version("user-1")
+    backend.bump("user-1")
+    assert backend.version("user-1") != version
+
+def test_local_redis_semantics():
+    client = LocalRedis()
+    assert client.set("k", "v", nx=True)
+    assert client.set("k", "w", nx=True) is None
+    assert client.get("k") == b"v"
+    assert client.incr("n") == 1
+    assert client.incr("n") == 2
+    client.set("t", 1, ex=-1)
+    assert client.get("t") is None
+    assert client.delete("k", "missing") == 1
@@ -0,0 +1,165 @@
+import pytest
+from datetime import datetime
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.expense import Expense
+from app.models.income import Income
+from app.models.monthly_summary import MonthlySummary
+from app.models.recurring_expense import RecurringExpense
+from app.services.recurring_expense_service import materialize_due_recurrences
+from app.services.summary_service import add_to_summary, rebuild_summaries, year_month
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+def _summary(kind='expense'):
+    return {
+        (s.year_month, s.category): (s.count, s.total, s.min_amount, s.max_amount)
+        for s in MonthlySummary.query.filter_by(kind=kind).all()
+    }
+
+def _expected(kind='expense'):
+    # The summary must always equal an aggregate over the raw rows.
+    model, column = (Expense, 'category') if kind == 'expense' else (Income, 'source')
+    cells = {}
+    for row in model.query.all():
+        key = (year_month(row.date), getattr(row, column))
+        amounts = cells.setdefault(key, [])
+        amounts.append(row.amount)
+    return {key: (len(a), sum(a), min(a), max(a)) for key, a in cells.items()}
+
+def test_expense_writes_maintain_summary(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    ids = [client.post('/api/expenses/', json={"amount": amount, "category": "Food"},
+                       headers=headers).json['expense_id'] for amount in (10.0, 30.0, 20.0)]
+    month = year_month(datetime.utcnow())
+    assert _summary() == {(month, "Food"): (3, 60.0, 10.0, 30.0)}
+
+    client.put(f'/api/expenses/{ids[1]}', json={"category": "Transport"}, headers=headers)
+    assert _summary() == _expected() == {
+        (month, "Food"): (2, 30.0, 10.0, 20.0),
+        (month, "Transport"): (1, 30.0, 30.0, 30.0),
+    }
+
+    client.put(f'/api/expenses/{ids[0]}', json={"amount": 5.0}, headers=headers)
+    client.delete(f'/api/expenses/{ids[1]}', headers=headers)
+    assert _summary() == _expected() == {(month, "Food"): (2, 25.0, 5.0, 20.0)}
+
+def test_deletes_apply_deltas_instead_of_recomputing(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    user_id = User.query.filter_by(email="test@example.com").first().id
+    expense_id = client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"},
+                             headers=headers).json['expense_id']
+    client.post('/api/expenses/', json={"amount": 4.0, "category": "Food"}, headers=headers)
+    # A concurrent insert whose raw row is not visible yet has already
+    # applied its delta; the delete must not overwrite it.
+    add_to_summary('expense', [{"user_id": user_id, "category": "Food", "amount": 6.0,
+                                "date": datetime.utcnow()}])
+    db.session.commit()
+
+    client.delete(f'/api/expenses/{expense_id}', headers=headers)
+    assert _summary() == {(year_month(datetime.utcnow()), "Food"): (2, 10.0, 4.0, 4.0)}
+
+def test_bulk_insert_updates_summary(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    rows = [{"amount": float(i), "category": "Food" if i % 2 else "Transport",
+             "date": f"2024-0{1 + i % 3}-15"} for i in range(1, 31)]
+    client.post('/api/expenses/bulk', json=rows, headers=headers)
+    client.post('/api/expenses/bulk', json=rows[:5], headers=headers)
+    assert _summary() == _expected()
+    assert len(_summary()) == 6
+
+def test_income_writes_maintain_summary(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    income_id = client.post('/api/income/', json={"source": "Salary", "amount": 3000.0},
+                            headers=headers).json['income_id']
+    client.post('/api/income/', json={"source": "Salary", "amount": 500.0}, headers=headers)
+    client.put(f'/api/income/{income_id}', json={"source": "Bonus"}, headers=headers)
+    assert _summary('income') == _expected('income')
+    assert len(_summary('income')) == 2
+    assert _summary() == {}
+
+def test_materializer_updates_summary(app):
+    user = User(name="R", email="r@example.com", password="x")
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(RecurringExpense(user_id=user.id, amount=50.0, category="Utilities",
+                                    frequency="monthly", next_date=datetime(2024, 1, 5)))
+    db.session.commit()
+    materialize_due_recurrences(now=datetime(2024, 3, 10))
+    assert _summary() == _expected() == {
+        ("2024-01", "Utilities"): (1, 50.0, 50.0, 50.0),
+        ("2024-02", "Utilities"): (1, 50.0, 50.0, 50.0),
+        ("2024-03", "Utilities"): (1, 50.0, 50.0, 50.0),
+    }
+
+def test_rebuild_summaries_command(app, client, auth_token):
+    user = User.query.filter_by(email="test@example.com").first()
+    db.session.add_all([
+        Expense(user_id=user.id, amount=100.0, category="Food", date=datetime(2024, 1, 10)),
+        Expense(user_id=user.id, amount=40.0, category="Food", date=datetime(2024, 1, 20)),
+        Expense(user_id=user.id, amount=30.0, category="Transport", date=datetime(2024, 2, 11)),
+        Income(user_id=user.id, source="Salary", amount=5000.0, date=datetime(2024, 1, 1)),
+    ])
+    db.session.commit()
+    assert _summary() == {}
+
+    result = app.test_cli_runner().invoke(args=['rebuild-summaries'])
+    assert result.exit_code == 0
+    assert "Wrote 3 summary rows" in result.output
+    assert _summary() == _expected()
+    assert _summary('income') == {("2024-01", "Salary"): (1, 5000.0, 5000.0, 5000.0)}
+
+    # Rebuilding is idempotent.
+    assert rebuild_summaries() == 3
+
+def test_rebuild_summaries_refreshes_cached_budgets(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/budgets/', json={"category": "Food", "limit": 500.0, "income_percentage": 10.0},
+                headers=headers)
+    first = client.get('/api/budgets/', headers=headers)
+    assert next(b for b in first.json if b['category'] == "Food")['spent'] == 0.0
+
+    user = User.query.filter_by(email="test@example.com").first()
+    db.session.add(Expense(user_id=user.id, amount=75.0, category="Food", date=datetime.utcnow()))
+    db.session.commit()
+    rebuild_summaries(user.id)
+
+    second = client.get('/api/budgets/', headers={**headers, "If-None-Match": first.headers['ETag']})
+    assert second.status_code == 200
+    assert next(b for b in second.json if b['category'] == "Food")['spent'] == 75.0
+
+def test_voice_total_reads_summary(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/expenses/', json={"amount": 12.5, "category": "groceries"}, headers=headers)
+    client.post('/api/expenses/', json={"amount": 7.5, "category": "groceries"}, headers=headers)
+    response = client.post('/api/voice/command', json={"command": "how much have I spent on groceries"},
+                           headers=headers)
+    assert response.json['response'] == "You spent $20.0 on groceries."
@@ -0,0 +1,115 @@
+import pytest
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.services.recurring_expense_service import materialize_due_recurrences
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    # Register and login to get a token
+    client.post('/api/auth/register', json={
+        "name": "Test User",
+        "email": "test@example.com",
+        "password": "password",
+        "income": 5000.0
+    })
+    response = client.post('/api/auth/login', json={
+        "email": "test@example.com",
+        "password": "password"
+    })
+    return response.json['access_token']
+
+def _sync(client, headers, since=None):
+    response = client.get('/api/sync' + (f'?since={since}' if since is not None else ''), headers=headers)
+    assert response.status_code == 200
+    return response.json
+
+def test_initial_sync_returns_everything(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"}, headers=headers)
+    client.post('/api/goals/', json={"goal_name": "Trip", "target_amount": 100.0}, headers=headers)
+
+    feed = _sync(client, headers)
+    assert feed['token'] == 2
+    assert [e['amount'] for e in feed['changes']['expenses']] == [10.0]
+    assert [g['goal_name'] for g in feed['changes']['goals']] == ["Trip"]
+    assert feed['changes']['expenses'][0]['updated_at'] is not None
+    assert all(ids == [] for ids in feed['deleted'].values())
+
+def test_delta_sync_returns_only_changes_since_token(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/expenses/', json={"amount": 10.0, "category": "Food"}, headers=headers)
+    goal_id = client.post('/api/goals/', json={"goal_name": "Trip", "target_amount": 100.0},
+                          headers=headers).json['goal_id']
+    income_id = client.post('/api/income/', json={"source": "Salary", "amount": 3000.0},
+                            headers=headers).json['income_id']
+    token = _sync(client, headers)['token']
+
+    assert _sync(client, headers, token)['changes']['goals'] == []
+    client.put(f'/api/goals/{goal_id}', json={"saved_amount": 40.0}, headers=headers)
+    client.delete(f'/api/income/{income_id}', headers=headers)
+    client.post('/api/expenses/', json={"amount": 25.0, "category": "Transport"}, headers=headers)
+
+    feed = _sync(client, headers, token)
+    assert feed['token'] == token + 3
+    assert [g['saved_amount'] for g in feed['changes']['goals']] == [40.0]
+    assert [e['amount'] for e in feed['changes']['expenses']] == [25.0]
+    assert feed['changes']['incomes'] == []
+    assert feed['deleted']['incomes'] == [income_id]
+
+    caught_up = _sync(client, headers, feed['token'])
+    assert all(rows == [] for rows in caught_up['changes'].values())
+    assert all(ids == [] for ids in caught_up['deleted'].values())
+
+def test_budget_upserts_and_materialized_expenses_are_synced(app, client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    token = _sync(client, headers)['token']
+    client.put('/api/user/income', json={"income": 6000.0}, headers=headers)
+    feed = _sync(client, headers, token)
+    assert len(feed['changes']['budgets']) == 8
+
+    client.put('/api/user/income', json={"income": 7000.0}, headers=headers)
+    food = next(b for b in _sync(client, headers, feed['token'])['changes']['budgets'] if b['category'] == "Food")
+    assert food['limit'] == 7000.0 * 15 / 100
+
+    token = _sync(client, headers)['token']
+    client.post('/api/recurring-expenses/', json={
+        "amount": 15.0, "category": "Utilities", "frequency": "monthly",
+        "next_date": (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d')
+    }, headers=headers)
+    materialize_due_recurrences()
+    feed = _sync(client, headers, token)
+    assert [e['amount'] for e in feed['changes']['expenses']] == [15.0]
+    assert len(feed['changes']['recurring_expenses']) == 1
+
+def test_failed_writes_do_not_advance_the_token(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.post('/api/budgets/', json={"category": "Food", "limit": 500.0, "income_percentage": 10.0},
+                headers=headers)
+    other = client.post('/api/budgets/', json={"category": "Transport", "limit": 200.0, "income_percentage": 5.0},
+                        headers=headers).json['budget_id']
+    token = _sync(client, headers)['token']
+    assert client.put(f'/api/budgets/{other}', json={"category": "Food"}, headers=headers).status_code == 409
+    assert _sync(client, headers)['token'] == token
+    assert User.query.filter_by(email="test@example.com").first().change_seq == token
+
+def test_sync_rejects_bad_tokens(client, auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    assert client.get('/api/sync?since=abc', headers=headers).status_code == 400
+    assert client.get('/api/sync?since=-1', headers=headers).status_code == 400
+    assert client.get('/api/sync?since=99', headers=headers).status_code == 400
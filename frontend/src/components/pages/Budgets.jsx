@@ -2,6 +2,7 @@ import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { Tag, DollarSign } from 'lucide-react';
 import BudgetCard from '../cards/BudgetCard';
+import { fetchAllPages } from '../../utils/fetchAllPages';
 
 const Budgets = () => {
   const [income, setIncome] = useState([]);
@@ -26,7 +27,7 @@ const Budgets = () => {
         setIsLoading(true);
 
         // Fetch income
-        const incomeResponse = await fetch('http://localhost:5000/api/income', {
+        const incomeResponse = await fetchAllPages('http://localhost:5000/api/income', {
           headers: {
             Authorization: `Bearer ${token}`,
           },
@@ -83,6 +83,7 @@ const CardCarousel = ({ items, renderItem, title, itemsPerPage = 3 }) => {
 
 const Dashboard = () => {
   const [expenses, setExpenses] = useState([]);
+  const [monthTotal, setMonthTotal] = useState(0);
   const [budgets, setBudgets] = useState([]);
   const [goals, setGoals] = useState([]);
   const [predictions, setPredictions] = useState([]);
@@ -100,24 +101,28 @@ const Dashboard = () => {
 
       try {
         const headers = { Authorization: `Bearer ${token}` };
-        const [expensesRes, budgetsRes, goalsRes, predictionsRes] = await Promise.all([
-          fetch('http://localhost:5000/api/expenses', { headers }),
-          fetch('http://localhost:5000/api/budgets', { headers }),
-          fetch('http://localhost:5000/api/goals', { headers }),
-          fetch('http://localhost:5000/api/insights/predictions', { headers })
+        // Totals, budgets, goals and the forecast come from the single
+        // dashboard endpoint; only the first page of recent expenses is
+        // fetched alongside it.
+        const [dashboardRes, expensesRes] = await Promise.all([
+          fetch('http://localhost:5000/api/dashboard', { headers }),
+          fetch('http://localhost:5000/api/expenses/?limit=5', { headers })
         ]);
 
-        const [expensesData, budgetsData, goalsData, predictionsData] = await Promise.all([
-          expensesRes.json(),
-          budgetsRes.json(),
-          goalsRes.json(),
-          predictionsRes.json()
+        if (!dashboardRes.ok) {
+          throw new Error(`Dashboard request failed with status ${dashboardRes.status}`);
+        }
+
+        const [dashboardData, expensesData] = await Promise.all([
+          dashboardRes.json(),
+          expensesRes.json()
         ]);
 
         setExpenses(Array.isArray(expensesData) ? expensesData : []);
-        setBudgets(Array.isArray(budgetsData) ? budgetsData : []);
-        setGoals(Array.isArray(goalsData) ? goalsData : []);
-        setPredictions(Array.isArray(predictionsData.predictions) ? predictionsData.predictions : []);
+        setMonthTotal(dashboardData.totals?.expenses ?? 0);
+        setBudgets(Array.isArray(dashboardData.budgets) ? dashboardData.budgets : []);
+        setGoals(Array.isArray(dashboardData.goals?.items) ? dashboardData.goals.items : []);
+        setPredictions(Array.isArray(dashboardData.forecast?.predictions) ? dashboardData.forecast.predictions : []);
       } catch (error) {
         console.error('Error fetching data:', error);
         setError('Failed to load dashboard data');
@@ -173,10 +178,10 @@ const Dashboard = () => {
         <div className="bg-gradient-to-r from-teal-500 to-teal-600 rounded-2xl p-6 text-white">
           <div className="flex items-center gap-3 mb-2">
             <CreditCard className="h-5 w-5" />
-            <h3 className="font-medium">Total Expenses</h3>
+            <h3 className="font-medium">Expenses This Month</h3>
           </div>
           <p className="text-2xl font-bold">
-            ${expenses.reduce((sum, exp) => sum + exp.amount, 0).toLocaleString()}
+            ${monthTotal.toLocaleString()}
           </p>
         </div>
 
@@ -205,7 +210,7 @@ const Dashboard = () => {
         <div className="space-y-6">
           <div className="bg-white rounded-2xl shadow-sm p-6">
             <h2 className="text-xl font-bold text-teal-800 mb-4">Recent Expenses</h2>
-            <ExpenseList expenses={expenses.slice(0, 5)} />
+            <ExpenseList expenses={expenses} />
           </div>
           <InsightChart predictions={predictions} />
         </div>
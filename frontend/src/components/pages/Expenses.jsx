@@ -3,6 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { Plus, Filter, Search, Loader2, Download, Calendar, ArrowUpDown } from 'lucide-react';
 import ExpenseList from '../cards/ExpenseList';
 import AddExpenseForm from '../cards/AddExpenseForm';
+import { fetchAllPages } from '../../utils/fetchAllPages';
 
 const Expenses = () => {
   const [expenses, setExpenses] = useState([]);
@@ -33,7 +34,7 @@ const Expenses = () => {
       }
 
       try {
-        const response = await fetch('http://localhost:5000/api/expenses', {
+        const response = await fetchAllPages('http://localhost:5000/api/expenses', {
           headers: {
             Authorization: `Bearer ${token}`,
           },
@@ -3,6 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { Loader2 } from 'lucide-react';
 import GoalCard from '../cards/GoalCard';
 import AddGoalForm from '../cards/AddGoalForm';
+import { fetchAllPages } from '../../utils/fetchAllPages';
 
 const Goals = () => {
   const [goals, setGoals] = useState([]);
@@ -30,7 +31,7 @@ const Goals = () => {
       }
 
       try {
-        const response = await fetch('http://localhost:5000/api/goals', {
+        const response = await fetchAllPages('http://localhost:5000/api/goals', {
           headers: {
             Authorization: `Bearer ${token}`,
           },
@@ -0,0 +1,28 @@
+// List endpoints (expenses, income, goals) return one page at a time and put
+// the cursor for the next page in the X-Next-Cursor header. This follows the
+// cursors and resolves to a Response whose JSON body is every page joined
+// together, or to the first response that was not ok.
+export const fetchAllPages = async (url, options = {}) => {
+  const items = [];
+  let pageUrl = url;
+
+  while (true) {
+    const response = await fetch(pageUrl, options);
+    if (!response.ok) {
+      return response;
+    }
+    items.push(...(await response.json()));
+
+    const cursor = response.headers.get('X-Next-Cursor');
+    if (!cursor) {
+      break;
+    }
+    const separator = url.includes('?') ? '&' : '?';
+    pageUrl = `${url}${separator}cursor=${encodeURIComponent(cursor)}`;
+  }
+
+  return new Response(JSON.stringify(items), {
+    status: 200,
+    headers: { 'Content-Type': 'application/json' },
+  });
+};